@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago benchmarks.
+
+Latency and throughput of every accessor, the OAuth token flow and
+``load_js``, against the local ``StubServer``.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import FAN_OUT
+
+from flask import Flask
+
+from flask_mercadopago import ACCESSOR_CALLS, Mercadopago
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture(params=["pooled", "sdk"])
+def stub_app(request, api_stub):
+    app = Flask(__name__)
+    app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+    app.config["BASE_URL"] = api_stub.url + "/v1"
+    app.config["TOKEN_ENDPOINT"] = api_stub.url + "/oauth/token"
+    app.config["MERCADOPAGO_TRANSPORT"] = request.param
+    mercadopago = Mercadopago(app)
+    with app.test_request_context():
+        yield app, mercadopago
+        mercadopago.transport.close()
+
+
+def call(mercadopago, name):
+    method, args = ACCESSOR_CALLS[name]
+    return getattr(getattr(mercadopago, name)(), method)(*args)
+
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+
+@pytest.mark.parametrize("name", sorted(ACCESSOR_CALLS))
+def test_accessor_latency(benchmark, stub_app, name):
+    _, mercadopago = stub_app
+    res = benchmark(call, mercadopago, name)
+    assert res["status"] == 200
+
+
+def test_accessor_throughput(benchmark, stub_app):
+    app, mercadopago = stub_app
+
+    def fan_out():
+        def worker(_):
+            with app.app_context():
+                return call(mercadopago, "payment")
+
+        with ThreadPoolExecutor(8) as pool:
+            return list(pool.map(worker, range(FAN_OUT)))
+
+    results = benchmark(fan_out)
+    assert all(r["status"] == 200 for r in results)
+    benchmark.extra_info["calls"] = FAN_OUT
+
+
+def test_oauth_token(benchmark, stub_app):
+    app, mercadopago = stub_app
+    res = benchmark(
+        mercadopago.process_callback_or_refresh_token,
+        app.config["TOKEN_ENDPOINT"],
+        "TEST-token",
+        authorization_code="code",
+    )
+    assert res.status_code == 200
+
+
+def test_load_js(benchmark, stub_app):
+    _, mercadopago = stub_app
+    assert "<script" in benchmark(mercadopago.load_js)
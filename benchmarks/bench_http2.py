@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago benchmarks.
+
+Fan-out of concurrent calls over HTTP/1.1 (SDK ``HttpClient``) versus
+HTTP/2 multiplexing (``Http2Client``).
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import FAN_OUT
+
+from mercadopago.http import HttpClient
+
+import pytest
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+
+def fan_out(http_client, url):
+    with ThreadPoolExecutor(FAN_OUT) as pool:
+        futures = [
+            pool.submit(http_client.get, url + f"/v1/payments/{i}", {})
+            for i in range(FAN_OUT)
+        ]
+        return [future.result() for future in futures]
+
+
+def test_fan_out_http1(benchmark, http1_stub):
+    http_client = HttpClient()
+    before = http1_stub.connections
+    results = benchmark(fan_out, http_client, http1_stub.url)
+    assert all(r["status"] == 200 for r in results)
+    benchmark.extra_info["connections"] = http1_stub.connections - before
+
+
+def test_fan_out_http2(benchmark, http2_stub):
+    pytest.importorskip("httpx")
+    from flask_mercadopago import Http2Client
+
+    before = http2_stub.connections
+    with Http2Client(max_connections=2, http1=False) as http_client:
+        results = benchmark(fan_out, http_client, http2_stub.url)
+    assert all(r["status"] == 200 for r in results)
+    benchmark.extra_info["connections"] = http2_stub.connections - before
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago benchmarks.
+
+Cold start of a fresh interpreter importing the extension, with the SDK
+loaded on first use against every module loaded upfront.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import subprocess
+import sys
+
+import pytest
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+STARTUPS = {
+    "flask": "import flask\n",
+    "init_app": (
+        "from flask import Flask\n"
+        "from flask_mercadopago import Mercadopago\n"
+        "Mercadopago(Flask('app'))\n"
+    ),
+    "first_resource": (
+        "from flask import Flask\n"
+        "from flask_mercadopago import Mercadopago\n"
+        "app = Flask('app')\n"
+        "app.config['APP_ACCESS_TOKEN'] = 'TEST-token'\n"
+        "mercadopago = Mercadopago(app)\n"
+        "with app.app_context():\n"
+        "    mercadopago.payment()\n"
+    ),
+    "every_module": (
+        "from flask import Flask\n"
+        "import flask_mercadopago\n"
+        "for name in sorted(flask_mercadopago._LAZY_NAMES):\n"
+        "    getattr(flask_mercadopago, name)\n"
+        "flask_mercadopago.Mercadopago(Flask('app'))\n"
+    ),
+}
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+
+@pytest.mark.parametrize("startup", list(STARTUPS))
+def test_cold_start(benchmark, startup):
+    command = [sys.executable, "-c", STARTUPS[startup]]
+    benchmark.pedantic(
+        subprocess.check_call, args=(command,), rounds=10, warmup_rounds=1
+    )
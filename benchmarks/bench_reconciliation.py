@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago benchmarks.
+
+Reconciliation of a million synthetic payments with their orders, as
+arrays or as the dicts of a search, against a loop over the dicts.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from flask_mercadopago import reconcile
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+#: Number of synthetic payments.
+ROWS = 1_000_000
+
+#: Statuses of the synthetic payments.
+STATUSES = np.array(["approved", "pending", "rejected", "refunded"])
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    rng = np.random.default_rng(42)
+    orders = int(ROWS * 0.9)
+    references = np.char.add("order-", rng.integers(0, ROWS, ROWS).astype(str))
+    columns = {
+        "id": np.arange(1, ROWS + 1),
+        "external_reference": references,
+        "status": STATUSES[rng.choice(4, ROWS, p=[0.8, 0.1, 0.07, 0.03])],
+        "transaction_amount": rng.integers(100, 100000, ROWS) / 100,
+    }
+    amounts = dict(
+        zip(
+            np.char.add("order-", np.arange(orders).astype(str)).tolist(),
+            (rng.integers(100, 100000, orders) / 100).tolist(),
+        )
+    )
+    records = [
+        dict(zip(columns, row))
+        for row in zip(*(values.tolist() for values in columns.values()))
+    ]
+    return columns, records, amounts
+
+
+def reconcile_loop(payments, orders, tolerance=0.01):
+    """Per-dict reconciliation, the baseline."""
+    received, count, waiting, orphans = {}, {}, {}, []
+    for payment in payments:
+        reference = payment.get("external_reference")
+        status = payment.get("status")
+        if reference not in orders:
+            if status == "approved":
+                orphans.append(payment["id"])
+        elif status == "approved":
+            received[reference] = (
+                received.get(reference, 0.0) + payment["transaction_amount"]
+            )
+            count[reference] = count.get(reference, 0) + 1
+        elif status in ("pending", "in_process"):
+            waiting[reference] = waiting.get(reference, 0) + 1
+    summary = dict.fromkeys(
+        ("matched", "unpaid", "pending", "underpaid", "overpaid"), 0
+    )
+    for reference, amount in orders.items():
+        difference = received.get(reference, 0.0) - amount
+        if not count.get(reference):
+            outcome = "pending" if waiting.get(reference) else "unpaid"
+        elif difference < -tolerance:
+            outcome = "underpaid"
+        elif difference > tolerance:
+            outcome = "overpaid"
+        else:
+            outcome = "matched"
+        summary[outcome] += 1
+    summary["orphans"] = len(orphans)
+    return summary
+
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+
+@pytest.mark.parametrize("source", ["arrays", "records", "loop"])
+def test_reconcile(benchmark, dataset, source):
+    columns, records, orders = dataset
+    if source == "loop":
+        summary = benchmark.pedantic(
+            reconcile_loop, (records, orders), rounds=3
+        )
+    else:
+        payments = columns if source == "arrays" else records
+        result = benchmark.pedantic(reconcile, (payments, orders), rounds=3)
+        summary = result.summary()
+    assert sum(summary.values()) - summary["orphans"] == len(orders)
+    benchmark.extra_info["rows"] = ROWS
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago benchmarks.
+
+Run them offline with ``tox -e benchmarks`` or
+``pytest benchmarks/ --benchmark-only``.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import pytest as pt
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+#: Simulated upstream latency, in seconds.
+LATENCY = 0.02
+
+#: Number of concurrent calls issued in a fan-out.
+FAN_OUT = 32
+
+
+@pt.fixture(scope="session")
+def api_stub():
+    from flask_mercadopago import StubServer
+
+    stub = StubServer(latency=0.0).start()
+    yield stub
+    stub.stop()
+
+
+@pt.fixture(scope="session")
+def http1_stub():
+    from stubs import Http1Stub
+
+    stub = Http1Stub(latency=LATENCY).start()
+    yield stub
+    stub.stop()
+
+
+@pt.fixture(scope="session")
+def http2_stub():
+    pt.importorskip("h2")
+    from stubs import Http2Stub
+
+    stub = Http2Stub(latency=LATENCY).start()
+    yield stub
+    stub.stop()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago benchmarks.
+
+Local HTTP/1.1 and cleartext HTTP/2 stubs answering every call with JSON.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import h2.config
+import h2.connection
+import h2.events
+
+# =============================================================================
+# STUBS
+# =============================================================================
+
+BODY = json.dumps({"id": 1, "status": "approved"}).encode()
+
+
+class Http1Stub(object):
+    """Threaded HTTP/1.1 server answering ``BODY`` after ``latency``."""
+
+    def __init__(self, latency=0.0):
+        stub = self
+        self.latency = latency
+        self.connections = 0
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                stub.connections += 1
+                super().setup()
+
+            def do_GET(self):  # noqa: N802
+                time.sleep(stub.latency)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(BODY)))
+                self.end_headers()
+                self.wfile.write(BODY)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self):
+        threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        ).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class Http2Stub(object):
+    """Cleartext HTTP/2 (prior knowledge) server built on ``h2``.
+
+    Every stream is answered with ``BODY`` after ``latency`` seconds, from a
+    timer thread, so many streams of a single connection are in flight at
+    the same time.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.connections = 0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(128)
+        self.url = f"http://127.0.0.1:{self._sock.getsockname()[1]}"
+
+    def start(self):
+        threading.Thread(target=self._accept, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._sock.close()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(
+                target=self._serve, args=(sock,), daemon=True
+            ).start()
+
+    def _serve(self, sock):
+        config = h2.config.H2Configuration(client_side=False)
+        conn = h2.connection.H2Connection(config=config)
+        lock = threading.Lock()
+
+        def send(stream_id):
+            with lock:
+                conn.send_headers(
+                    stream_id,
+                    [
+                        (":status", "200"),
+                        ("content-type", "application/json"),
+                        ("content-length", str(len(BODY))),
+                    ],
+                )
+                conn.send_data(stream_id, BODY, end_stream=True)
+                sock.sendall(conn.data_to_send())
+
+        with lock:
+            conn.initiate_connection()
+            sock.sendall(conn.data_to_send())
+
+        while True:
+            try:
+                data = sock.recv(65535)
+            except OSError:
+                break
+            if not data:
+                break
+            with lock:
+                events = conn.receive_data(data)
+                for event in events:
+                    if isinstance(event, h2.events.DataReceived):
+                        conn.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id
+                        )
+                sock.sendall(conn.data_to_send())
+            for event in events:
+                if isinstance(event, h2.events.StreamEnded):
+                    threading.Timer(
+                        self.latency, send, args=(event.stream_id,)
+                    ).start()
+        sock.close()
@@ -27,5 +27,150 @@ __version__ = "1.0.0"
 # IMPORTS
 # =============================================================================
 
+import importlib
+
 from .core import *  # noqa
 from .utils import *  # noqa
+
+# =============================================================================
+# LAZY IMPORTS
+# =============================================================================
+
+#: Module of each name of the package that is imported on first use, so
+#: ``import flask_mercadopago`` doesn't load the SDK, the transports or the
+#: stub server until they are needed.
+_LAZY_NAMES = {
+    "AdaptiveLimiter": ".adaptive",
+    "OVERLOAD_STATUSES": ".adaptive",
+    "resource_key": ".adaptive",
+    "BIN_DIGITS": ".bins",
+    "BinIndex": ".bins",
+    "MAX_PREFIXES": ".bins",
+    "bin_ranges": ".bins",
+    "expand_pattern": ".bins",
+    "Bulkhead": ".bulkheads",
+    "BulkheadFull": ".bulkheads",
+    "BulkheadHttpClient": ".bulkheads",
+    "DEFAULT_BULKHEAD": ".bulkheads",
+    "DEFAULT_BULKHEADS": ".bulkheads",
+    "merge_bulkheads": ".bulkheads",
+    "CASSETTE_MODES": ".cassette",
+    "CassetteHttpClient": ".cassette",
+    "CassetteMissError": ".cassette",
+    "interaction_key": ".cassette",
+    "CATALOGS": ".catalog",
+    "CatalogCache": ".catalog",
+    "ASSET_EXTENSIONS": ".cli",
+    "LOADTEST_COLUMNS": ".cli",
+    "STATIC_FOLDER": ".cli",
+    "assets_command": ".cli",
+    "export_command": ".cli",
+    "loadtest_command": ".cli",
+    "mercadopago_cli": ".cli",
+    "probe_command": ".cli",
+    "stats_command": ".cli",
+    "sync_command": ".cli",
+    "warm_command": ".cli",
+    "EXPORT_FORMATS": ".export",
+    "PAYMENT_COLUMNS": ".export",
+    "arrow_schema": ".export",
+    "export_payments": ".export",
+    "iter_batches": ".export",
+    "to_columns": ".export",
+    "CHECKSUMS": ".identification",
+    "normalize_identification": ".identification",
+    "validate_identification": ".identification",
+    "Inbox": ".inbox",
+    "InstallmentQuotes": ".installments",
+    "Installments": ".installments",
+    "derive_options": ".installments",
+    "RequestLoader": ".loader",
+    "SCENARIOS": ".loadtest",
+    "checkout_scenario": ".loadtest",
+    "merchant_order_scenario": ".loadtest",
+    "percentile": ".loadtest",
+    "preference_scenario": ".loadtest",
+    "run_load": ".loadtest",
+    "LOOKUP_RESOURCES": ".lookups",
+    "LookupCache": ".lookups",
+    "NOTIFICATION_TOPICS": ".lookups",
+    "notification_received": ".lookups",
+    "parse_notification": ".lookups",
+    "FrozenRequestOptions": ".options",
+    "OPTION_NAMES": ".options",
+    "freeze": ".options",
+    "BREAKER_STATES": ".outbox",
+    "CircuitBreaker": ".outbox",
+    "OUTBOX_STATES": ".outbox",
+    "Outbox": ".outbox",
+    "OutboxHandle": ".outbox",
+    "FINAL_STATUSES": ".poller",
+    "OrderPoller": ".poller",
+    "STATE_FIELDS": ".poller",
+    "merchant_order_changed": ".poller",
+    "ORDER_OUTCOMES": ".reconciliation",
+    "PAID_STATUSES": ".reconciliation",
+    "PENDING_STATUSES": ".reconciliation",
+    "RECONCILE_COLUMNS": ".reconciliation",
+    "Reconciliation": ".reconciliation",
+    "reconcile": ".reconciliation",
+    "BUILTIN_RESOURCES": ".resources",
+    "RESOURCES": ".resources",
+    "bind_accessors": ".resources",
+    "register_resource": ".resources",
+    "resource_class": ".resources",
+    "resource_path": ".resources",
+    "unregister_resource": ".resources",
+    "DEFAULT_PRIORITY": ".scheduler",
+    "OutboundScheduler": ".scheduler",
+    "PRIORITIES": ".scheduler",
+    "current_priority": ".scheduler",
+    "priority": ".scheduler",
+    "SellerClient": ".sellers",
+    "SellerRegistry": ".sellers",
+    "ACCESSOR_CALLS": ".stub",
+    "STUB_LIST_PATHS": ".stub",
+    "STUB_PATHS": ".stub",
+    "StubServer": ".stub",
+    "MAX_SEARCH_OFFSET": ".sync",
+    "PaymentSync": ".sync",
+    "SQLiteSink": ".sync",
+    "iter_range": ".sync",
+    "iter_search": ".sync",
+    "shift_date": ".sync",
+    "API_ORIGIN": ".transports",
+    "AdaptiveHttpClient": ".transports",
+    "BaseHttpClient": ".transports",
+    "DNSCache": ".transports",
+    "ForkSafeHttpClient": ".transports",
+    "Http2Client": ".transports",
+    "IDEMPOTENT_METHODS": ".transports",
+    "PooledHttpClient": ".transports",
+    "RETRY_STATUSES": ".transports",
+    "RebasedHttpClient": ".transports",
+    "ScheduledHttpClient": ".transports",
+    "TLSSessionContext": ".transports",
+    "as_requests_error": ".transports",
+    "make_tls_context": ".transports",
+    "retries_exhausted": ".transports",
+    "should_retry": ".transports",
+    "url_with_params": ".transports",
+}
+
+
+def __getattr__(name):
+    """Import the module of a name of ``_LAZY_NAMES`` on first use."""
+    if name in _LAZY_NAMES:
+        module = importlib.import_module(_LAZY_NAMES[name], __name__)
+    elif name in core.LAZY_IMPORTS:  # noqa: F405
+        module = core  # noqa: F405
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the names of the package, including the lazy ones."""
+    return sorted(set(globals()) | set(_LAZY_NAMES))
@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Concurrency limits of each resource adapted to the latency of the API.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import os
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+from .scheduler import PRIORITIES, current_priority
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Status codes of the answers of an overloaded API.
+OVERLOAD_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+_VERSION = re.compile(r"v\d+")
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def resource_key(url: str) -> str:
+    """Get the resource of a URL, whose calls share a limit.
+
+    The path is cut at the first segment with a digit (other than a
+    version like ``v1``), usually an id.
+
+    Parameters
+    ----------
+    url : ``str``
+        A URL, like ``"https://api.mercadopago.com/v1/payments/123"``.
+
+    Return
+    ------
+    key : ``str``
+        The path of the resource, like ``"/v1/payments"``.
+    """
+    segments = []
+    for segment in urlsplit(url).path.split("/"):
+        if not segment:
+            continue
+        if any(c.isdigit() for c in segment) and not _VERSION.fullmatch(
+            segment
+        ):
+            break
+        segments.append(segment)
+    return "/" + "/".join(segments)
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class _Limit(object):
+    """The limit of a resource and its counters."""
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.inflight = 0
+        self.waiting = [0] * len(PRIORITIES)
+        self.baseline = None
+        self.decreased = 0.0
+        self.calls = 0
+        self.drops = 0
+
+
+class AdaptiveLimiter(object):
+    """Limit the calls in flight of each resource, adapting the limits.
+
+    The limits follow an AIMD rule: each call that used at least half of
+    the limit of its resource raises it by one call per round trip, and
+    a call that fails, is answered with an overload status or takes more
+    than ``tolerance`` times the usual latency cuts it by ``backoff``, at
+    most once per round trip. The usual latency of a resource is the
+    fastest one seen, slowly forgotten so a lasting change is accepted.
+    The calls over the limit wait, and a call of a priority class never
+    starts while one of a higher class waits for the same resource::
+
+        limiter.call("/v1/payments", lambda: client.get(url=url))
+
+    Parameters
+    ----------
+    initial : ``float`` (optional)
+        The first limit of each resource. Defaults to 10.
+    min_limit : ``int`` (optional)
+        The lowest limit. Defaults to 1.
+    max_limit : ``int`` (optional)
+        The highest limit. Defaults to 64.
+    tolerance : ``float`` (optional)
+        Times the usual latency after which a call is slow. Defaults to 2.
+    backoff : ``float`` (optional)
+        Factor of the limit after an overload. Defaults to 0.7.
+    smoothing : ``float`` (optional)
+        Weight of each slower call in the usual latency. Defaults to 0.05.
+    """
+
+    def __init__(
+        self,
+        initial: float = 10,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        tolerance: float = 2.0,
+        backoff: float = 0.7,
+        smoothing: float = 0.05,
+    ):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Invalid limits")
+        self.initial = min(max(initial, min_limit), max_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self._cond = threading.Condition()
+        self._pid = os.getpid()
+        self._limits = {}
+
+    def _limit(self, key: str) -> _Limit:
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._limits = {}
+        limit = self._limits.get(key)
+        if limit is None:
+            limit = self._limits[key] = _Limit(self.initial)
+        return limit
+
+    def acquire(self, key: str, timeout: float = None):
+        """Wait until a call to a resource can start.
+
+        Parameters
+        ----------
+        key : ``str``
+            The resource, like ``"/v1/payments"``.
+        timeout : ``float`` or ``None`` (optional)
+            Most seconds to wait. Defaults to ``None``, forever.
+
+        Raises
+        ------
+        TimeoutError
+            If the call couldn't start in ``timeout`` seconds.
+        """
+        level = PRIORITIES.index(current_priority())
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            limit = self._limit(key)
+            limit.waiting[level] += 1
+            try:
+                while limit.inflight >= int(limit.limit) or any(
+                    limit.waiting[:level]
+                ):
+                    remaining = (
+                        None
+                        if deadline is None
+                        else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No room for a call to {key}")
+                    self._cond.wait(remaining)
+            finally:
+                limit.waiting[level] -= 1
+                self._cond.notify_all()
+            limit.inflight += 1
+            limit.calls += 1
+
+    def release(self, key: str, latency: float, overloaded: bool = False):
+        """End a call started by :meth:`acquire`, adapting the limit.
+
+        Parameters
+        ----------
+        key : ``str``
+            The resource.
+        latency : ``float``
+            Seconds the call took.
+        overloaded : ``bool`` (optional)
+            If the call failed or was answered with an overload status.
+            Defaults to ``False``.
+        """
+        with self._cond:
+            limit = self._limit(key)
+            used = limit.inflight
+            limit.inflight = max(0, limit.inflight - 1)
+            baseline = latency if limit.baseline is None else limit.baseline
+            slow = latency > baseline * self.tolerance
+            if latency < baseline:
+                limit.baseline = latency
+            else:
+                limit.baseline = baseline + (latency - baseline) * (
+                    self.smoothing
+                )
+            now = time.monotonic()
+            if overloaded or slow:
+                if now - limit.decreased >= latency:
+                    limit.limit = max(
+                        self.min_limit, limit.limit * self.backoff
+                    )
+                    limit.decreased = now
+                    limit.drops += 1
+            elif used * 2 >= limit.limit:
+                limit.limit = min(
+                    self.max_limit, limit.limit + 1 / limit.limit
+                )
+            self._cond.notify_all()
+
+    def call(self, key: str, send):
+        """Make a call to a resource within its limit.
+
+        Parameters
+        ----------
+        key : ``str``
+            The resource.
+        send : callable
+            Called without arguments to make the call, returns a dict with
+            the ``status``.
+
+        Return
+        ------
+        result : ``dict``
+            The result of ``send``.
+        """
+        self.acquire(key)
+        started = time.monotonic()
+        try:
+            result = send()
+        except Exception:
+            self.release(key, time.monotonic() - started, overloaded=True)
+            raise
+        self.release(
+            key,
+            time.monotonic() - started,
+            overloaded=result.get("status") in OVERLOAD_STATUSES,
+        )
+        return result
+
+    def limit(self, key: str) -> int:
+        """Get the calls to a resource allowed in flight now.
+
+        Parameters
+        ----------
+        key : ``str``
+            The resource.
+
+        Return
+        ------
+        limit : ``int``
+            The current limit.
+        """
+        with self._cond:
+            return int(self._limit(key).limit)
+
+    def stats(self) -> dict:
+        """Get the limit and the counters of each resource.
+
+        Return
+        ------
+        stats : ``dict``
+            The ``limit``, the calls ``inflight`` and ``waiting``, the usual
+            ``latency`` in seconds, and the ``calls`` and limit cuts
+            (``drops``) so far, by resource.
+        """
+        with self._cond:
+            return {
+                key: {
+                    "limit": int(limit.limit),
+                    "inflight": limit.inflight,
+                    "waiting": sum(limit.waiting),
+                    "latency": limit.baseline,
+                    "calls": limit.calls,
+                    "drops": limit.drops,
+                }
+                for key, limit in self._limits.items()
+            }
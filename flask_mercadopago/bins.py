@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Index of the BIN patterns of the payment methods, to resolve card numbers.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import bisect
+import re
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Digits of the BINs resolved by default.
+BIN_DIGITS = 6
+
+#: Most prefixes a pattern is expanded to before it is matched as a regex.
+MAX_PREFIXES = 10000
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def expand_pattern(pattern: str) -> list:
+    """Expand a BIN pattern of the API to the prefixes it matches.
+
+    The patterns are regular expressions anchored at the start, like
+    ``"^(5[1-5]|2(2(2[1-9]|[3-9])|[3-6]|7([0-1]|20)))"``, using only
+    digits, classes of digits, groups and alternatives.
+
+    Parameters
+    ----------
+    pattern : ``str``
+        The ``pattern`` or ``exclusion_pattern`` of a ``bin`` setting.
+
+    Return
+    ------
+    prefixes : ``list`` of ``str``
+        The prefixes of the card numbers matched, sorted.
+
+    Raises
+    ------
+    ValueError
+        If the pattern uses other syntax or expands to more than
+        ``MAX_PREFIXES`` prefixes.
+    """
+    text = pattern.strip()
+    if not text.startswith("^"):
+        raise ValueError(f"Unanchored BIN pattern {pattern!r}")
+    text = text[1:]
+    if text.endswith("$"):
+        raise ValueError(f"Unsupported BIN pattern {pattern!r}")
+    prefixes, position = _expand_alternatives(text, 0, pattern)
+    if position != len(text):
+        raise ValueError(f"Unbalanced BIN pattern {pattern!r}")
+    return sorted(prefixes)
+
+
+def _expand_alternatives(text: str, position: int, pattern: str):
+    """Expand ``a|b|...`` up to a closing parenthesis or the end."""
+    prefixes = set()
+    while True:
+        sequence, position = _expand_sequence(text, position, pattern)
+        prefixes.update(sequence)
+        if position < len(text) and text[position] == "|":
+            position += 1
+            continue
+        return prefixes, position
+
+
+def _expand_sequence(text: str, position: int, pattern: str):
+    """Expand the atoms of a sequence, combining their prefixes."""
+    prefixes = [""]
+    while position < len(text) and text[position] not in "|)":
+        char = text[position]
+        if char.isdigit():
+            options, position = [char], position + 1
+        elif char == "[":
+            end = text.find("]", position)
+            if end < 0:
+                raise ValueError(f"Unbalanced BIN pattern {pattern!r}")
+            options = _expand_class(text[position + 1 : end], pattern)  # noqa
+            position = end + 1
+        elif char == "(":
+            position += 3 if text.startswith("(?:", position) else 1
+            options, position = _expand_alternatives(text, position, pattern)
+            if position >= len(text) or text[position] != ")":
+                raise ValueError(f"Unbalanced BIN pattern {pattern!r}")
+            position += 1
+        else:
+            raise ValueError(f"Unsupported BIN pattern {pattern!r}")
+        if len(prefixes) * len(options) > MAX_PREFIXES:
+            raise ValueError(f"BIN pattern {pattern!r} is too broad")
+        prefixes = [p + o for p in prefixes for o in options]
+    return prefixes, position
+
+
+def _expand_class(members: str, pattern: str) -> list:
+    """Expand a class of digits like ``0-35``."""
+    digits, position = set(), 0
+    while position < len(members):
+        first = members[position]
+        if position + 2 < len(members) and members[position + 1] == "-":
+            last, position = members[position + 2], position + 3
+        else:
+            last, position = first, position + 1
+        if not (first.isdigit() and last.isdigit()) or first > last:
+            raise ValueError(f"Unsupported BIN pattern {pattern!r}")
+        digits.update(str(d) for d in range(int(first), int(last) + 1))
+    return sorted(digits)
+
+
+def _to_ranges(prefixes, digits: int, inclusive: bool) -> list:
+    """Convert prefixes to the merged ``[start, stop)`` ranges of BINs.
+
+    The prefixes longer than a BIN can't be told apart by it, so they
+    cover their whole BIN when ``inclusive`` and nothing otherwise.
+    """
+    ranges = []
+    for prefix in prefixes:
+        if len(prefix) > digits:
+            if not inclusive:
+                continue
+            prefix = prefix[:digits]
+        scale = 10 ** (digits - len(prefix))
+        start = int(prefix or 0) * scale
+        ranges.append((start, start + scale))
+    merged = []
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def _subtract(ranges: list, excluded: list) -> list:
+    """Remove the ``excluded`` ranges from ``ranges``, both merged."""
+    result = []
+    for start, stop in ranges:
+        for ex_start, ex_stop in excluded:
+            if ex_stop <= start or ex_start >= stop:
+                continue
+            if ex_start > start:
+                result.append((start, ex_start))
+            start = max(start, ex_stop)
+            if start >= stop:
+                break
+        if start < stop:
+            result.append((start, stop))
+    return result
+
+
+def bin_ranges(setting: dict, digits: int = BIN_DIGITS) -> list:
+    """Get the ranges of BINs of a setting of a payment method.
+
+    Parameters
+    ----------
+    setting : ``dict``
+        An item of the ``settings`` of a payment method, with the ``bin``
+        ``pattern`` and ``exclusion_pattern``.
+    digits : ``int`` (optional)
+        Digits of the BINs. Defaults to 6.
+
+    Return
+    ------
+    ranges : ``list`` of ``tuple``
+        The ``(start, stop)`` ranges of the BINs matched, as integers.
+
+    Raises
+    ------
+    ValueError
+        If a pattern can't be expanded.
+    """
+    patterns = setting.get("bin") or {}
+    if not patterns.get("pattern"):
+        return []
+    ranges = _to_ranges(expand_pattern(patterns["pattern"]), digits, True)
+    if patterns.get("exclusion_pattern"):
+        excluded = _to_ranges(
+            expand_pattern(patterns["exclusion_pattern"]), digits, False
+        )
+        ranges = _subtract(ranges, excluded)
+    return ranges
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class BinIndex(object):
+    """Index of the BINs of the payment methods, to resolve them locally.
+
+    The BIN patterns of every setting of the active payment methods are
+    expanded to ranges of BINs and split in disjoint intervals, each with
+    the payment methods matching all its BINs, so :meth:`resolve` is a
+    binary search. The ranges of each pattern are reused from ``previous``,
+    so rebuilding the index after the catalog is refreshed only expands
+    the patterns that changed. The patterns that can't be expanded are
+    matched as regular expressions.
+
+    Parameters
+    ----------
+    methods : ``list`` of ``dict``
+        The catalog of the payment methods.
+    digits : ``int`` (optional)
+        Digits of the BINs. Defaults to 6.
+    previous : :class:`BinIndex` or ``None`` (optional)
+        The index of an older catalog.
+    """
+
+    def __init__(self, methods, digits: int = BIN_DIGITS, previous=None):
+        self.methods = methods
+        self.digits = digits
+        self.expanded = 0
+        reuse = {}
+        if previous is not None and previous.digits == digits:
+            reuse = previous._ranges
+        self._ranges = {}
+        self._fallback = []
+        self._positions = {id(method): i for i, method in enumerate(methods)}
+        entries = []
+        for method in methods:
+            if method.get("status", "active") != "active":
+                continue
+            for setting in method.get("settings") or ():
+                patterns = setting.get("bin") or {}
+                key = (
+                    patterns.get("pattern"),
+                    patterns.get("exclusion_pattern"),
+                )
+                if key not in self._ranges:
+                    if key in reuse:
+                        self._ranges[key] = reuse[key]
+                    else:
+                        self._ranges[key] = self._expand(setting)
+                entries.append((method, key))
+        self._build(entries)
+
+    def _expand(self, setting: dict):
+        """Get the ranges of a setting, or ``None`` to match it as a regex."""
+        self.expanded += 1
+        try:
+            return bin_ranges(setting, self.digits)
+        except ValueError:
+            pass
+        try:
+            for pattern in (setting.get("bin") or {}).values():
+                re.compile(pattern or "")
+        except (re.error, TypeError):
+            return []
+        return None
+
+    def _build(self, entries):
+        """Split the ranges in intervals with the methods of each one."""
+        spans = []
+        for method, key in entries:
+            ranges = self._ranges[key]
+            if ranges is None:
+                self._fallback.append((method, key))
+            else:
+                spans.extend((start, stop, method) for start, stop in ranges)
+        self.bounds = sorted({edge for span in spans for edge in span[:2]})
+        matches = [[] for _ in self.bounds]
+        for start, stop, method in spans:
+            first = bisect.bisect_left(self.bounds, start)
+            last = bisect.bisect_left(self.bounds, stop)
+            for i in range(first, last):
+                if not any(m is method for m in matches[i]):
+                    matches[i].append(method)
+        self.intervals = [tuple(m) for m in matches]
+
+    def resolve(self, bin_number) -> list:
+        """Get the payment methods of a BIN, without calling the API.
+
+        Parameters
+        ----------
+        bin_number : ``str`` or ``int``
+            The first ``digits`` (or more) digits of the card number.
+
+        Return
+        ------
+        methods : ``list`` of ``dict``
+            The payment methods of the catalog matching the BIN, in its
+            order. They are shared by every call, and must not be changed.
+        """
+        text = str(bin_number)[: self.digits]
+        if len(text) != self.digits or not text.isdigit():
+            raise ValueError(f"Invalid BIN {bin_number!r}")
+        value = int(text)
+        i = bisect.bisect_right(self.bounds, value) - 1
+        found = list(self.intervals[i]) if i >= 0 else []
+        matched = False
+        for method, key in self._fallback:
+            if not any(m is method for m in found) and _match(key, text):
+                found.append(method)
+                matched = True
+        if matched:
+            found.sort(key=lambda method: self._positions[id(method)])
+        return found
+
+    def __len__(self):
+        return len(self.intervals)
+
+
+def _match(key, text: str) -> bool:
+    """Match a BIN with the patterns of a setting as regular expressions."""
+    pattern, exclusion = key
+    if not re.match(pattern, text):
+        return False
+    return not (exclusion and re.match(exclusion, text))
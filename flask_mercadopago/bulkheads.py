@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Bulkheads isolating the connections and the calls of each resource family.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import contextlib
+import os
+import threading
+from urllib.parse import urlsplit
+
+from requests import exceptions as requests_exceptions
+
+from .transports import BaseHttpClient
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Bulkhead of the calls whose path isn't in any other one.
+DEFAULT_BULKHEAD = "default"
+
+#: The paths of each bulkhead, with the connections kept open to each host
+#: (``maxsize``) and the most calls in flight (``workers``, ``None`` for no
+#: limit). A call goes to the bulkhead with the longest matching path.
+DEFAULT_BULKHEADS = {
+    "payments": {
+        "paths": (
+            "/v1/advanced_payments",
+            "/v1/card_tokens",
+            "/v1/chargebacks",
+            "/v1/customers",
+            "/v1/identification_types",
+            "/v1/payment_methods",
+            "/v1/payments",
+        ),
+        "maxsize": 10,
+        "workers": 16,
+    },
+    "preferences": {
+        "paths": (
+            "/checkout/preferences",
+            "/merchant_orders",
+            "/preapproval",
+            "/preapproval_plan",
+        ),
+        "maxsize": 5,
+        "workers": 8,
+    },
+    "oauth": {
+        "paths": ("/oauth", "/users"),
+        "maxsize": 2,
+        "workers": 4,
+    },
+    "reporting": {
+        "paths": (
+            "/merchant_orders/search",
+            "/preapproval/search",
+            "/v1/account",
+            "/v1/customers/search",
+            "/v1/payments/search",
+        ),
+        "maxsize": 2,
+        "workers": 4,
+    },
+}
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def merge_bulkheads(overrides=None) -> dict:
+    """Get the bulkheads of ``DEFAULT_BULKHEADS`` changed by ``overrides``.
+
+    Parameters
+    ----------
+    overrides : ``dict`` or ``None`` (optional)
+        The changed keys of each bulkhead by name, like ``{"reporting":
+        {"workers": 1}}``. A new name adds a bulkhead (with its ``paths``)
+        and ``None`` removes one.
+
+    Return
+    ------
+    bulkheads : ``dict``
+        The ``paths``, ``maxsize`` and ``workers`` of each bulkhead.
+    """
+    bulkheads = {
+        name: dict(spec, paths=tuple(spec["paths"]))
+        for name, spec in DEFAULT_BULKHEADS.items()
+    }
+    for name, spec in (overrides or {}).items():
+        if spec is None:
+            bulkheads.pop(name, None)
+            continue
+        spec = dict(bulkheads.get(name, {}), **spec)
+        if not spec.get("paths"):
+            raise ValueError(f"Bulkhead {name!r} has no paths")
+        spec["paths"] = tuple(spec["paths"])
+        spec.setdefault("maxsize", 10)
+        spec.setdefault("workers", None)
+        bulkheads[name] = spec
+    return bulkheads
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class BulkheadFull(requests_exceptions.ConnectionError):
+    """A call found every worker of its bulkhead busy."""
+
+
+class Bulkhead(object):
+    """A client and the most calls in flight allowed to it.
+
+    Parameters
+    ----------
+    name : ``str``
+        The name of the bulkhead.
+    http_client : ``mercadopago.http.http_client``
+        The client making its calls, with its own connections.
+    workers : ``int`` or ``None`` (optional)
+        Most calls in flight. Defaults to ``None``, no limit.
+    """
+
+    def __init__(self, name: str, http_client, workers: int = None):
+        self.name = name
+        self.http_client = http_client
+        self.workers = workers
+        self.active = 0
+        self.calls = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._semaphore = (
+            None if workers is None else threading.Semaphore(workers)
+        )
+
+    @contextlib.contextmanager
+    def enter(self, timeout: float = None):
+        """Run a call in the bulkhead, waiting for a free worker.
+
+        Parameters
+        ----------
+        timeout : ``float`` or ``None`` (optional)
+            Most seconds to wait. Defaults to ``None``, forever.
+
+        Raises
+        ------
+        BulkheadFull
+            If no worker was free in ``timeout`` seconds.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self.active = 0
+                if self.workers is not None:
+                    self._semaphore = threading.Semaphore(self.workers)
+            semaphore = self._semaphore
+        if semaphore is not None and not semaphore.acquire(timeout=timeout):
+            with self._lock:
+                self.rejected += 1
+            raise BulkheadFull(f"Every worker of {self.name!r} is busy")
+        with self._lock:
+            self.active += 1
+            self.calls += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active -= 1
+            if semaphore is not None:
+                semaphore.release()
+
+    def stats(self) -> dict:
+        """Get the counters of the bulkhead.
+
+        Return
+        ------
+        stats : ``dict``
+            The ``workers``, the calls ``active`` now, the ``calls`` made
+            and the ones ``rejected``, and the counters of the
+            ``transport``.
+        """
+        stats = getattr(self.http_client, "stats", None)
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "active": self.active,
+                "calls": self.calls,
+                "rejected": self.rejected,
+                "transport": {} if stats is None else stats(),
+            }
+
+
+class BulkheadHttpClient(BaseHttpClient):
+    """Make the calls of each resource family with its own bulkhead.
+
+    Each bulkhead has its own connections and workers, so the slow calls
+    of a family (like the searches of a report) can only take the
+    capacity of their bulkhead, never the one of the payments::
+
+        client = BulkheadHttpClient(
+            lambda maxsize: PooledHttpClient(maxsize=maxsize),
+            merge_bulkheads({"reporting": {"workers": 2}}),
+        )
+
+    Parameters
+    ----------
+    make_client : callable
+        Called with the ``maxsize`` of a bulkhead to create its client.
+    bulkheads : ``dict`` or ``None`` (optional)
+        The ``paths``, ``maxsize`` and ``workers`` of each bulkhead by
+        name. Defaults to ``DEFAULT_BULKHEADS``.
+    default_maxsize : ``int`` (optional)
+        Connections of ``DEFAULT_BULKHEAD``, which has no workers limit.
+        Defaults to 10.
+    timeout : ``float`` or ``None`` (optional)
+        Most seconds a call waits for a worker. Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        make_client,
+        bulkheads=None,
+        default_maxsize: int = 10,
+        timeout: float = 1.0,
+    ):
+        bulkheads = merge_bulkheads() if bulkheads is None else bulkheads
+        self.timeout = timeout
+        self.bulkheads = {
+            name: Bulkhead(
+                name, make_client(spec.get("maxsize", 10)), spec.get("workers")
+            )
+            for name, spec in bulkheads.items()
+        }
+        self.bulkheads.setdefault(
+            DEFAULT_BULKHEAD,
+            Bulkhead(DEFAULT_BULKHEAD, make_client(default_maxsize)),
+        )
+        self._routes = sorted(
+            (
+                (path.rstrip("/"), name)
+                for name, spec in bulkheads.items()
+                for path in spec["paths"]
+            ),
+            key=lambda route: len(route[0]),
+            reverse=True,
+        )
+
+    def route(self, url: str) -> Bulkhead:
+        """Get the bulkhead of a URL.
+
+        Parameters
+        ----------
+        url : ``str``
+            The URL of a call.
+
+        Return
+        ------
+        bulkhead : ``Bulkhead``
+            The one with the longest path matching the URL, or the default
+            one.
+        """
+        path = urlsplit(url).path
+        for prefix, name in self._routes:
+            if path == prefix or path.startswith(prefix + "/"):
+                return self.bulkheads[name]
+        return self.bulkheads[DEFAULT_BULKHEAD]
+
+    def request(self, method: str, url: str, maxretries=None, **kwargs):
+        """Makes a call to the API with the client of its bulkhead."""
+        bulkhead = self.route(url)
+        send = getattr(bulkhead.http_client, method.lower())
+        with bulkhead.enter(self.timeout):
+            return send(url=url, maxretries=maxretries, **kwargs)
+
+    def warmup(self, urls, connections: int = 1) -> int:
+        """Open connections of every bulkhead to ``urls``."""
+        opened = 0
+        for bulkhead in self.bulkheads.values():
+            warmup = getattr(bulkhead.http_client, "warmup", None)
+            if warmup is not None:
+                opened += warmup(urls, connections)
+        return opened
+
+    def stats(self) -> dict:
+        """Get the counters of all the connections, and of each bulkhead."""
+        stats = {"bulkheads": {}}
+        for name, bulkhead in self.bulkheads.items():
+            bulkhead_stats = bulkhead.stats()
+            for key, value in bulkhead_stats["transport"].items():
+                if isinstance(value, int):
+                    stats[key] = stats.get(key, 0) + value
+            stats["bulkheads"][name] = bulkhead_stats
+        return stats
+
+    def close(self):
+        """Close every connection of every bulkhead."""
+        for bulkhead in self.bulkheads.values():
+            close = getattr(bulkhead.http_client, "close", None)
+            if close is not None:
+                close()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Transport recording the calls to the API and replaying them.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .transports import BaseHttpClient, url_with_params
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Modes of a ``CassetteHttpClient``.
+CASSETTE_MODES = ("record", "replay", "once")
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def interaction_key(method: str, url: str, params=None, data=None) -> str:
+    """Get the key identifying a call in a cassette.
+
+    The headers are left out, since they change on every call (the
+    idempotency key) or between environments (the access token).
+
+    Parameters
+    ----------
+    method : ``str``
+        The HTTP method.
+    url : ``str``
+        The URL of the resource.
+    params : ``dict`` or ``None`` (optional)
+        The query parameters, in any order.
+    data : ``str`` or ``None`` (optional)
+        The body of the call.
+
+    Return
+    ------
+    key : ``str``
+        The SHA-1 hex digest of the call.
+    """
+    if params:
+        params = dict(sorted(params.items()))
+    digest = hashlib.sha1(method.upper().encode())
+    digest.update(b" " + url_with_params(url, params).encode())
+    if data is not None:
+        if not isinstance(data, (bytes, str)):
+            data = json.dumps(data, sort_keys=True)
+        if isinstance(data, str):
+            data = data.encode()
+        digest.update(b"\n" + data)
+    return digest.hexdigest()
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class CassetteMissError(LookupError):
+    """No response was recorded for a call being replayed."""
+
+
+class CassetteHttpClient(BaseHttpClient):
+    """Record the calls of another client to a file, and replay them.
+
+    Each call is stored as one JSON line with its key (see
+    :func:`interaction_key`), method, URL and response. The file is loaded
+    in a dict from key to responses, so a call is replayed with one
+    lookup; the responses recorded for the same call are replayed in
+    order, repeating the last one, and each replay gets its own copy. Set the ``MERCADOPAGO_CASSETTE`` config
+    key to use it as the transport of the app.
+
+    Parameters
+    ----------
+    http_client : ``mercadopago.http.http_client`` or ``None``
+        The client making the calls being recorded. Not needed to replay.
+    path : ``str``
+        The cassette file.
+    mode : ``str`` (optional)
+        ``"record"`` sends and records every call, ``"replay"`` answers
+        them from the cassette (raising ``CassetteMissError`` for unknown
+        calls) and ``"once"`` replays the known calls and records the new
+        ones. Defaults to ``"once"``.
+    latency : ``float`` (optional)
+        Seconds waited before each replayed response. Defaults to 0.
+    """
+
+    def __init__(
+        self, http_client, path: str, mode: str = "once", latency=0.0
+    ):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}")
+        if http_client is None and mode != "replay":
+            raise ValueError(f"Cassette mode {mode!r} needs an http_client")
+        self.http_client = http_client
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._interactions = {}
+        self._replayed = {}
+        if mode == "record":
+            open(path, "w").close()
+        elif os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as fp:
+            for line in fp:
+                if line.strip():
+                    record = json.loads(line)
+                    responses = self._interactions.setdefault(
+                        record["key"], []
+                    )
+                    responses.append(json.dumps(record["response"]))
+
+    def __len__(self):
+        return sum(len(r) for r in self._interactions.values())
+
+    def _replay(self, key: str):
+        with self._lock:
+            responses = self._interactions.get(key)
+            if not responses:
+                return None
+            index = self._replayed.get(key, 0)
+            self._replayed[key] = index + 1
+            response = responses[min(index, len(responses) - 1)]
+        return json.loads(response)
+
+    def _record(self, key: str, method: str, url: str, response: dict):
+        line = json.dumps(
+            {"key": key, "method": method, "url": url, "response": response},
+            separators=(",", ":"),
+        )
+        with self._lock:
+            self._interactions.setdefault(key, []).append(json.dumps(response))
+            with open(self.path, "a", encoding="utf-8") as fp:
+                fp.write(line + "\n")
+
+    def request(self, method: str, url: str, maxretries=None, **kwargs):
+        """Replay the call from the cassette, or make and record it."""
+        key = interaction_key(
+            method, url, kwargs.get("params"), kwargs.get("data")
+        )
+        if self.mode != "record":
+            response = self._replay(key)
+            if response is not None:
+                if self.latency:
+                    time.sleep(self.latency)
+                return response
+            if self.mode == "replay":
+                raise CassetteMissError(
+                    f"No recorded response for {method} {url}"
+                )
+        send = getattr(self.http_client, method.lower())
+        response = send(url=url, maxretries=maxretries, **kwargs)
+        self._record(key, method, url, response)
+        return response
+
+    def warmup(self, urls, connections: int = 1) -> int:
+        """Open connections of the recorded client, unless replaying."""
+        warmup = getattr(self.http_client, "warmup", None)
+        if self.mode == "replay" or warmup is None:
+            return 0
+        return warmup(urls, connections)
+
+    def stats(self) -> dict:
+        """Get the counters of the recorded client and of the cassette."""
+        stats = getattr(self.http_client, "stats", None)
+        stats = {} if stats is None else stats()
+        stats["cassette_interactions"] = len(self)
+        return stats
+
+    def close(self):
+        """Close every connection of the recorded client."""
+        close = getattr(self.http_client, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Cache of the catalogs of the API, that rarely change.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Accessor of the resource listing each catalog.
+CATALOGS = {
+    "identification_types": "identification_type",
+    "payment_methods": "payment_methods",
+}
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class CatalogCache(object):
+    """Cache of catalogs expiring after ``ttl`` seconds.
+
+    When ``path`` is given, the catalogs are also saved to that JSON file
+    and read from it by the processes that don't have them yet, so a
+    ``flask mercadopago warm`` run before starting the workers fills the
+    cache of all of them. The processes update the file one at a time,
+    holding a lock on the ``path + ".lock"`` file.
+
+    Parameters
+    ----------
+    ttl : ``float``
+        Seconds a catalog is fresh.
+    path : ``str`` or ``None`` (optional)
+        The file shared by the processes of the node.
+    """
+
+    def __init__(self, ttl: float, path: str = None):
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def _read_file(self) -> dict:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return {}
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Hold the lock of the file between the processes."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.path + ".lock", "a+b") as fp:
+            if fcntl is not None:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+            else:  # pragma: no cover
+                fp.seek(0)
+                msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+                else:  # pragma: no cover
+                    fp.seek(0)
+                    msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _write_file(self, entries: dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fp:
+            json.dump(entries, fp)
+        os.replace(tmp, self.path)
+
+    def _fresh(self, entry) -> bool:
+        return entry is not None and time.time() - entry[0] < self.ttl
+
+    def get(self, name: str, loader, refresh: bool = False):
+        """Get a catalog, loading it when it isn't cached or is stale.
+
+        Parameters
+        ----------
+        name : ``str``
+            The name of the catalog.
+        loader : callable
+            Called without arguments to get the catalog.
+        refresh : ``bool`` (optional)
+            Load the catalog even if it is fresh. Defaults to ``False``.
+
+        Return
+        ------
+        catalog : object
+            The catalog.
+        """
+        if not refresh:
+            entry = self._entries.get(name)
+            if not self._fresh(entry):
+                entry = self._read_file().get(name)
+                if self._fresh(entry):
+                    self._entries[name] = entry
+            if self._fresh(entry):
+                self.hits += 1
+                return entry[1]
+        self.misses += 1
+        value = loader()
+        self.put(name, value)
+        return value
+
+    def put(self, name: str, value):
+        """Store a catalog, in memory and in the file.
+
+        Parameters
+        ----------
+        name : ``str``
+            The name of the catalog.
+        value : object
+            The catalog, that must be serializable as JSON.
+        """
+        entry = [time.time(), value]
+        with self._lock:
+            self._entries[name] = entry
+            if self.path:
+                with self._file_lock():
+                    entries = self._read_file()
+                    entries[name] = entry
+                    self._write_file(entries)
+
+    def clear(self):
+        """Forget every catalog, and remove the file."""
+        with self._lock:
+            self._entries.clear()
+            if self.path:
+                with self._file_lock():
+                    if os.path.exists(self.path):
+                        os.remove(self.path)
+
+    def stats(self) -> dict:
+        """Get the counters of the cache and the age of each catalog.
+
+        Return
+        ------
+        stats : ``dict``
+            The ``hits``, ``misses`` and, for each catalog in memory or in
+            the file, its ``age`` in seconds, ``size`` and if it is
+            ``fresh``.
+        """
+        entries = self._read_file()
+        entries.update(self._entries)
+        now = time.time()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "catalogs": {
+                name: {
+                    "age": now - entry[0],
+                    "size": len(entry[1]),
+                    "fresh": self._fresh(entry),
+                }
+                for name, entry in sorted(entries.items())
+            },
+        }
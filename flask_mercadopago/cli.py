@@ -0,0 +1,444 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Commands of the ``flask mercadopago`` group.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import json
+import os
+import statistics
+import time
+
+import click
+
+from flask import current_app
+from flask.cli import AppGroup
+
+from .catalog import CATALOGS
+from .core import create_transport
+from .export import EXPORT_FORMATS, export_payments
+from .loadtest import SCENARIOS, run_load
+from .scheduler import priority
+from .sync import PaymentSync, SQLiteSink
+from .utils import get_sri
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Columns of the report of ``flask mercadopago loadtest``.
+LOADTEST_COLUMNS = (
+    ("concurrency", "{:>11}"),
+    ("iterations", "{:>10}"),
+    ("errors", "{:>6}"),
+    ("throughput", "{:>10.1f}"),
+    ("p50", "{:>8.1f}"),
+    ("p90", "{:>8.1f}"),
+    ("p99", "{:>8.1f}"),
+    ("max", "{:>8.1f}"),
+    ("connections", "{:>11}"),
+)
+
+#: Folder of the static files of the extension.
+STATIC_FOLDER = os.path.join(os.path.dirname(__file__), "static")
+
+#: Extensions of the static files hashed by ``flask mercadopago assets``.
+ASSET_EXTENSIONS = (".js", ".css", ".json", ".svg", ".html")
+
+# =============================================================================
+# COMMANDS
+# =============================================================================
+
+mercadopago_cli = AppGroup(
+    "mercadopago", help="Commands of the Mercadopago extension."
+)
+
+
+def _parse_steps(value: str) -> list:
+    """Get the concurrency steps of a ramp like ``"1,4,16"``."""
+    try:
+        steps = [int(step) for step in value.split(",") if step.strip()]
+    except ValueError:
+        steps = []
+    if not steps or min(steps) < 1:
+        raise click.BadParameter(
+            "expected positive integers separated by commas",
+            param_hint="--concurrency",
+        )
+    return steps
+
+
+@mercadopago_cli.command("loadtest")
+@click.option(
+    "--scenario",
+    "-s",
+    type=click.Choice(sorted(SCENARIOS)),
+    default="checkout",
+    show_default=True,
+    help="Flow run by each iteration.",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    default="1,4,16",
+    show_default=True,
+    help="Threads of each step of the ramp, separated by commas.",
+)
+@click.option(
+    "--duration",
+    "-d",
+    type=float,
+    default=5.0,
+    show_default=True,
+    help="Seconds of each step.",
+)
+@click.option(
+    "--stub/--no-stub",
+    default=True,
+    show_default=True,
+    help="Send the calls to a local StubServer.",
+)
+@click.option(
+    "--base-url",
+    default=None,
+    help="Send the calls to this URL instead of BASE_URL (with --no-stub).",
+)
+@click.option(
+    "--latency",
+    type=float,
+    default=0.02,
+    show_default=True,
+    help="Seconds the stub waits before each answer.",
+)
+@click.option(
+    "--error-rate",
+    type=float,
+    default=0.0,
+    show_default=True,
+    help="Fraction of the calls failed by the stub.",
+)
+@click.option(
+    "--json", "as_json", is_flag=True, help="Print one JSON report per step."
+)
+def loadtest_command(
+    scenario,
+    concurrency,
+    duration,
+    stub,
+    base_url,
+    latency,
+    error_rate,
+    as_json,
+):
+    """Measure the flows per second this node can sustain.
+
+    The scenario is run with a ramp of concurrencies, through the shared
+    transport of the app (with its scheduler, bulkheads and limits), and
+    the throughput (flows per second), latency percentiles (milliseconds)
+    and connections opened are reported for each step.
+    """
+    # the stub is only imported by the commands using it
+    from .stub import StubServer
+
+    steps = _parse_steps(concurrency)
+    config = current_app.config
+    state = current_app.extensions["mercadopago_state"]
+    access_token = config["APP_ACCESS_TOKEN"]
+    if (stub or base_url) and state._transport is not None:
+        raise click.UsageError(
+            "The transport of the app already calls BASE_URL, "
+            "unset MERCADOPAGO_WARMUP to call another one"
+        )
+    if not (stub or access_token):
+        raise click.UsageError("APP_ACCESS_TOKEN is needed to call the API")
+    server = None
+    if stub:
+        server = StubServer(latency=latency, error_rate=error_rate).start()
+        config["BASE_URL"] = server.url + "/v1"
+        access_token = access_token or "TEST-loadtest"
+    elif base_url:
+        config["BASE_URL"] = base_url
+
+    transport = state.transport
+    client = state.sellers.get("loadtest", access_token)
+    if not as_json:
+        click.echo(f"scenario {scenario} on {config['BASE_URL']}")
+        click.echo(
+            " ".join(
+                name.rjust(len(fmt.format(0)))
+                for name, fmt in LOADTEST_COLUMNS
+            )
+        )
+    try:
+        for step in steps:
+            before = _count_connections(transport, server)
+            report = run_load(SCENARIOS[scenario], client, step, duration)
+            after = _count_connections(transport, server)
+            report["scenario"] = scenario
+            report["connections"] = None if before is None else after - before
+            if as_json:
+                click.echo(json.dumps(report, sort_keys=True))
+            else:
+                click.echo(_format_report(report))
+    finally:
+        if server is not None:
+            server.stop()
+
+
+def _count_connections(transport, server):
+    """Get the connections opened so far, or ``None`` if unknown."""
+    if server is not None:
+        return server.connections
+    stats = getattr(transport, "stats", None)
+    return None if stats is None else stats().get("connections")
+
+
+def _format_report(report: dict) -> str:
+    """Format a report of ``run_load`` as a row of the table."""
+    cells = []
+    for name, fmt in LOADTEST_COLUMNS:
+        value = report[name]
+        cells.append(fmt.format("-" if value is None else value))
+    return " ".join(cells)
+
+
+@mercadopago_cli.command("warm")
+def warm_command():
+    """Fetch the catalogs of the API into the catalog cache.
+
+    With the config key MERCADOPAGO_CATALOG_FILE set, the workers of the
+    node read them from that file instead of calling the API.
+    """
+    mercadopago = current_app.extensions["mercadopago"]
+    if not current_app.config["MERCADOPAGO_CATALOG_FILE"]:
+        click.echo(
+            "MERCADOPAGO_CATALOG_FILE is not set, "
+            "the catalogs are only cached in this process",
+            err=True,
+        )
+    for name in sorted(CATALOGS):
+        catalog = mercadopago.catalog(name, refresh=True)
+        click.echo(f"{name}: {len(catalog)} entries")
+
+
+@mercadopago_cli.command("assets")
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(file_okay=False),
+    required=True,
+    help="Folder of the results.",
+)
+def assets_command(output):
+    """Precompute the integrity hashes of the static files.
+
+    The hashes are written to a sri.json manifest under --output, read by
+    the extension when the config key MERCADOPAGO_SRI_FILE points to it.
+    """
+    manifest = {}
+    for root, _, files in os.walk(STATIC_FOLDER):
+        for filename in sorted(files):
+            if not filename.endswith(ASSET_EXTENSIONS):
+                continue
+            path = os.path.join(root, filename)
+            name = os.path.relpath(path, STATIC_FOLDER).replace(os.sep, "/")
+            with open(path, "rb") as fp:
+                data = fp.read()
+            manifest[name] = get_sri(data)
+            click.echo(f"{name} {len(data)} bytes {manifest[name]}")
+    os.makedirs(output, exist_ok=True)
+    with open(os.path.join(output, "sri.json"), "w") as fp:
+        json.dump(manifest, fp, indent=2, sort_keys=True)
+
+
+@mercadopago_cli.command("stats")
+@click.argument("url")
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=5.0,
+    show_default=True,
+    help="Seconds to wait for the answer.",
+)
+def stats_command(url, timeout):
+    """Print the counters of a running worker as JSON.
+
+    URL is the MERCADOPAGO_STATS_ROUTE of the application, served by
+    the worker whose counters are printed, like
+    http://127.0.0.1:8000/mercadopago/stats.
+    """
+    import requests
+
+    try:
+        res = requests.get(url, timeout=timeout)
+        res.raise_for_status()
+        stats = res.json()
+    except (requests.RequestException, ValueError) as exc:
+        raise click.ClickException(f"Can't get the stats of {url}: {exc}")
+    click.echo(json.dumps(stats, indent=2, sort_keys=True))
+
+
+@mercadopago_cli.command("probe")
+@click.option(
+    "--count",
+    "-n",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="Number of calls.",
+)
+@click.option(
+    "--path",
+    default="/v1/payment_methods",
+    show_default=True,
+    help="Path of the API that is called.",
+)
+def probe_command(count, path):
+    """Measure the latency of the API at the configured BASE_URL.
+
+    The first call opens the connection, the next ones reuse it when the
+    transport keeps them.
+    """
+    from .transports import API_ORIGIN
+
+    config = dict(current_app.config)
+    config["MERCADOPAGO_CASSETTE"] = None
+    transport = create_transport(config)
+    headers = {"Accept": "application/json"}
+    if config["APP_ACCESS_TOKEN"]:
+        headers["Authorization"] = f"Bearer {config['APP_ACCESS_TOKEN']}"
+    url = API_ORIGIN + path
+    click.echo(f"probing {config['BASE_URL']} ({path})")
+    latencies = []
+    try:
+        for attempt in range(1, count + 1):
+            begin = time.perf_counter()
+            try:
+                status = transport.get(url, headers)["status"]
+            except Exception as exc:  # noqa
+                status = type(exc).__name__
+            elapsed = (time.perf_counter() - begin) * 1000.0
+            latencies.append(elapsed)
+            click.echo(f"{attempt:>3} {status} {elapsed:.1f} ms")
+    finally:
+        close = getattr(transport, "close", None)
+        if close is not None:
+            close()
+    warm = latencies[1:] or latencies
+    click.echo(
+        f"first {latencies[0]:.1f} ms, "
+        f"then min {min(warm):.1f} / median {statistics.median(warm):.1f}"
+        f" / max {max(warm):.1f} ms"
+    )
+
+
+@mercadopago_cli.command("sync")
+@click.option(
+    "--database",
+    "-d",
+    default="payments.db",
+    show_default=True,
+    help="SQLite file of the payments.",
+)
+@click.option(
+    "--start",
+    default="NOW-30DAYS",
+    show_default=True,
+    help="First date searched when the database has no checkpoint.",
+)
+@click.option(
+    "--page-size",
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help="Payments of each search page.",
+)
+def sync_command(database, start, page_size):
+    """Copy the payments updated since the last run to a SQLite database.
+
+    Only the payments whose date_last_updated is after the checkpoint of
+    the last run are fetched, and an interrupted run resumes after the
+    last stored page. Its calls have the batch priority.
+    """
+    mercadopago = current_app.extensions["mercadopago"]
+    with SQLiteSink(database) as sink, priority("batch"):
+        sync = PaymentSync(mercadopago, sink, start=start, page_size=page_size)
+        report = sync.run()
+        click.echo(
+            f"{report['payments']} payments in {report['pages']} pages, "
+            f"up to {report['checkpoint']} ({len(sink)} stored)"
+        )
+
+
+@mercadopago_cli.command("export")
+@click.argument("output")
+@click.option(
+    "--format",
+    "file_format",
+    type=click.Choice(sorted(set(EXPORT_FORMATS.values()))),
+    default=None,
+    help="Format of the file. Defaults to the one of the extension.",
+)
+@click.option(
+    "--range",
+    "range_field",
+    default="date_created",
+    show_default=True,
+    help="Date of the payments searched.",
+)
+@click.option(
+    "--begin", default="NOW-30DAYS", show_default=True, help="First date."
+)
+@click.option("--end", default="NOW", show_default=True, help="Last date.")
+@click.option(
+    "--status", default=None, help="Only export the payments in a status."
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=10000,
+    show_default=True,
+    help="Payments of each batch written.",
+)
+def export_command(
+    output, file_format, range_field, begin, end, status, batch_size
+):
+    """Export the payments of a date range to a Parquet, Arrow or CSV file.
+
+    The search pages are streamed and written in batches of a fixed set of
+    columns, so the memory used doesn't grow with the number of payments.
+    Its calls have the batch priority.
+    """
+    mercadopago = current_app.extensions["mercadopago"]
+    with priority("batch"):
+        report = export_payments(
+            mercadopago,
+            output,
+            filters=None if status is None else {"status": status},
+            file_format=file_format,
+            range_field=range_field,
+            begin=begin,
+            end=end,
+            batch_size=batch_size,
+        )
+    click.echo(
+        f"{report['rows']} payments in {report['batches']} batches "
+        f"written to {report['path']} ({report['format']})"
+    )
@@ -17,42 +17,128 @@
 Implementation of Mercadopago OAuth in Flask.
 """
 
-
 # =============================================================================
 # IMPORTS
 # =============================================================================
 
+import importlib
+import json
+import os
+import threading
+import typing
 import uuid
 import warnings
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
-from flask import Blueprint, Markup, current_app, url_for
+from flask import Blueprint, Markup, current_app, g, request, url_for
+from flask.cli import AppGroup
 
 import markupsafe
 
-from mercadopago.config import RequestOptions
-from mercadopago.http import HttpClient
-from mercadopago.resources import (
-    AdvancedPayment,
-    Card,
-    CardToken,
-    Chargeback,
-    Customer,
-    DisbursementRefund,
-    IdentificationType,
-    MerchantOrder,
-    Payment,
-    PaymentMethods,
-    Plan,
-    PreApproval,
-    Preference,
-    Refund,
-    Subscription,
-    User,
-)
-
-import requests
-
-from .utils import get_headers, get_payload
+from .resources import bind_accessors, resource_class, resource_path
+from .utils import LRUCache, get_headers, get_origin, get_payload
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+    from .catalog import CatalogCache
+    from .inbox import Inbox
+    from .installments import InstallmentQuotes
+    from .loader import RequestLoader
+    from .lookups import LookupCache
+    from .options import FrozenRequestOptions
+    from .outbox import Outbox
+    from .poller import OrderPoller
+    from .sellers import SellerClient, SellerRegistry
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Module of each name imported on first use, since the SDK (with
+#: ``requests``) and the transports are slow to import and not needed until
+#: the first call to the API.
+LAZY_IMPORTS = {
+    "AdvancedPayment": "mercadopago.resources",
+    "Card": "mercadopago.resources",
+    "CardToken": "mercadopago.resources",
+    "Chargeback": "mercadopago.resources",
+    "Customer": "mercadopago.resources",
+    "DisbursementRefund": "mercadopago.resources",
+    "IdentificationType": "mercadopago.resources",
+    "MerchantOrder": "mercadopago.resources",
+    "Payment": "mercadopago.resources",
+    "PaymentMethods": "mercadopago.resources",
+    "Plan": "mercadopago.resources",
+    "PreApproval": "mercadopago.resources",
+    "Preference": "mercadopago.resources",
+    "Refund": "mercadopago.resources",
+    "Subscription": "mercadopago.resources",
+    "User": "mercadopago.resources",
+    "HttpClient": "mercadopago.http",
+    "RequestOptions": "mercadopago.config",
+    "requests": "requests",
+    "AdaptiveLimiter": ".adaptive",
+    "BinIndex": ".bins",
+    "BulkheadHttpClient": ".bulkheads",
+    "merge_bulkheads": ".bulkheads",
+    "CATALOGS": ".catalog",
+    "CatalogCache": ".catalog",
+    "CassetteHttpClient": ".cassette",
+    "Inbox": ".inbox",
+    "InstallmentQuotes": ".installments",
+    "RequestLoader": ".loader",
+    "validate_identification": ".identification",
+    "LOOKUP_RESOURCES": ".lookups",
+    "LookupCache": ".lookups",
+    "notification_received": ".lookups",
+    "parse_notification": ".lookups",
+    "CircuitBreaker": ".outbox",
+    "Outbox": ".outbox",
+    "OrderPoller": ".poller",
+    "OutboundScheduler": ".scheduler",
+    "priority": ".scheduler",
+    "FrozenRequestOptions": ".options",
+    "freeze": ".options",
+    "options_key": ".options",
+    "SellerClient": ".sellers",
+    "SellerRegistry": ".sellers",
+    "API_ORIGIN": ".transports",
+    "AdaptiveHttpClient": ".transports",
+    "DNSCache": ".transports",
+    "Http2Client": ".transports",
+    "PooledHttpClient": ".transports",
+    "RebasedHttpClient": ".transports",
+    "ScheduledHttpClient": ".transports",
+}
+
+_loaded = {}
+
+#: The states of the apps warmed up again in every forked worker.
+_WARMUP_AFTER_FORK = weakref.WeakSet()
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _lazy(name: str):
+    """Get a name of ``LAZY_IMPORTS``, importing its module on first use."""
+    try:
+        return _loaded[name]
+    except KeyError:
+        module = importlib.import_module(LAZY_IMPORTS[name], __package__)
+        value = module if module.__name__ == name else getattr(module, name)
+        _loaded[name] = value
+        return value
+
+
+def __getattr__(name: str):
+    """Import the names of ``LAZY_IMPORTS`` when they are first used."""
+    if name in LAZY_IMPORTS:
+        return _lazy(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # docstr-coverage:excused `no one is reading this anyways`
@@ -99,6 +185,375 @@ def simple_scripts_js(url: str) -> str:
     return script
 
 
+def create_transport(config) -> object:
+    """Create the shared transport of an application.
+
+    Parameters
+    ----------
+    config : ``flask.Config``
+        The application config. ``MERCADOPAGO_TRANSPORT`` selects the
+        transport: ``"sdk"`` (``mercadopago.http.HttpClient``, the
+        default), ``"pooled"`` (``PooledHttpClient``) or ``"http2"``
+        (``Http2Client``).
+        When ``MERCADOPAGO_BULKHEADS`` is set, each resource family has its
+        own transport and workers in a ``BulkheadHttpClient``.
+        When the origin of ``BASE_URL`` isn't the one of the API, the calls
+        are sent there by a ``RebasedHttpClient``. When
+        ``MERCADOPAGO_ADAPTIVE_LIMITS`` is set, the calls in flight of each
+        resource are limited by an ``AdaptiveHttpClient``. When
+        ``MERCADOPAGO_PRIORITY_LIMITS`` or ``MERCADOPAGO_RATE_LIMIT`` is
+        set, they wait for their turn in an ``OutboundScheduler``. When
+        ``MERCADOPAGO_CASSETTE`` is set, they are recorded to (or replayed
+        from) that file by a ``CassetteHttpClient``.
+
+    Return
+    ------
+    transport : ``mercadopago.http.HttpClient``
+        An implementation of the ``HttpClient`` interface.
+    """
+    kind = config["MERCADOPAGO_TRANSPORT"]
+    maxsize = config["MERCADOPAGO_POOL_MAXSIZE"]
+    dns_ttl = config["MERCADOPAGO_DNS_TTL"]
+    resolver = None
+    if kind == "pooled" and dns_ttl:
+        resolver = _lazy("DNSCache")(ttl=dns_ttl)
+
+    def make_client(maxsize):
+        """Create a client of the selected kind with ``maxsize`` connections."""
+        if kind == "pooled":
+            return _lazy("PooledHttpClient")(
+                maxsize=maxsize, resolver=resolver
+            )
+        if kind == "http2":
+            return _lazy("Http2Client")(max_connections=maxsize)
+        if kind == "sdk":
+            return _lazy("HttpClient")()
+        raise ValueError(f"Unknown MERCADOPAGO_TRANSPORT {kind!r}")
+
+    bulkheads = config["MERCADOPAGO_BULKHEADS"]
+    if bulkheads:
+        transport = _lazy("BulkheadHttpClient")(
+            make_client,
+            _lazy("merge_bulkheads")(None if bulkheads is True else bulkheads),
+            default_maxsize=maxsize,
+            timeout=config["MERCADOPAGO_BULKHEAD_WAIT"],
+        )
+    else:
+        transport = make_client(maxsize)
+    origin = get_origin(config["BASE_URL"])
+    if origin != _lazy("API_ORIGIN"):
+        transport = _lazy("RebasedHttpClient")(transport, origin)
+    if config["MERCADOPAGO_ADAPTIVE_LIMITS"]:
+        limiter = _lazy("AdaptiveLimiter")(
+            max_limit=config["MERCADOPAGO_ADAPTIVE_MAX"],
+            tolerance=config["MERCADOPAGO_LATENCY_TOLERANCE"],
+        )
+        transport = _lazy("AdaptiveHttpClient")(transport, limiter)
+    limits = config["MERCADOPAGO_PRIORITY_LIMITS"]
+    rate = config["MERCADOPAGO_RATE_LIMIT"]
+    if limits or rate:
+        scheduler = _lazy("OutboundScheduler")(
+            limits, rate=rate, burst=config["MERCADOPAGO_RATE_BURST"]
+        )
+        transport = _lazy("ScheduledHttpClient")(transport, scheduler)
+    cassette = config["MERCADOPAGO_CASSETTE"]
+    if cassette:
+        transport = _lazy("CassetteHttpClient")(
+            transport,
+            cassette,
+            mode=config["MERCADOPAGO_CASSETTE_MODE"],
+            latency=config["MERCADOPAGO_CASSETTE_LATENCY"],
+        )
+    return transport
+
+
+def _warmup_after_fork():
+    """Warm up the apps with ``MERCADOPAGO_WARMUP_AFTER_FORK`` in a child."""
+    for state in list(_WARMUP_AFTER_FORK):
+        app = state.app
+        threading.Thread(
+            target=app.extensions["mercadopago"].warmup,
+            args=(app,),
+            daemon=True,
+        ).start()
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=_warmup_after_fork)
+
+
+class _LazyCommands(AppGroup):
+    """The ``flask mercadopago`` group, importing its commands on first use.
+
+    The commands import most of the extension, so they are only loaded
+    when the command line lists or runs them.
+    """
+
+    def _commands(self):
+        """Get the group of the commands, importing it."""
+        from .cli import mercadopago_cli
+
+        return mercadopago_cli
+
+    def list_commands(self, ctx):
+        """List the names of the commands."""
+        return self._commands().list_commands(ctx)
+
+    def get_command(self, ctx, cmd_name):
+        """Get a command by its name."""
+        return self._commands().get_command(ctx, cmd_name)
+
+
+class _MercadopagoState(object):
+    """Objects of the extension shared by every request of an application."""
+
+    def __init__(self, app):
+        self.app = app
+        self._lock = threading.Lock()
+        self._transport = None
+        self._sellers = None
+        self._catalogs = None
+        self._request_options = None
+        self.frozen_options = LRUCache(64)
+        self._poller = None
+        self._lookups = None
+        self._installments = None
+        self._executor = None
+        self._executor_pid = None
+        self._inbox_executor = None
+        self._inbox_executor_pid = None
+        self._outbox = None
+        self._inbox = None
+        self._sri_manifest = None
+        self.resources = {}
+        self.bin_index = None
+
+    @property
+    def transport(self):
+        """The shared transport, created on first use."""
+        if self._transport is None:
+            with self._lock:
+                if self._transport is None:
+                    self._transport = create_transport(self.app.config)
+        return self._transport
+
+    @property
+    def sri_manifest(self) -> dict:
+        """The integrity of the static files, read on first use."""
+        if self._sri_manifest is None:
+            path = self.app.config["MERCADOPAGO_SRI_FILE"]
+            manifest = {}
+            if path is not None:
+                with open(path) as fp:
+                    manifest = json.load(fp)
+            self._sri_manifest = manifest
+        return self._sri_manifest
+
+    @property
+    def request_options(self) -> "FrozenRequestOptions":
+        """The default options of the calls, created on first use."""
+        if self._request_options is None:
+            self._request_options = _lazy("FrozenRequestOptions")()
+        return self._request_options
+
+    @property
+    def sellers(self) -> "SellerRegistry":
+        """The registry of the seller clients, created on first use."""
+        if self._sellers is None:
+            transport = self.transport
+            with self._lock:
+                if self._sellers is None:
+                    self._sellers = _lazy("SellerRegistry")(
+                        self.app.config["MERCADOPAGO_SELLER_CACHE_SIZE"],
+                        transport,
+                        self.app.extensions["mercadopago"]._load_seller_token,
+                        self.app.extensions["mercadopago"]._run_resource_hooks,
+                    )
+        return self._sellers
+
+    @property
+    def catalogs(self) -> "CatalogCache":
+        """The cache of the catalogs, created on first use."""
+        if self._catalogs is None:
+            with self._lock:
+                if self._catalogs is None:
+                    self._catalogs = _lazy("CatalogCache")(
+                        self.app.config["MERCADOPAGO_CATALOG_TTL"],
+                        self.app.config["MERCADOPAGO_CATALOG_FILE"],
+                    )
+        return self._catalogs
+
+    @property
+    def poller(self) -> "OrderPoller":
+        """The poller of the merchant orders, created on first use."""
+        if self._poller is None:
+            with self._lock:
+                if self._poller is None:
+                    config = self.app.config
+                    self._poller = _lazy("OrderPoller")(
+                        self._fetch_merchant_order,
+                        min_interval=config["MERCADOPAGO_POLL_MIN_INTERVAL"],
+                        max_interval=config["MERCADOPAGO_POLL_MAX_INTERVAL"],
+                        backoff=config["MERCADOPAGO_POLL_BACKOFF"],
+                        max_age=config["MERCADOPAGO_POLL_MAX_AGE"],
+                        workers=config["MERCADOPAGO_POLL_WORKERS"],
+                        sender=self.app,
+                    )
+        return self._poller
+
+    @property
+    def lookups(self) -> "LookupCache":
+        """The cache of ``Mercadopago.lookup``, created on first use."""
+        if self._lookups is None:
+            with self._lock:
+                if self._lookups is None:
+                    self._lookups = _lazy("LookupCache")(
+                        self.app.config["MERCADOPAGO_LOOKUP_CACHE_SIZE"],
+                        self.app.config["MERCADOPAGO_LOOKUP_TTL"],
+                    )
+        return self._lookups
+
+    @property
+    def installments(self) -> "InstallmentQuotes":
+        """The cache of the installments quotes, created on first use."""
+        if self._installments is None:
+            with self._lock:
+                if self._installments is None:
+                    self._installments = _lazy("InstallmentQuotes")(
+                        self.app.config["MERCADOPAGO_QUOTE_CACHE_SIZE"],
+                        self.app.config["MERCADOPAGO_QUOTE_TTL"],
+                    )
+        return self._installments
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The threads fetching the batches of the request loaders."""
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(
+                        self.app.config["MERCADOPAGO_LOADER_WORKERS"],
+                        thread_name_prefix="mercadopago-loader",
+                    )
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    @property
+    def inbox_executor(self) -> ThreadPoolExecutor:
+        """The threads fetching the batches of the notifications inbox."""
+        pid = os.getpid()
+        if self._inbox_executor is None or self._inbox_executor_pid != pid:
+            with self._lock:
+                if (
+                    self._inbox_executor is None
+                    or self._inbox_executor_pid != pid
+                ):
+                    self._inbox_executor = ThreadPoolExecutor(
+                        self.app.config["MERCADOPAGO_INBOX_WORKERS"],
+                        thread_name_prefix="mercadopago-inbox",
+                    )
+                    self._inbox_executor_pid = pid
+        return self._inbox_executor
+
+    @property
+    def outbox(self) -> "Outbox":
+        """The outbox of the creations, created (and started) on first use."""
+        if self._outbox is None:
+            with self._lock:
+                if self._outbox is None:
+                    config = self.app.config
+                    path = config["MERCADOPAGO_OUTBOX_FILE"]
+                    if path is None:
+                        os.makedirs(self.app.instance_path, exist_ok=True)
+                        path = os.path.join(
+                            self.app.instance_path, "mercadopago-outbox.db"
+                        )
+                    breaker = _lazy("CircuitBreaker")(
+                        config["MERCADOPAGO_BREAKER_THRESHOLD"],
+                        config["MERCADOPAGO_BREAKER_RESET"],
+                    )
+                    self._outbox = _lazy("Outbox")(
+                        path,
+                        self._send_creation,
+                        workers=config["MERCADOPAGO_OUTBOX_WORKERS"],
+                        breaker=breaker,
+                    )
+                    self._outbox.start()
+        return self._outbox
+
+    @property
+    def inbox(self) -> "Inbox":
+        """The notifications inbox, created (and started) on first use."""
+        if self._inbox is None:
+            with self._lock:
+                if self._inbox is None:
+                    config = self.app.config
+                    path = config["MERCADOPAGO_INBOX_FILE"]
+                    if path is None:
+                        os.makedirs(self.app.instance_path, exist_ok=True)
+                        path = os.path.join(
+                            self.app.instance_path, "mercadopago-inbox.db"
+                        )
+                    self._inbox = _lazy("Inbox")(
+                        path,
+                        self._handle_notifications,
+                        batch_size=config["MERCADOPAGO_INBOX_BATCH"],
+                        lease=config["MERCADOPAGO_INBOX_LEASE"],
+                        max_attempts=config["MERCADOPAGO_INBOX_MAX_ATTEMPTS"],
+                    )
+                    self._inbox.start()
+        return self._inbox
+
+    def _handle_notifications(self, name: str, resource_ids: list):
+        """Refresh the resources of a batch of notifications, together.
+
+        The batch is fetched by its own threads, with the ``batch``
+        priority, so it does not delay the requests of the views.
+        """
+        app = self.app
+        mercadopago = app.extensions["mercadopago"]
+
+        def fetch(name, resource_id):
+            """Get a notified resource from the threads of the inbox."""
+            with app.app_context():
+                return mercadopago.resource(name).get(resource_id)
+
+        for resource_id in resource_ids:
+            self.lookups.invalidate(name, resource_id)
+        loader = _lazy("RequestLoader")(fetch, self.inbox_executor)
+        with _lazy("priority")("batch"):
+            results = loader.get_many(name, resource_ids)
+        for resource_id, result in zip(resource_ids, results):
+            if result["status"] == 200:
+                self.lookups.put(name, resource_id, result)
+            if name == "merchant_order" and self._poller is not None:
+                self._poller.poke(resource_id)
+            _lazy("notification_received").send(
+                app, name=name, resource_id=resource_id
+            )
+
+    def _send_creation(self, name: str, data: dict, key: str) -> dict:
+        """Create a resource from the threads of the outbox."""
+        with self.app.app_context():
+            mercadopago = self.app.extensions["mercadopago"]
+            options = mercadopago._get_request_options()
+            headers = dict(options.custom_headers or {})
+            headers["x-idempotency-key"] = key
+            options = options.replace(custom_headers=headers)
+            return mercadopago.resource(name, request_options=options).create(
+                data
+            )
+
+    def _fetch_merchant_order(self, order_id) -> dict:
+        """Get a merchant order from the threads of the poller."""
+        with self.app.app_context(), _lazy("priority")("batch"):
+            mercadopago = self.app.extensions["mercadopago"]
+            result = mercadopago.merchant_order().get(order_id)
+        if result["status"] == 200:
+            self.lookups.put("merchant_order", order_id, result)
+        return result
+
+
 class Mercadopago(object):
     """Base extension class for different of Mercadopago versions.
 
@@ -127,6 +582,8 @@ class Mercadopago(object):
     static_folder = "mercadopago"
 
     def __init__(self, app=None):
+        self._seller_token_loader = None
+        self._resource_hooks = ()
         if app is not None:
             self.init_app(app)
 
@@ -150,11 +607,58 @@ class Mercadopago(object):
         )
         app.config.setdefault("RESPONSE_TYPE", "code")
         app.config.setdefault("MERCADOPAGO_SERVE_LOCAL", False)
+        app.config.setdefault("MERCADOPAGO_SRI_FILE", None)
+        app.config.setdefault("MERCADOPAGO_STATS_ROUTE", None)
+        app.config.setdefault("MERCADOPAGO_TRANSPORT", "sdk")
+        app.config.setdefault("MERCADOPAGO_POOL_MAXSIZE", 10)
+        app.config.setdefault("MERCADOPAGO_WARMUP_CONNECTIONS", 2)
+        app.config.setdefault("MERCADOPAGO_WARMUP_AFTER_FORK", False)
+        app.config.setdefault("MERCADOPAGO_WARMUP", False)
+        app.config.setdefault("MERCADOPAGO_DNS_TTL", 300)
+        app.config.setdefault("MERCADOPAGO_SELLER_CACHE_SIZE", 1024)
+        app.config.setdefault("MERCADOPAGO_CASSETTE", None)
+        app.config.setdefault("MERCADOPAGO_CASSETTE_MODE", "once")
+        app.config.setdefault("MERCADOPAGO_CASSETTE_LATENCY", 0.0)
+        app.config.setdefault("MERCADOPAGO_CATALOG_TTL", 3600)
+        app.config.setdefault("MERCADOPAGO_CATALOG_FILE", None)
+        app.config.setdefault("MERCADOPAGO_POLL_MIN_INTERVAL", 2.0)
+        app.config.setdefault("MERCADOPAGO_POLL_MAX_INTERVAL", 60.0)
+        app.config.setdefault("MERCADOPAGO_POLL_BACKOFF", 1.5)
+        app.config.setdefault("MERCADOPAGO_POLL_MAX_AGE", 3600.0)
+        app.config.setdefault("MERCADOPAGO_POLL_WORKERS", 4)
+        app.config.setdefault("MERCADOPAGO_LOOKUP_CACHE_SIZE", 1024)
+        app.config.setdefault("MERCADOPAGO_LOOKUP_TTL", 300.0)
+        app.config.setdefault("MERCADOPAGO_NOTIFICATION_ROUTE", None)
+        app.config.setdefault("MERCADOPAGO_QUOTE_CACHE_SIZE", 4096)
+        app.config.setdefault("MERCADOPAGO_QUOTE_TTL", 600.0)
+        app.config.setdefault("MERCADOPAGO_LOADER_WORKERS", 8)
+        app.config.setdefault("MERCADOPAGO_PRIORITY_LIMITS", None)
+        app.config.setdefault("MERCADOPAGO_RATE_LIMIT", None)
+        app.config.setdefault("MERCADOPAGO_RATE_BURST", None)
+        app.config.setdefault("MERCADOPAGO_ADAPTIVE_LIMITS", False)
+        app.config.setdefault("MERCADOPAGO_ADAPTIVE_MAX", 64)
+        app.config.setdefault("MERCADOPAGO_LATENCY_TOLERANCE", 2.0)
+        app.config.setdefault("MERCADOPAGO_BULKHEADS", None)
+        app.config.setdefault("MERCADOPAGO_BULKHEAD_WAIT", 1.0)
+        app.config.setdefault("MERCADOPAGO_OUTBOX_FILE", None)
+        app.config.setdefault("MERCADOPAGO_OUTBOX_WORKERS", 4)
+        app.config.setdefault("MERCADOPAGO_BREAKER_THRESHOLD", 5)
+        app.config.setdefault("MERCADOPAGO_BREAKER_RESET", 30.0)
+        app.config.setdefault("MERCADOPAGO_INBOX", False)
+        app.config.setdefault("MERCADOPAGO_INBOX_FILE", None)
+        app.config.setdefault("MERCADOPAGO_INBOX_BATCH", 500)
+        app.config.setdefault("MERCADOPAGO_INBOX_LEASE", 60.0)
+        app.config.setdefault("MERCADOPAGO_INBOX_MAX_ATTEMPTS", 5)
+        app.config.setdefault("MERCADOPAGO_INBOX_WORKERS", 4)
 
         if not hasattr(app, "extensions"):  # pragma: no cover
             app.extensions = {}
 
         app.extensions["mercadopago"] = self
+        app.extensions["mercadopago_state"] = _MercadopagoState(app)
+
+        if app.config["MERCADOPAGO_WARMUP_AFTER_FORK"]:
+            _WARMUP_AFTER_FORK.add(app.extensions["mercadopago_state"])
 
         blueprint = Blueprint(
             "mercadopago",
@@ -163,6 +667,19 @@ class Mercadopago(object):
             static_url_path=f"{app.static_url_path}",
             template_folder="templates",
         )
+        if app.config["MERCADOPAGO_NOTIFICATION_ROUTE"]:
+            blueprint.add_url_rule(
+                app.config["MERCADOPAGO_NOTIFICATION_ROUTE"],
+                "notification",
+                self._notification_view,
+                methods=["POST"],
+            )
+        if app.config["MERCADOPAGO_STATS_ROUTE"]:
+            blueprint.add_url_rule(
+                app.config["MERCADOPAGO_STATS_ROUTE"],
+                "stats",
+                self._stats_view,
+            )
 
         app.register_blueprint(blueprint)
         app.jinja_env.globals["mercadopago"] = self
@@ -170,6 +687,635 @@ class Mercadopago(object):
         app.jinja_env.globals["raise"] = raise_helper
         app.jinja_env.add_extension("jinja2.ext.do")
 
+        app.cli.add_command(
+            _LazyCommands(
+                "mercadopago", help="Commands of the Mercadopago extension."
+            )
+        )
+
+        if app.config["MERCADOPAGO_WARMUP"]:
+            self.warmup(app)
+
+    def _get_state(self, app=None) -> _MercadopagoState:
+        """Get the state of the extension for the given (or current) app."""
+        app = current_app if app is None else app
+        return app.extensions["mercadopago_state"]
+
+    def _get_request_options(self, request_options=None):
+        """Get the options of a call, with the access token of the app.
+
+        The given options are never modified, so they can be shared by
+        many threads: the frozen ones derive (and keep) the options with
+        the token, and the other ones are used as they are if they have it,
+        else frozen once (for each set of values) and derived the same way.
+        A missing token raises ``ValueError``, like ``RequestOptions``.
+        """
+        access_token = current_app.config["APP_ACCESS_TOKEN"]
+        if request_options is None:
+            request_options = self._get_state().request_options
+        elif not isinstance(request_options, _lazy("FrozenRequestOptions")):
+            if (
+                access_token is not None
+                and request_options.access_token == access_token
+            ):
+                return request_options
+            frozen_options = self._get_state().frozen_options
+            key = _lazy("options_key")(request_options)
+            frozen = frozen_options.get(key)
+            if frozen is None:
+                frozen = _lazy("freeze")(request_options)
+                frozen_options.put(key, frozen)
+            request_options = frozen
+        return request_options.with_access_token(access_token)
+
+    @property
+    def transport(self):
+        """The ``HttpClient`` shared by the accessors of the current app.
+
+        It is created on first use, following the ``MERCADOPAGO_TRANSPORT``
+        config key. Its connections are opened lazily in each process, so it
+        is safe to use from workers forked after ``init_app``.
+        """
+        return self._get_state().transport
+
+    def warmup(self, app=None, connections: int = None) -> int:
+        """Open the connections of the shared transport ahead of traffic.
+
+        The hosts of ``BASE_URL`` and ``TOKEN_ENDPOINT`` are resolved (and
+        cached for ``MERCADOPAGO_DNS_TTL`` seconds) and the TLS connections
+        (whose sessions are resumed by the next ones) are left in the pool,
+        so the first user doesn't pay for them. ``AUTHORIZATION_ENDPOINT``
+        is only visited by the browser of the user, so it is not warmed up.
+
+        Set ``MERCADOPAGO_WARMUP`` to warm up in ``init_app``. Under a
+        pre-fork server, call it from each worker before it takes requests,
+        for example from the ``post_fork`` hook of gunicorn::
+
+            def post_fork(server, worker):
+                mercadopago.warmup(app)
+
+        or set ``MERCADOPAGO_WARMUP_AFTER_FORK`` to warm up every forked
+        worker in a background thread. The ``"sdk"`` transport opens a new
+        connection per call, so it has nothing to warm up.
+
+        Parameters
+        ----------
+        app : ``flask.Flask`` or ``None`` (optional)
+            The application. Defaults to the current app.
+        connections : ``int`` or ``None`` (optional)
+            How many connections are opened to each host. The config key
+            ``MERCADOPAGO_WARMUP_CONNECTIONS`` is ``2``.
+
+        Return
+        ------
+        opened : ``int``
+            The number of connections ready in the pool.
+        """
+        app = current_app if app is None else app
+        _connections = (
+            app.config["MERCADOPAGO_WARMUP_CONNECTIONS"]
+            if connections is None
+            else connections
+        )
+        origins = []
+        for key in ("BASE_URL", "TOKEN_ENDPOINT"):
+            origin = get_origin(app.config[key])
+            if origin not in origins:
+                origins.append(origin)
+        warmup = getattr(self._get_state(app).transport, "warmup", None)
+        return 0 if warmup is None else warmup(origins, _connections)
+
+    def catalog(self, name: str, refresh: bool = False) -> list:
+        """Get a catalog of the API, cached for ``MERCADOPAGO_CATALOG_TTL``.
+
+        The catalogs are the same for every buyer and rarely change, so
+        they are fetched once per process (or once per node, when the
+        config key ``MERCADOPAGO_CATALOG_FILE`` is set) instead of on each
+        checkout page.
+
+        Parameters
+        ----------
+        name : ``str``
+            ``"payment_methods"`` or ``"identification_types"``.
+        refresh : ``bool`` (optional)
+            Fetch it again even if it is cached. Defaults to ``False``.
+
+        Return
+        ------
+        catalog : ``list``
+            The objects of the catalog.
+        """
+        catalogs = _lazy("CATALOGS")
+        if name not in catalogs:
+            raise ValueError(f"Unknown catalog {name!r}")
+
+        def load():
+            """Fetch the catalog from the API."""
+            res = getattr(self, catalogs[name])().list_all()
+            if res["status"] != 200:
+                raise RuntimeError(
+                    f"Mercadopago answered {res['status']} for {name}"
+                )
+            return res["response"]
+
+        return self._get_state().catalogs.get(name, load, refresh)
+
+    def resolve_bin(self, bin_number) -> list:
+        """Get the payment methods of the BIN of a card number, locally.
+
+        The BINs are resolved with an index of the patterns of the cached
+        ``payment_methods`` catalog instead of calling the API each time
+        a number is typed, and the index is rebuilt when the catalog is
+        refreshed::
+
+            methods = mercadopago.resolve_bin("450995")
+            payment_method_id = methods[0]["id"] if methods else None
+
+        Parameters
+        ----------
+        bin_number : ``str`` or ``int``
+            The first 6 (or more) digits of the card number.
+
+        Return
+        ------
+        methods : ``list`` of ``dict``
+            The payment methods of the catalog matching the BIN, usually
+            one. They must not be changed.
+        """
+        methods = self.catalog("payment_methods")
+        state = self._get_state()
+        index = state.bin_index
+        if index is None or index.methods is not methods:
+            with state._lock:
+                index = state.bin_index
+                if index is None or index.methods is not methods:
+                    index = _lazy("BinIndex")(methods, previous=index)
+                    state.bin_index = index
+        return index.resolve(bin_number)
+
+    def quote_installments(
+        self,
+        amount: float,
+        bin_number=None,
+        payment_method_id: str = None,
+        issuer_id=None,
+    ) -> list:
+        """Get the installments of an amount, calling the API when needed.
+
+        The quotes are cached by card and amount bucket, and the amounts
+        between two quotes of a bucket are computed from the cached rates
+        (see :class:`flask_mercadopago.installments.InstallmentQuotes`), so
+        the payment form can quote each amount typed::
+
+            options = mercadopago.quote_installments(150.0, "450995")
+            payer_costs = options[0]["payer_costs"]
+
+        The cache keeps ``MERCADOPAGO_QUOTE_CACHE_SIZE`` quotes for
+        ``MERCADOPAGO_QUOTE_TTL`` seconds.
+
+        Parameters
+        ----------
+        amount : ``float``
+            The amount of the payment.
+        bin_number : ``str`` or ``None`` (optional)
+            The card number, or its first 6 digits.
+        payment_method_id : ``str`` or ``None`` (optional)
+            The id of the payment method.
+        issuer_id : ``int`` or ``None`` (optional)
+            The id of the issuer.
+
+        Return
+        ------
+        options : ``list`` of ``dict``
+            The ``payer_costs`` of each payment method and issuer.
+        """
+        resource = self.resource("installments")
+
+        def load(filters):
+            """Fetch the installments from the API."""
+            res = resource.get(filters)
+            if res["status"] != 200:
+                raise RuntimeError(
+                    f"Mercadopago answered {res['status']} for installments"
+                )
+            return res["response"]
+
+        return self._get_state().installments.quote(
+            amount, load, bin_number, payment_method_id, issuer_id
+        )
+
+    def validate_identification(self, type_id: str, number) -> str:
+        """Check the document number of a buyer, without calling the API.
+
+        The length and characters are checked with the cached
+        ``identification_types`` catalog and the verification digits of
+        the documents that have them (like CPF, CNPJ or CUIT) with
+        :data:`flask_mercadopago.identification.CHECKSUMS`::
+
+            try:
+                number = mercadopago.validate_identification("CPF", number)
+            except ValueError as error:
+                flash(str(error))
+
+        Parameters
+        ----------
+        type_id : ``str``
+            The ``id`` of the identification type, like ``"CPF"``.
+        number : ``str`` or ``int``
+            The number typed, with or without separators.
+
+        Return
+        ------
+        number : ``str``
+            The number, normalized.
+        """
+        return _lazy("validate_identification")(
+            type_id, number, self.catalog("identification_types")
+        )
+
+    def stats(self, app=None) -> dict:
+        """Get the counters of the shared objects of the extension.
+
+        Parameters
+        ----------
+        app : ``flask.Flask`` or ``None`` (optional)
+            The application. Defaults to the current one.
+
+        Return
+        ------
+        stats : ``dict``
+            The counters of the ``transport`` connections, the ``sellers``
+            registry, the ``catalogs`` cache, the merchant order ``poller``,
+            the ``lookups`` cache, the ``installments`` quotes, the
+            ``outbox`` and the notifications ``inbox`` of this process.
+        """
+        state = self._get_state(app)
+        transport_stats = getattr(state.transport, "stats", None)
+        return {
+            "transport": {} if transport_stats is None else transport_stats(),
+            "sellers": {"clients": len(state.sellers)},
+            "catalogs": state.catalogs.stats(),
+            "poller": {} if state._poller is None else state._poller.stats(),
+            "lookups": state.lookups.stats(),
+            "installments": state.installments.stats(),
+            "outbox": {} if state._outbox is None else state._outbox.stats(),
+            "inbox": {} if state._inbox is None else state._inbox.stats(),
+        }
+
+    @property
+    def loader(self) -> "RequestLoader":
+        """The loader of the resources read by the current request.
+
+        It is kept in ``flask.g``, so the reads are memoized until the end
+        of the request, and the ids announced with ``prefetch`` are fetched
+        together, by ``MERCADOPAGO_LOADER_WORKERS`` threads, on the first
+        read::
+
+            mercadopago.loader.prefetch("payment", payment_ids)
+            payments = mercadopago.loader.get_many("payment", payment_ids)
+            payment = mercadopago.loader.get("payment", payment_ids[0])
+
+        Any accessor whose resource has a ``get`` method can be read.
+        """
+        loader = g.get("_mercadopago_loader")
+        if loader is None:
+            app = current_app._get_current_object()
+
+            def fetch(name, resource_id):
+                """Get a resource from a thread of the executor."""
+                with app.app_context():
+                    return self.resource(name).get(resource_id)
+
+            loader = _lazy("RequestLoader")(
+                fetch, self._get_state(app).executor
+            )
+            g._mercadopago_loader = loader
+        return loader
+
+    @property
+    def outbox(self) -> "Outbox":
+        """The outbox of the creations of the current app.
+
+        A creation submitted to it is stored (with its idempotency key) in
+        the SQLite file ``MERCADOPAGO_OUTBOX_FILE`` and sent by
+        ``MERCADOPAGO_OUTBOX_WORKERS`` background threads, retried until
+        the API answers it, so a checkout isn't lost while the API is
+        down. The sends stop for ``MERCADOPAGO_BREAKER_RESET`` seconds
+        after ``MERCADOPAGO_BREAKER_THRESHOLD`` failures in a row::
+
+            handle = mercadopago.outbox.submit("preference", data)
+            result = handle.wait(timeout=2)
+            if result is None:
+                ...  # show the order as pending, keep handle.key
+
+        Any accessor whose resource has a ``create`` method can be used.
+        """
+        return self._get_state().outbox
+
+    @property
+    def order_poller(self) -> "OrderPoller":
+        """The poller of the merchant orders of the current app.
+
+        Watch the pending orders with it instead of polling them from each
+        request: every order is polled once, with intervals growing while
+        it doesn't change (see the ``MERCADOPAGO_POLL_*`` config keys)::
+
+            order = mercadopago.order_poller.wait(order_id, timeout=25)
+
+            mercadopago.order_poller.watch(order_id, on_change)
+
+            @merchant_order_changed.connect_via(app)
+            def on_change(app, order_id, order, previous):
+                ...
+        """
+        return self._get_state().poller
+
+    def lookup(self, name: str, resource_id, refresh: bool = False) -> dict:
+        """Get a payment or merchant order, from the cache when possible.
+
+        The result of ``get`` is cached on the first read, and dropped
+        when a notification for the resource is handled by
+        :meth:`handle_notification`, so the pages showing the state of an
+        order don't call the API on each render::
+
+            payment = mercadopago.lookup("payment", payment_id)
+
+        The cache keeps ``MERCADOPAGO_LOOKUP_CACHE_SIZE`` resources for at
+        most ``MERCADOPAGO_LOOKUP_TTL`` seconds, in case a notification is
+        lost.
+
+        Parameters
+        ----------
+        name : ``str``
+            ``"payment"`` or ``"merchant_order"``.
+        resource_id : ``int`` or ``str``
+            The id of the resource.
+        refresh : ``bool`` (optional)
+            Fetch it again even if it is cached. Defaults to ``False``.
+
+        Return
+        ------
+        result : ``dict``
+            The result of ``get``, with the ``status`` and ``response``.
+        """
+        if name not in _lazy("LOOKUP_RESOURCES"):
+            raise ValueError(f"Resource {name!r} can't be looked up")
+        resource = self.resource(name)
+        return self._get_state().lookups.get(
+            name, resource_id, lambda: resource.get(resource_id), refresh
+        )
+
+    def handle_notification(self, args=None, body=None, refresh=False):
+        """Handle a notification (webhook or IPN) of Mercadopago.
+
+        The cached result of the notified payment or merchant order is
+        dropped (or replaced, with ``refresh``), the poller checks the
+        notified merchant order right away and the
+        ``notification_received`` signal is sent. Call it from the view
+        receiving the notifications, or set the config key
+        ``MERCADOPAGO_NOTIFICATION_ROUTE`` (like ``"/mercadopago/notify"``)
+        to add a view calling it.
+
+        Parameters
+        ----------
+        args : ``dict`` or ``None`` (optional)
+            The query string. Defaults to the one of the current request.
+        body : ``dict`` or ``None`` (optional)
+            The JSON body. Defaults to the one of the current request.
+        refresh : ``bool`` (optional)
+            Fetch the notified resource again now. Defaults to ``False``.
+
+        Return
+        ------
+        resource : ``tuple`` or ``None``
+            The name of the accessor and the id of the notified resource,
+            or ``None`` if it isn't one of the cached resources.
+        """
+        if args is None:
+            args = request.args
+            body = request.get_json(silent=True) if body is None else body
+        notified = _lazy("parse_notification")(args, body)
+        if notified is None:
+            return None
+        name, resource_id = notified
+        state = self._get_state()
+        state.lookups.invalidate(name, resource_id)
+        if name == "merchant_order" and state._poller is not None:
+            state._poller.poke(resource_id)
+        _lazy("notification_received").send(
+            current_app._get_current_object(),
+            name=name,
+            resource_id=resource_id,
+        )
+        if refresh:
+            self.lookup(name, resource_id, refresh=True)
+        return notified
+
+    def enqueue_notification(self, args=None, body=None):
+        """Store a notification in the inbox, to be handled in a batch.
+
+        The notification is written to the SQLite file
+        ``MERCADOPAGO_INBOX_FILE`` and the view can answer at once. A
+        background thread handles the stored ones in batches of up to
+        ``MERCADOPAGO_INBOX_BATCH``: the ids of each accessor are fetched
+        once and together, the cached results are replaced, the poller
+        checks the merchant orders and the ``notification_received``
+        signal is sent for each resource. A batch is handled again after
+        ``MERCADOPAGO_INBOX_LEASE`` seconds if it failed or the process
+        crashed, up to ``MERCADOPAGO_INBOX_MAX_ATTEMPTS`` times. When the
+        config key ``MERCADOPAGO_INBOX`` is set, the view of
+        ``MERCADOPAGO_NOTIFICATION_ROUTE`` calls it instead of
+        :meth:`handle_notification`.
+
+        Parameters
+        ----------
+        args : ``dict`` or ``None`` (optional)
+            The query string. Defaults to the one of the current request.
+        body : ``dict`` or ``None`` (optional)
+            The JSON body. Defaults to the one of the current request.
+
+        Return
+        ------
+        resource : ``tuple`` or ``None``
+            The name of the accessor and the id of the notified resource,
+            or ``None`` if it isn't one of the cached resources.
+        """
+        if args is None:
+            args = request.args
+            body = request.get_json(silent=True) if body is None else body
+        notified = _lazy("parse_notification")(args, body)
+        if notified is not None:
+            self._get_state().inbox.append(*notified)
+        return notified
+
+    def _notification_view(self):
+        """Answer the notifications sent to ``MERCADOPAGO_NOTIFICATION_ROUTE``."""
+        if current_app.config["MERCADOPAGO_INBOX"]:
+            self.enqueue_notification()
+        else:
+            self.handle_notification()
+        return "", 200
+
+    def _stats_view(self):
+        """Answer the counters of this worker at ``MERCADOPAGO_STATS_ROUTE``."""
+        return current_app.response_class(
+            json.dumps(self.stats(), sort_keys=True, default=str),
+            mimetype="application/json",
+        )
+
+    def seller_token_loader(self, callback):
+        """Register the callback giving the access token of a seller.
+
+        It is called with the user id of a seller the first time a client
+        is needed for it by :meth:`for_seller`::
+
+            @mercadopago.seller_token_loader
+            def load_token(user_id):
+                return Seller.query.get(user_id).access_token
+
+        Parameters
+        ----------
+        callback : callable
+            Called with the user id, returns the access token (or ``None``
+            if the seller is unknown).
+
+        Return
+        ------
+        callback : callable
+            The given callback.
+        """
+        self._seller_token_loader = callback
+        return callback
+
+    def _load_seller_token(self, user_id):
+        """Get the access token of a seller from the registered loader."""
+        if self._seller_token_loader is None:
+            return None
+        return self._seller_token_loader(user_id)
+
+    def for_seller(self, user_id, access_token: str = None) -> "SellerClient":
+        """Get a client acting on behalf of a seller of the marketplace.
+
+        The clients of the most recently used sellers (the config key
+        ``MERCADOPAGO_SELLER_CACHE_SIZE`` is ``1024``) are kept with their
+        request options and resource objects, and all of them share the
+        transport of the application, so the calls neither touch the app
+        config nor allocate new options::
+
+            seller = mercadopago.for_seller(user_id)
+            seller.payment().get(payment_id)
+
+        Parameters
+        ----------
+        user_id : hashable
+            The Mercadopago user id of the seller.
+        access_token : ``str`` or ``None`` (optional)
+            The access token of the seller. Defaults to the token of the
+            registered client or the one given by the callback registered
+            with :meth:`seller_token_loader`.
+
+        Return
+        ------
+        client : ``flask_mercadopago.sellers.SellerClient``
+            The client of the seller.
+        """
+        return self._get_state().sellers.get(user_id, access_token)
+
+    def forget_seller(self, user_id):
+        """Drop the client of a seller, for example after a token refresh.
+
+        Parameters
+        ----------
+        user_id : hashable
+            The Mercadopago user id of the seller.
+        """
+        self._get_state().sellers.forget(user_id)
+
+    def resource_hook(self, callback):
+        """Register a callback run on each new resource object.
+
+        It is called with the name of the accessor and the resource object,
+        and can return another object to use instead of it (like a wrapper
+        adding metrics or logs)::
+
+            @mercadopago.resource_hook
+            def count_resources(name, res):
+                statsd.incr(f"mercadopago.{name}")
+
+        The hooks also run for the resources of the seller clients. The
+        objects created before the registration are not changed, so
+        register them before the first call.
+
+        Parameters
+        ----------
+        callback : callable
+            Called with the name and the resource object, returns the
+            object to use or ``None`` to keep it.
+
+        Return
+        ------
+        callback : callable
+            The given callback.
+        """
+        self._resource_hooks = self._resource_hooks + (callback,)
+        return callback
+
+    def _run_resource_hooks(self, name: str, res):
+        """Pass a new resource object through the registered hooks."""
+        for hook in self._resource_hooks:
+            replacement = hook(name, res)
+            if replacement is not None:
+                res = replacement
+        return res
+
+    def resource(self, name: str, http_client=None, request_options=None):
+        """Get the resource object of an accessor, like ``"payment"``.
+
+        Every accessor calls it. Without arguments, the object is built
+        once per app and access token, with the shared transport and
+        options, and then reused by every call and thread.
+
+        Parameters
+        ----------
+        name : ``str``
+            The name of the accessor, see
+            :data:`flask_mercadopago.resources.RESOURCES`.
+        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
+            An implementation of ``HttpClient`` to make the REST calls.
+            Defaults to None, the shared ``transport`` of the app.
+        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
+            The options of the calls, which are not modified. Defaults to
+            None, the options with ``APP_ACCESS_TOKEN``.
+
+        Return
+        ------
+        res : ``mercadopago.core.MPBase``
+            The resource object.
+        """
+        if http_client is None and request_options is None:
+            state = self._get_state()
+            access_token = current_app.config["APP_ACCESS_TOKEN"]
+            cached = state.resources.get(name)
+            if (
+                cached is not None
+                and cached[0] == access_token
+                and cached[1] is self._resource_hooks
+            ):
+                return cached[2]
+            res = self._run_resource_hooks(
+                name,
+                resource_class(name)(
+                    state.request_options.with_access_token(access_token),
+                    state.transport,
+                ),
+            )
+            state.resources[name] = (access_token, self._resource_hooks, res)
+            return res
+        _http_client = self.transport if http_client is None else http_client
+        _request_options = self._get_request_options(request_options)
+        res = resource_class(name)(_request_options, _http_client)
+        return self._run_resource_hooks(name, res)
+
     def get_oidc_query_string(
         self,
         response_type: str = None,
@@ -278,7 +1424,7 @@ class Mercadopago(object):
         access_token: str,
         authorization_code: str = None,
         refresh_token: str = None,
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Sends a POST request.
 
         Parameters
@@ -305,7 +1451,7 @@ class Mercadopago(object):
         if refresh_token:
             payload["grant_type"] = "refresh_token"
             payload["refresh_token"] = refresh_token
-        res = requests.post(endpoint, headers=headers, params=payload)
+        res = _lazy("requests").post(endpoint, headers=headers, params=payload)
         return res
 
     def get_location(self, endpoint: str) -> str:
@@ -443,12 +1589,17 @@ class Mercadopago(object):
         versions = {
             "mercadopago_js": self.mercadopago_js_version,
         }
+        files = {
+            "mercadopago_js": f"js/mercadopago/{self.mercadopago_js_filename}.js",
+        }
         _name = "mercadopago_js" if name is None else name
         if sri is not None:
             return sri
-        if version == versions[_name] and serve_local is False:
-            return sris[_name]
-        return None
+        if version != versions[_name]:
+            return None
+        if serve_local:
+            return self._get_state().sri_manifest.get(files[_name])
+        return sris[_name]
 
     def _get_js_script(self, name: str = None, sri: str = None) -> str:
         """Get <script> tag for JavaScipt resources."""
@@ -471,43 +1622,15 @@ class Mercadopago(object):
             script_html = simple_scripts_js(url)
         return script_html
 
-    def advanced_payment(
-        self, http_client=None, request_options=None
-    ) -> AdvancedPayment:
-        """
-        Returns the attribute value of the function.
 
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
+def _make_accessor(name: str):
+    """Create the accessor method of a resource for ``Mercadopago``."""
 
-        Return
-        ------
-        res : ``mercadopago.resources.advanced_payment.AdvancedPayment``
-            ``mercadopago.resources.advanced_payment.AdvancedPayment`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = AdvancedPayment(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
+    def accessor(self, http_client=None, request_options=None):
+        """Get the resource (replaced below)."""
+        return self.resource(name, http_client, request_options)
 
-    def card_token(self, http_client=None, request_options=None) -> CardToken:
-        """
+    accessor.__doc__ = f"""
         Returns the attribute value of the function.
 
         Parameters
@@ -515,500 +1638,19 @@ class Mercadopago(object):
         http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
             An implementation of ``HttpClient`` can be pass to be used
             to make the REST calls.
-            Defaults to None
+            Defaults to None, the shared ``transport`` of the app.
         request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
             An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
+            custom options to ur REST call. It is not modified, so a single
+            ``FrozenRequestOptions`` can be shared by every thread.
             Defaults to None.
 
         Return
         ------
-        res : ``mercadopago.resources.card_token.CardToken``
-            ``mercadopago.resources.card_token.CardToken`` object.
+        res : ``{resource_path(name)}``
+            ``{resource_path(name)}`` object.
         """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = CardToken(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
+    return accessor
 
-    def card(self, http_client=None, request_options=None) -> Card:
-        """
-        Returns the attribute value of the function.
 
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.card.Card``
-            ``mercadopago.resources.card.Card`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = Card(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
-
-    def customer(self, http_client=None, request_options=None) -> Customer:
-        """
-        Returns the attribute value of the function.
-
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.customer.Customer``
-            ``mercadopago.resources.customer.Customer`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = Customer(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
-
-    def disbursement_refund(
-        self, http_client=None, request_options=None
-    ) -> DisbursementRefund:
-        """
-        Returns the attribute value of the function.
-
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.disbursement_refund.DisbursementRefund``
-            ``mercadopago.resources.disbursement_refund.DisbursementRefund`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = DisbursementRefund(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
-
-    def identification_type(
-        self, http_client=None, request_options=None
-    ) -> IdentificationType:
-        """
-        Returns the attribute value of the function.
-
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.identification_type.IdentificationType``
-            ``mercadopago.resources.identification_type.IdentificationType`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = IdentificationType(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
-
-    def merchant_order(
-        self, http_client=None, request_options=None
-    ) -> MerchantOrder:
-        """
-        Returns the attribute value of the function.
-
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.merchant_order.MerchantOrder``
-            ``mercadopago.resources.merchant_order.MerchantOrder`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = MerchantOrder(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
-
-    def payment(self, http_client=None, request_options=None) -> Payment:
-        """
-        Returns the attribute value of the function.
-
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.payment.Payment``
-            ``mercadopago.resources.payment.Payment`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = Payment(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
-
-    def payment_methods(
-        self, http_client=None, request_options=None
-    ) -> PaymentMethods:
-        """
-        Returns the attribute value of the function.
-
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.payment_methods.PaymentMethods``
-            ``mercadopago.resources.payment_methods.PaymentMethods`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = PaymentMethods(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
-
-    def preapproval(
-        self, http_client=None, request_options=None
-    ) -> PreApproval:
-        """
-        Returns the attribute value of the function.
-
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.preapproval.Preapproval``
-            ``mercadopago.resources.preapproval.Preapproval`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = PreApproval(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
-
-    def preference(self, http_client=None, request_options=None) -> Preference:
-        """
-        Returns the attribute value of the function.
-
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.preference.Preference``
-            ``mercadopago.resources.preference.Preference`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = Preference(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
-
-    def refund(self, http_client=None, request_options=None) -> Refund:
-        """
-        Returns the attribute value of the function.
-
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.refund.Refund``
-            ``mercadopago.resources.refund.Refund`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = Refund(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
-
-    def user(self, http_client=None, request_options=None) -> User:
-        """
-        Returns the attribute value of the function.
-
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.user.User``
-            ``mercadopago.resources.user.User`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = User(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
-
-    def chargeback(self, http_client=None, request_options=None) -> Chargeback:
-        """
-        Returns the attribute value of the function.
-
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.chargeback.Chargeback``
-            ``mercadopago.resources.chargeback.Chargeback`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = Chargeback(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
-
-    def subscription(
-        self, http_client=None, request_options=None
-    ) -> Subscription:
-        """
-        Returns the attribute value of the function.
-
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.subscription.Subscription``
-            ``mercadopago.resources.subscription.Subscription`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = Subscription(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
-
-    def plan(self, http_client=None, request_options=None) -> Plan:
-        """
-        Returns the attribute value of the function.
-
-        Parameters
-        ----------
-        http_client: ``mercadopago.http.http_client`` or ``None`` (optional)
-            An implementation of ``HttpClient`` can be pass to be used
-            to make the REST calls.
-            Defaults to None
-        request_options : ``mercadopago.config.request_options`` or ``None`` (optional)
-            An instance of ``RequestOptions`` can be pass changing or adding
-            custom options to ur REST call.
-            Defaults to None.
-
-        Return
-        ------
-        res : ``mercadopago.resources.plan.Plan``
-            ``mercadopago.resources.plan.Plan`` object.
-        """
-        _http_client = HttpClient() if http_client is None else http_client
-        _request_options = (
-            RequestOptions() if request_options is None else request_options
-        )
-        _request_options.access_token = current_app.config["APP_ACCESS_TOKEN"]
-        res = Plan(
-            request_options is not None
-            and request_options
-            or _request_options,
-            _http_client,
-        )
-        return res
+bind_accessors(Mercadopago, _make_accessor)
@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Columnar export of the payments, to Parquet, Arrow or CSV files.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import csv
+import datetime as dt
+import os
+
+from .sync import iter_range
+
+#: The ``pyarrow`` module, imported by the first Parquet or Arrow export
+#: since it is slow to import and optional.
+pyarrow = None
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Columns of the exports: the name, the dotted path of the value in the
+#: payment and the type (``int64``, ``float64``, ``bool``, ``string`` or
+#: ``timestamp``, in UTC).
+PAYMENT_COLUMNS = (
+    ("id", "id", "int64"),
+    ("date_created", "date_created", "timestamp"),
+    ("date_approved", "date_approved", "timestamp"),
+    ("date_last_updated", "date_last_updated", "timestamp"),
+    ("status", "status", "string"),
+    ("status_detail", "status_detail", "string"),
+    ("operation_type", "operation_type", "string"),
+    ("payment_method_id", "payment_method_id", "string"),
+    ("payment_type_id", "payment_type_id", "string"),
+    ("currency_id", "currency_id", "string"),
+    ("transaction_amount", "transaction_amount", "float64"),
+    ("transaction_amount_refunded", "transaction_amount_refunded", "float64"),
+    (
+        "net_received_amount",
+        "transaction_details.net_received_amount",
+        "float64",
+    ),
+    ("installments", "installments", "int64"),
+    ("payer_id", "payer.id", "string"),
+    ("payer_email", "payer.email", "string"),
+    ("collector_id", "collector_id", "int64"),
+    ("external_reference", "external_reference", "string"),
+    ("description", "description", "string"),
+    ("live_mode", "live_mode", "bool"),
+)
+
+#: Format of the files of each extension.
+EXPORT_FORMATS = {
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".csv": "csv",
+}
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _import_pyarrow():
+    """Import ``pyarrow`` on first use, or get ``None`` if not installed."""
+    global pyarrow
+    if pyarrow is None:
+        try:
+            import pyarrow as module
+            import pyarrow.parquet  # noqa
+        except ImportError:
+            return None
+        pyarrow = module
+    return pyarrow
+
+
+def _parse_date(value):
+    """Convert a date of the API to an aware ``datetime``, or ``None``."""
+    try:
+        return dt.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_CONVERTERS = {
+    "int64": int,
+    "float64": float,
+    "bool": bool,
+    "string": str,
+    "timestamp": _parse_date,
+}
+
+
+def _lookup(record: dict, path: tuple):
+    """Get a nested value of a record, or ``None`` if it is missing."""
+    for key in path:
+        if not isinstance(record, dict):
+            return None
+        record = record.get(key)
+    return record
+
+
+def to_columns(records, columns=PAYMENT_COLUMNS) -> dict:
+    """Convert records to one list of values per column.
+
+    Parameters
+    ----------
+    records : iterable of ``dict``
+        The payments.
+    columns : ``tuple`` (optional)
+        The name, path and type of each column. Defaults to
+        ``PAYMENT_COLUMNS``.
+
+    Return
+    ------
+    columns : ``dict``
+        The values of each column by name, converted to its type, with
+        ``None`` for the missing ones.
+    """
+    paths = [
+        (name, tuple(path.split(".")), kind) for name, path, kind in columns
+    ]
+    values = {name: [] for name, _, _ in paths}
+    for record in records:
+        for name, path, kind in paths:
+            value = _lookup(record, path)
+            if value is not None:
+                value = _CONVERTERS[kind](value)
+            values[name].append(value)
+    return values
+
+
+def arrow_schema(columns=PAYMENT_COLUMNS):
+    """Get the ``pyarrow.Schema`` of some columns.
+
+    Parameters
+    ----------
+    columns : ``tuple`` (optional)
+        The name, path and type of each column. Defaults to
+        ``PAYMENT_COLUMNS``.
+
+    Return
+    ------
+    schema : ``pyarrow.Schema``
+        The schema, with the timestamps in milliseconds in UTC.
+    """
+    pa = _import_pyarrow()
+    if pa is None:
+        raise RuntimeError(
+            "The Arrow exports require pyarrow, install it with "
+            "'pip install Flask-Mercadopago[arrow]'"
+        )
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+        "string": pa.string(),
+        "timestamp": pa.timestamp("ms", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, _, kind in columns])
+
+
+def iter_batches(pages, batch_size: int = 10000):
+    """Group the results of the pages of a search in batches.
+
+    Parameters
+    ----------
+    pages : iterable of ``dict``
+        The responses of the search, with the ``results``.
+    batch_size : ``int`` (optional)
+        Most results of each batch. Defaults to 10000.
+
+    Return
+    ------
+    batches : iterator of ``list``
+        The results, keeping at most one batch in memory.
+    """
+    batch = []
+    for page in pages:
+        batch.extend(page["results"])
+        while len(batch) >= batch_size:
+            yield batch[:batch_size]
+            batch = batch[batch_size:]
+    if batch:
+        yield batch
+
+
+def _file_format(path: str, file_format: str = None) -> str:
+    """Get the format of an export, from the extension if not given."""
+    if file_format is None:
+        ext = os.path.splitext(path)[1].lower()
+        file_format = EXPORT_FORMATS.get(ext)
+        if file_format is None:
+            file_format = "csv" if _import_pyarrow() is None else "parquet"
+    if file_format not in EXPORT_FORMATS.values():
+        raise ValueError(f"Unknown export format {file_format!r}")
+    return file_format
+
+
+def export_payments(
+    client,
+    path: str,
+    filters=None,
+    file_format: str = None,
+    range_field: str = "date_created",
+    begin: str = "NOW-30DAYS",
+    end: str = "NOW",
+    page_size: int = 100,
+    batch_size: int = 10000,
+    columns=PAYMENT_COLUMNS,
+) -> dict:
+    """Export the payments of a search to a file, streaming the pages.
+
+    The pages are searched in ascending order of ``range_field`` (past the
+    largest offset of the API, see :func:`iter_range`) and converted to
+    ``columns`` in batches of ``batch_size`` payments, each one written
+    before the next is fetched, so the memory used doesn't grow with the
+    number of payments::
+
+        export_payments(mercadopago, "payments.parquet", begin="NOW-1DAYS")
+
+    Parameters
+    ----------
+    client : ``Mercadopago`` or ``SellerClient``
+        The object giving the ``payment`` resource.
+    path : ``str``
+        The file written.
+    filters : ``dict`` or ``None`` (optional)
+        Extra filters of the search, like ``{"status": "approved"}``.
+    file_format : ``str`` or ``None`` (optional)
+        ``"parquet"``, ``"arrow"`` (the IPC file format) or ``"csv"``.
+        Defaults to ``None``, from the extension of ``path`` or, without
+        one, Parquet if ``pyarrow`` is installed and CSV otherwise.
+    range_field : ``str`` (optional)
+        The date searched. Defaults to ``"date_created"``.
+    begin : ``str`` (optional)
+        The first date. Defaults to ``"NOW-30DAYS"``.
+    end : ``str`` (optional)
+        The last date. Defaults to ``"NOW"``.
+    page_size : ``int`` (optional)
+        Payments of each search page. Defaults to 100.
+    batch_size : ``int`` (optional)
+        Payments of each batch written (a row group in Parquet). Defaults
+        to 10000.
+    columns : ``tuple`` (optional)
+        The name, path and type of each column. Defaults to
+        ``PAYMENT_COLUMNS``.
+
+    Return
+    ------
+    report : ``dict``
+        The ``path``, the ``format`` and the ``rows`` and ``batches``
+        written.
+    """
+    file_format = _file_format(path, file_format)
+    pages = iter_range(
+        client.payment(), range_field, begin, end, filters, page_size
+    )
+    batches = iter_batches(pages, batch_size)
+    report = {"path": path, "format": file_format, "rows": 0, "batches": 0}
+    if file_format == "csv":
+        writer = _CSVWriter(path, columns)
+    else:
+        writer = _ArrowWriter(path, columns, file_format)
+    with writer:
+        for batch in batches:
+            writer.write(to_columns(batch, columns))
+            report["rows"] += len(batch)
+            report["batches"] += 1
+    return report
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class _CSVWriter(object):
+    """Write batches of columns as the rows of a CSV file."""
+
+    def __init__(self, path: str, columns):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for name, _, _ in columns])
+
+    def write(self, values: dict):
+        """Write a batch of columns as rows."""
+        for row in zip(*values.values()):
+            self._writer.writerow(
+                [
+                    (
+                        value.isoformat(timespec="milliseconds")
+                        if isinstance(value, dt.datetime)
+                        else value
+                    )
+                    for value in row
+                ]
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._file.close()
+
+
+class _ArrowWriter(object):
+    """Write batches of columns to a Parquet or Arrow IPC file."""
+
+    def __init__(self, path: str, columns, file_format: str):
+        pa = _import_pyarrow()
+        self._schema = arrow_schema(columns)
+        if file_format == "parquet":
+            self._writer = pa.parquet.ParquetWriter(path, self._schema)
+        else:
+            self._writer = pa.ipc.new_file(path, self._schema)
+
+    def write(self, values: dict):
+        """Write a batch of columns as a record batch."""
+        batch = pyarrow.RecordBatch.from_pydict(values, schema=self._schema)
+        self._writer.write_table(pyarrow.Table.from_batches([batch]))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._writer.close()
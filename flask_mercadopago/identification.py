@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Local validation of the identification documents of the buyers.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import re
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _same_digits(number: str) -> bool:
+    return len(set(number)) == 1
+
+
+def _cpf(number: str) -> bool:
+    """Check the two digits of a CPF (Brazil)."""
+    if len(number) != 11 or not number.isdigit() or _same_digits(number):
+        return False
+    digits = [int(d) for d in number]
+    for size in (9, 10):
+        total = sum(d * (size + 1 - i) for i, d in enumerate(digits[:size]))
+        if total * 10 % 11 % 10 != digits[size]:
+            return False
+    return True
+
+
+def _cnpj(number: str) -> bool:
+    """Check the two digits of a CNPJ (Brazil)."""
+    if len(number) != 14 or not number.isdigit() or _same_digits(number):
+        return False
+    digits = [int(d) for d in number]
+    weights = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    for size in (12, 13):
+        total = sum(d * w for d, w in zip(digits, weights))
+        rest = total % 11
+        if (0 if rest < 2 else 11 - rest) != digits[size]:
+            return False
+        weights = [6] + weights
+    return True
+
+
+def _mod11(number: str) -> int:
+    """Get the remainder of the sum with the CUIT and RUC weights."""
+    weights = [5, 4, 3, 2, 7, 6, 5, 4, 3, 2]
+    total = sum(int(d) * w for d, w in zip(number, weights))
+    return total % 11
+
+
+def _cuit(number: str) -> bool:
+    """Check the digit of a CUIT or CUIL (Argentina)."""
+    if len(number) != 11 or not number.isdigit():
+        return False
+    digit = (11 - _mod11(number)) % 11
+    return digit != 10 and digit == int(number[10])
+
+
+def _ruc(number: str) -> bool:
+    """Check the digit of a RUC (Peru)."""
+    if len(number) != 11 or not number.isdigit():
+        return False
+    return (11 - _mod11(number)) % 10 == int(number[10])
+
+
+def _ci(number: str) -> bool:
+    """Check the digit of a CI (Uruguay)."""
+    if len(number) not in (7, 8) or not number.isdigit():
+        return False
+    number = number.zfill(8)
+    total = sum(int(d) * w for d, w in zip(number, (2, 9, 8, 7, 6, 3, 4)))
+    return (10 - total % 10) % 10 == int(number[7])
+
+
+def _rut(number: str) -> bool:
+    """Check the digit (or K) of a RUT (Chile)."""
+    body, digit = number[:-1], number[-1:]
+    if not 7 <= len(body) <= 8 or not body.isdigit():
+        return False
+    weights = (2, 3, 4, 5, 6, 7)
+    total = sum(int(d) * weights[i % 6] for i, d in enumerate(reversed(body)))
+    expected = 11 - total % 11
+    return digit == {10: "K", 11: "0"}.get(expected, str(expected))
+
+
+#: Check of the verification digits of each identification type.
+CHECKSUMS = {
+    "CPF": _cpf,
+    "CNPJ": _cnpj,
+    "CUIT": _cuit,
+    "CUIL": _cuit,
+    "RUC": _ruc,
+    "CI": _ci,
+    "RUT": _rut,
+}
+
+
+def normalize_identification(number) -> str:
+    """Remove the separators of a document number, like ``123.456-78``.
+
+    Parameters
+    ----------
+    number : ``str`` or ``int``
+        The number typed.
+
+    Return
+    ------
+    number : ``str``
+        The number without spaces, dots, dashes and slashes, in uppercase.
+    """
+    return re.sub(r"[\s./-]", "", str(number)).upper()
+
+
+def validate_identification(
+    type_id: str, number, identification_types=None
+) -> str:
+    """Check a document number before sending it to the API.
+
+    The length and kind of characters are checked with the
+    ``identification_types`` catalog and the verification digits of the
+    documents in ``CHECKSUMS`` (like CPF, CNPJ or CUIT) are computed, so a
+    mistyped document is rejected without a failed ``card_token().create``
+    or ``payment().create`` call.
+
+    Parameters
+    ----------
+    type_id : ``str``
+        The ``id`` of the identification type, like ``"CPF"``.
+    number : ``str`` or ``int``
+        The number typed, with or without separators.
+    identification_types : ``list`` of ``dict`` or ``None`` (optional)
+        The catalog of the identification types. Defaults to ``None``, only
+        the types in ``CHECKSUMS`` are checked.
+
+    Return
+    ------
+    number : ``str``
+        The number, normalized.
+
+    Raises
+    ------
+    ValueError
+        If the type is unknown or the number is invalid.
+    """
+    value = normalize_identification(number)
+    rules = None
+    if identification_types is not None:
+        rules = next(
+            (t for t in identification_types if t.get("id") == type_id), None
+        )
+        if rules is None:
+            raise ValueError(f"Unknown identification type {type_id!r}")
+    elif type_id not in CHECKSUMS:
+        raise ValueError(f"Unknown identification type {type_id!r}")
+    if not value:
+        raise ValueError(f"Empty {type_id} number")
+    if rules is not None:
+        if rules.get("type") == "number" and not value.isdigit():
+            raise ValueError(f"Invalid {type_id} number, only digits")
+        if not value.isalnum():
+            raise ValueError(f"Invalid {type_id} number {number!r}")
+        min_length = rules.get("min_length") or 0
+        max_length = rules.get("max_length") or len(value)
+        if not min_length <= len(value) <= max_length:
+            raise ValueError(
+                f"Invalid {type_id} number, it must have between "
+                f"{min_length} and {max_length} characters"
+            )
+    check = CHECKSUMS.get(type_id)
+    if check is not None and not check(value):
+        raise ValueError(f"Invalid {type_id} number {number!r}")
+    return value
@@ -0,0 +1,329 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Durable inbox of the notifications, processed in batches.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class Inbox(object):
+    """Notifications stored in SQLite and processed in batches.
+
+    :meth:`append` stores a notified resource with a single write, so the
+    view answering Mercadopago returns at once. A background thread (or
+    any process sharing the file) claims the oldest ``batch_size``
+    notifications, groups their ids by accessor without duplicates, calls
+    ``handler`` once per accessor and only then deletes them. A batch whose
+    handler fails, or whose process crashes, is claimed again after
+    ``lease`` seconds, so each notification is processed at least once.
+    The notifications claimed ``max_attempts`` times without being
+    processed are moved to the dead letters, kept until :meth:`requeue`::
+
+        inbox = Inbox("inbox.db", handler)
+        inbox.append("payment", "123")
+
+    Parameters
+    ----------
+    path : ``str``
+        The database file (in WAL mode), or ``":memory:"``.
+    handler : callable
+        Called with the accessor and the ``list`` of ids of a batch.
+    batch_size : ``int`` (optional)
+        Most notifications of a batch. Defaults to 500.
+    lease : ``float`` (optional)
+        Seconds a batch is kept by its consumer. Defaults to 60.
+    poll_interval : ``float`` (optional)
+        Seconds between the checks for notifications appended by other
+        processes. Defaults to 1.
+    max_attempts : ``int`` or ``None`` (optional)
+        Claims after which a notification is a dead letter. Defaults to 5.
+        ``None`` retries forever.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        handler,
+        batch_size: int = 500,
+        lease: float = 60.0,
+        poll_interval: float = 1.0,
+        max_attempts: int = 5,
+    ):
+        self.path = path
+        self.handler = handler
+        self.batch_size = batch_size
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.batches = 0
+        self.processed = 0
+        self.duplicates = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopped = False
+        self._pid = os.getpid()
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS inbox ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, "
+                "resource_id TEXT NOT NULL, received REAL NOT NULL, "
+                "claimed REAL, owner TEXT, "
+                "attempts INTEGER NOT NULL DEFAULT 0, "
+                "dead INTEGER NOT NULL DEFAULT 0)"
+            )
+        return conn
+
+    def _check_fork(self):
+        """Reopen the database and forget the thread of the parent."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._conn = self._connect()
+            self._thread = None
+
+    def append(self, name: str, resource_id):
+        """Store a notified resource, to be processed later.
+
+        Parameters
+        ----------
+        name : ``str``
+            The accessor, like ``"payment"``.
+        resource_id : ``int`` or ``str``
+            The id of the resource.
+        """
+        with self._lock:
+            self._check_fork()
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO inbox (name, resource_id, received) "
+                    "VALUES (?, ?, ?)",
+                    (name, str(resource_id), time.time()),
+                )
+        self._wakeup.set()
+
+    def claim(self):
+        """Take the oldest notifications not claimed by a live consumer.
+
+        The expired ones already claimed ``max_attempts`` times are moved
+        to the dead letters instead.
+
+        Return
+        ------
+        owner : ``str``
+            The token of the batch, given to :meth:`ack`.
+        notifications : ``list`` of ``tuple``
+            The accessor and the id of each notification, in order.
+        """
+        owner = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._check_fork()
+            with self._conn:
+                if self.max_attempts is not None:
+                    dead = self._conn.execute(
+                        "UPDATE inbox SET dead = 1 "
+                        "WHERE dead = 0 AND claimed < ? AND attempts >= ?",
+                        (now - self.lease, self.max_attempts),
+                    ).rowcount
+                    if dead:
+                        logger.error(
+                            "%s notifications moved to the dead letters", dead
+                        )
+                self._conn.execute(
+                    "UPDATE inbox SET claimed = ?, owner = ?, "
+                    "attempts = attempts + 1 WHERE seq IN ("
+                    "SELECT seq FROM inbox "
+                    "WHERE dead = 0 AND (claimed IS NULL OR claimed < ?) "
+                    "ORDER BY seq LIMIT ?)",
+                    (now, owner, now - self.lease, self.batch_size),
+                )
+            rows = self._conn.execute(
+                "SELECT name, resource_id FROM inbox "
+                "WHERE owner = ? ORDER BY seq",
+                (owner,),
+            ).fetchall()
+        return owner, rows
+
+    def ack(self, owner: str):
+        """Delete the notifications of a processed batch.
+
+        Parameters
+        ----------
+        owner : ``str``
+            The token given by :meth:`claim`. The notifications claimed
+            again by another consumer since then are kept.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM inbox WHERE owner = ?", (owner,)
+                )
+
+    def process(self) -> int:
+        """Process a batch of notifications.
+
+        Return
+        ------
+        count : ``int``
+            The notifications of the batch, 0 if there were none.
+        """
+        owner, rows = self.claim()
+        if not rows:
+            return 0
+        groups = {}
+        for name, resource_id in rows:
+            groups.setdefault(name, {})[resource_id] = None
+        try:
+            for name, ids in groups.items():
+                self.handler(name, list(ids))
+        except Exception:  # noqa
+            logger.exception("Processing %s notifications", len(rows))
+            with self._lock:
+                self.errors += 1
+            return len(rows)
+        self.ack(owner)
+        with self._lock:
+            self.batches += 1
+            self.processed += len(rows)
+            self.duplicates += len(rows) - sum(map(len, groups.values()))
+        return len(rows)
+
+    def dead_letters(self) -> list:
+        """Get the notifications that were never processed.
+
+        Return
+        ------
+        notifications : ``list`` of ``tuple``
+            The accessor, the id and the attempts of each dead letter, in
+            order.
+        """
+        with self._lock:
+            self._check_fork()
+            return self._conn.execute(
+                "SELECT name, resource_id, attempts FROM inbox "
+                "WHERE dead = 1 ORDER BY seq"
+            ).fetchall()
+
+    def requeue(self) -> int:
+        """Process the dead letters again, with their attempts reset.
+
+        Return
+        ------
+        count : ``int``
+            The notifications requeued.
+        """
+        with self._lock:
+            self._check_fork()
+            with self._conn:
+                count = self._conn.execute(
+                    "UPDATE inbox SET dead = 0, attempts = 0, claimed = NULL, "
+                    "owner = NULL WHERE dead = 1"
+                ).rowcount
+        self._wakeup.set()
+        return count
+
+    def start(self):
+        """Start processing the notifications from a background thread."""
+        with self._lock:
+            self._check_fork()
+            self._stopped = False
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="mercadopago-inbox", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        """Process the batches until stopped."""
+        while not self._stopped and self._pid == os.getpid():
+            if self.process():
+                continue
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def stop(self):
+        """Stop processing after the current batch, keeping the others."""
+        self._stopped = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
+
+    def close(self):
+        """Stop processing and close the database."""
+        self.stop()
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> dict:
+        """Get the counters of the inbox.
+
+        Return
+        ------
+        stats : ``dict``
+            The notifications ``pending`` and ``dead`` (letters), and the
+            ``batches``, the notifications ``processed`` (with the
+            ``duplicates`` ids) and the failed batches (``errors``) so far.
+        """
+        with self._lock:
+            return {
+                "pending": self._pending(),
+                "dead": self._conn.execute(
+                    "SELECT COUNT(*) FROM inbox WHERE dead = 1"
+                ).fetchone()[0],
+                "batches": self.batches,
+                "processed": self.processed,
+                "duplicates": self.duplicates,
+                "errors": self.errors,
+            }
+
+    def _pending(self) -> int:
+        self._check_fork()
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM inbox WHERE dead = 0"
+        ).fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._pending()
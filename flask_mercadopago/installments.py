@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Quotes of the installments of the card payments, cached by rate table.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import decimal
+import json
+import math
+import threading
+import time
+
+from mercadopago.core import MPBase
+
+from .utils import LRUCache
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+_CENTS = decimal.Decimal("0.01")
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _money(value: decimal.Decimal) -> float:
+    return float(value.quantize(_CENTS, rounding=decimal.ROUND_HALF_UP))
+
+
+def _payer_costs(options: list) -> frozenset:
+    return frozenset(
+        (
+            option.get("payment_method_id"),
+            (option.get("issuer") or {}).get("id"),
+            cost.get("installments"),
+        )
+        for option in options
+        for cost in option.get("payer_costs") or ()
+    )
+
+
+def derive_options(options: list, amount: float):
+    """Compute the installments of an amount from the quote of another.
+
+    The totals are computed from the ``installment_rate`` of each payer
+    cost, rounded to cents, and the payer costs whose allowed amounts
+    exclude ``amount`` are dropped. The ``recommended_message`` is set to
+    ``None``, since it is written by the API in the language of the site.
+
+    Parameters
+    ----------
+    options : ``list`` of ``dict``
+        The response of ``installments().get``.
+    amount : ``float``
+        The amount quoted.
+
+    Return
+    ------
+    options : ``list`` of ``dict`` or ``None``
+        The options of ``amount``, or ``None`` if a payer cost has no rate
+        or has a discount, and the API must be called.
+    """
+    value = decimal.Decimal(str(amount))
+    derived = []
+    for option in options:
+        payer_costs = []
+        for cost in option.get("payer_costs") or ():
+            rate = cost.get("installment_rate")
+            if (
+                rate is None
+                or cost.get("discount_rate")
+                or not cost.get("installments")
+            ):
+                return None
+            low = cost.get("min_allowed_amount")
+            high = cost.get("max_allowed_amount")
+            if (low is not None and amount < low) or (
+                high is not None and amount > high
+            ):
+                continue
+            total = value * (1 + decimal.Decimal(str(rate)) / 100)
+            payer_costs.append(
+                dict(
+                    cost,
+                    installment_amount=_money(total / cost["installments"]),
+                    total_amount=_money(total),
+                    recommended_message=None,
+                )
+            )
+        derived.append(dict(option, payer_costs=payer_costs))
+    return derived
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class Installments(MPBase):
+    """Access to the installments of the payment methods."""
+
+    def get(self, filters: dict, request_options=None):
+        """Get the installments of an amount.
+
+        Parameters
+        ----------
+        filters : ``dict``
+            The ``amount`` and the ``bin``, ``payment_method_id`` or
+            ``issuer.id``.
+        request_options : ``mercadopago.config.RequestOptions`` (optional)
+            Options of the call.
+
+        Return
+        ------
+        result : ``dict``
+            The ``status`` and the ``response``, a ``list`` with the
+            ``payer_costs`` of each payment method and issuer.
+        """
+        return self._get(
+            uri="/v1/payment_methods/installments",
+            filters=filters,
+            request_options=request_options,
+        )
+
+
+class InstallmentQuotes(object):
+    """Cache of the quotes of installments, deriving the other amounts.
+
+    The quotes are cached by payment method, issuer, BIN and amount bucket
+    (the amounts within a factor of ``growth`` share one), for ``ttl``
+    seconds and up to ``maxsize`` of them. The API leaves out the payer
+    costs whose allowed amounts exclude the amount quoted, so a quote is
+    only computed from the rates of a cached one (with
+    :func:`derive_options`) between two amounts of the bucket the API
+    answered with the same payer costs. A payment form quoting each amount
+    typed calls the API about twice per card and bucket.
+
+    Parameters
+    ----------
+    maxsize : ``int``
+        Maximum number of quotes kept.
+    ttl : ``float`` or ``None`` (optional)
+        Seconds a quote is kept. Defaults to ``None``, until evicted.
+    growth : ``float`` (optional)
+        Ratio between the bounds of each amount bucket. Defaults to 2.
+    bin_digits : ``int`` (optional)
+        Digits of the card number kept as the BIN. Defaults to 6.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float = None,
+        growth: float = 2.0,
+        bin_digits: int = 6,
+    ):
+        if growth <= 1:
+            raise ValueError("growth must be greater than 1")
+        self.ttl = ttl
+        self.growth = growth
+        self.bin_digits = bin_digits
+        self.derived = 0
+        self._entries = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def bucket(self, amount: float) -> int:
+        """Get the bucket of an amount.
+
+        Parameters
+        ----------
+        amount : ``float``
+            A positive amount.
+
+        Return
+        ------
+        bucket : ``int``
+            The amounts from ``growth ** bucket`` up to the next bucket
+            share it.
+        """
+        if not amount > 0:
+            raise ValueError(f"Invalid amount {amount!r}")
+        return math.floor(math.log(amount, self.growth))
+
+    def quote(
+        self,
+        amount: float,
+        loader,
+        bin_number=None,
+        payment_method_id: str = None,
+        issuer_id=None,
+    ) -> list:
+        """Get the installments of an amount, from the cache when possible.
+
+        Parameters
+        ----------
+        amount : ``float``
+            The amount of the payment.
+        loader : callable
+            Called with the filters of ``installments().get`` (the
+            ``amount`` and the other arguments given) to get the options.
+        bin_number : ``str`` or ``None`` (optional)
+            The card number, or its first digits.
+        payment_method_id : ``str`` or ``None`` (optional)
+            The id of the payment method.
+        issuer_id : ``int`` or ``None`` (optional)
+            The id of the issuer.
+
+        Return
+        ------
+        options : ``list`` of ``dict``
+            The ``payer_costs`` of each payment method and issuer.
+        """
+        prefix = None
+        if bin_number is not None:
+            prefix = str(bin_number)[: self.bin_digits]
+        key = (payment_method_id, issuer_id, prefix, self.bucket(amount))
+        entry = self._entries.get(key)
+        if entry is not None and (
+            entry[0] is not None and entry[0] <= time.monotonic()
+        ):
+            entry = None
+        if entry is not None:
+            if amount == entry[1]:
+                return json.loads(entry[2])
+            if entry[3] <= amount < entry[1]:
+                options = derive_options(json.loads(entry[2]), amount)
+                if options is not None:
+                    with self._lock:
+                        self.derived += 1
+                    return options
+        filters = {"amount": amount}
+        if prefix is not None:
+            filters["bin"] = prefix
+        if payment_method_id is not None:
+            filters["payment_method_id"] = payment_method_id
+        if issuer_id is not None:
+            filters["issuer.id"] = issuer_id
+        options = loader(filters)
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        update = (expires, amount, json.dumps(options), amount)
+        if entry is not None and _payer_costs(options) == _payer_costs(
+            json.loads(entry[2])
+        ):
+            # the amounts between two answers with the same payer costs
+            # can be derived, keeping the expiry of the older answer
+            if amount < entry[1]:
+                update = entry[:3] + (min(amount, entry[3]),)
+            else:
+                update = (entry[0],) + update[1:3] + (entry[3],)
+        self._entries.put(key, update)
+        return options
+
+    def clear(self):
+        """Drop every quote."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get the counters of the cache.
+
+        Return
+        ------
+        stats : ``dict``
+            The ``size``, ``hits``, ``misses`` and quotes ``derived`` from
+            the rates of another amount.
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self._entries.hits,
+            "misses": self._entries.misses,
+            "derived": self.derived,
+        }
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Batched and memoized reads of the resources during one request.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import contextvars
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class RequestLoader(object):
+    """Read resources once per request, fetching the pending ones together.
+
+    The ids announced with :meth:`prefetch` are queued, and the first read
+    fetches every queued resource at once, concurrently in ``executor``.
+    The results are kept until the loader is dropped (with the request,
+    see ``Mercadopago.loader``), so the views and templates reading the
+    same payment call the API once::
+
+        mercadopago.loader.prefetch("payment", [p.id for p in purchases])
+        ...
+        {{ mercadopago.loader.get("payment", purchase.id).response.status }}
+
+    A loader is used by the thread of its request only. The reads run in
+    a copy of its context, so they keep its priority class (see
+    :func:`flask_mercadopago.scheduler.priority`).
+
+    Parameters
+    ----------
+    fetch : callable
+        Called with the name of the accessor and the id of a resource,
+        returns the result of its ``get``.
+    executor : ``concurrent.futures.Executor`` or ``None`` (optional)
+        Runs the reads of a batch. Defaults to ``None``, one after another.
+    """
+
+    def __init__(self, fetch, executor=None):
+        self.fetch = fetch
+        self.executor = executor
+        self.calls = 0
+        self.batches = 0
+        self._results = {}
+        self._errors = {}
+        self._pending = {}
+
+    def prefetch(self, name: str, resource_ids):
+        """Queue resources to fetch with the next read.
+
+        Parameters
+        ----------
+        name : ``str``
+            The name of the accessor, like ``"payment"``.
+        resource_ids : iterable
+            The ids of the resources.
+        """
+        for resource_id in resource_ids:
+            key = (name, str(resource_id))
+            if key not in self._results:
+                self._pending.setdefault(key, (name, resource_id))
+
+    def get(self, name: str, resource_id) -> dict:
+        """Read a resource, fetching it with the queued ones if needed.
+
+        Parameters
+        ----------
+        name : ``str``
+            The name of the accessor, like ``"payment"``.
+        resource_id : ``int`` or ``str``
+            The id of the resource.
+
+        Return
+        ------
+        result : ``dict``
+            The result of ``get``, with the ``status`` and ``response``. It
+            is shared by every read of the request.
+        """
+        return self.get_many(name, [resource_id])[0]
+
+    def get_many(self, name: str, resource_ids) -> list:
+        """Read many resources, fetching the missing ones in one batch.
+
+        Parameters
+        ----------
+        name : ``str``
+            The name of the accessor, like ``"payment"``.
+        resource_ids : iterable
+            The ids of the resources.
+
+        Return
+        ------
+        results : ``list`` of ``dict``
+            The result of ``get`` of each resource, in the order given.
+        """
+        resource_ids = list(resource_ids)
+        self.prefetch(name, resource_ids)
+        self.dispatch()
+        results = []
+        for resource_id in resource_ids:
+            key = (name, str(resource_id))
+            if key in self._errors:
+                raise self._errors.pop(key)
+            results.append(self._results[key])
+        return results
+
+    def dispatch(self):
+        """Fetch every queued resource, concurrently."""
+        pending = list(self._pending.items())
+        self._pending.clear()
+        if not pending:
+            return
+        self.batches += 1
+        self.calls += len(pending)
+        if self.executor is None or len(pending) == 1:
+            outcomes = [self._call(args) for _, args in pending]
+        else:
+            context = contextvars.copy_context()
+            outcomes = self.executor.map(
+                lambda args: context.copy().run(self._call, args),
+                [args for _, args in pending],
+            )
+        for (key, _), (result, error) in zip(pending, outcomes):
+            if error is None:
+                self._results[key] = result
+            else:
+                self._errors[key] = error
+
+    def _call(self, args):
+        """Fetch a resource, getting its result or the exception raised."""
+        try:
+            return self.fetch(*args), None
+        except Exception as error:  # noqa
+            return None, error
+
+    def __contains__(self, key):
+        name, resource_id = key
+        return (name, str(resource_id)) in self._results
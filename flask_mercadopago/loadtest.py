@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Load generation of the checkout flows, for capacity planning.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import math
+import threading
+import time
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _check(result: dict) -> dict:
+    """Raise ``RuntimeError`` for the calls answered with an error."""
+    if result["status"] >= 400:
+        raise RuntimeError(f"Mercadopago answered {result['status']}")
+    return result
+
+
+def checkout_scenario(client):
+    """Tokenize a card and pay with it, like a checkout form does.
+
+    Parameters
+    ----------
+    client : ``Mercadopago`` or ``SellerClient``
+        The object giving the resources.
+    """
+    token = _check(
+        client.card_token().create(
+            {
+                "card_number": "5031433215406351",
+                "security_code": "123",
+                "expiration_year": "2030",
+                "expiration_month": "11",
+                "cardholder": {"name": "APRO"},
+            }
+        )
+    )
+    _check(
+        client.payment().create(
+            {
+                "token": str(token["response"]["id"]),
+                "installments": 1,
+                "transaction_amount": 100.0,
+                "payment_method_id": "master",
+                "payer": {"email": "test_user@testuser.com"},
+            }
+        )
+    )
+
+
+def preference_scenario(client):
+    """Create a Checkout Pro preference of one item.
+
+    Parameters
+    ----------
+    client : ``Mercadopago`` or ``SellerClient``
+        The object giving the resources.
+    """
+    _check(
+        client.preference().create(
+            {"items": [{"title": "Item", "quantity": 1, "unit_price": 100.0}]}
+        )
+    )
+
+
+def merchant_order_scenario(client, polls: int = 3):
+    """Poll a merchant order, like a page waiting for a payment does.
+
+    Parameters
+    ----------
+    client : ``Mercadopago`` or ``SellerClient``
+        The object giving the resources.
+    polls : ``int`` (optional)
+        Times the order is fetched. Defaults to 3.
+    """
+    merchant_order = client.merchant_order()
+    for _ in range(polls):
+        _check(merchant_order.get(1))
+
+
+#: Scenarios run by ``run_load``, by name.
+SCENARIOS = {
+    "checkout": checkout_scenario,
+    "merchant_order": merchant_order_scenario,
+    "preference": preference_scenario,
+}
+
+
+def percentile(values, q: float) -> float:
+    """Get a percentile of sorted values, by the nearest rank.
+
+    Parameters
+    ----------
+    values : ``list``
+        The values, sorted.
+    q : ``float``
+        The percentile, between 0 and 100.
+
+    Return
+    ------
+    value : ``float``
+        The percentile, or 0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    rank = max(math.ceil(q / 100.0 * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def run_load(
+    scenario, client, concurrency: int, duration: float = None, iterations=None
+) -> dict:
+    """Run a scenario from many threads and measure it.
+
+    Parameters
+    ----------
+    scenario : callable
+        Called with ``client`` for each iteration. An exception counts as
+        an error.
+    client : ``Mercadopago`` or ``SellerClient``
+        The object giving the resources.
+    concurrency : ``int``
+        Number of threads running the scenario.
+    duration : ``float`` or ``None`` (optional)
+        Seconds the load lasts.
+    iterations : ``int`` or ``None`` (optional)
+        Iterations run by each thread, when there is no ``duration``.
+
+    Return
+    ------
+    report : ``dict``
+        The ``iterations``, ``errors``, ``elapsed`` seconds, ``throughput``
+        (iterations per second) and the ``p50``, ``p90``, ``p99`` and
+        ``max`` latencies of an iteration, in milliseconds.
+    """
+    if duration is None and iterations is None:
+        raise ValueError("A duration or a number of iterations is needed")
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = None if duration is None else start + duration
+
+    def worker():
+        """Run the scenario until the deadline or the iterations."""
+        done, failed, times = 0, 0, []
+        while True:
+            if deadline is None:
+                if done >= iterations:
+                    break
+            elif time.perf_counter() >= deadline:
+                break
+            begin = time.perf_counter()
+            try:
+                scenario(client)
+            except Exception:  # noqa
+                failed += 1
+            times.append((time.perf_counter() - begin) * 1000.0)
+            done += 1
+        with lock:
+            latencies.extend(times)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "iterations": len(latencies),
+        "errors": errors[0],
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+        "max": latencies[-1] if latencies else 0.0,
+    }
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Read-through cache of the resources kept up to date by the notifications.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import json
+import threading
+import time
+
+from flask.signals import Namespace
+
+from .utils import LRUCache
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Accessor of the resource of each notification topic.
+NOTIFICATION_TOPICS = {
+    "payment": "payment",
+    "merchant_order": "merchant_order",
+    "topic_merchant_order_wh": "merchant_order",
+}
+
+#: Accessors whose ``get`` results are cached by ``Mercadopago.lookup``.
+LOOKUP_RESOURCES = ("payment", "merchant_order")
+
+_signals = Namespace()
+
+#: Sent by the app with ``name`` (the accessor) and ``resource_id`` when a
+#: notification of Mercadopago is handled.
+notification_received = _signals.signal("mercadopago-notification-received")
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def parse_notification(args, body=None):
+    """Get the resource changed according to a notification.
+
+    Both the webhooks (a JSON body like ``{"type": "payment", "data":
+    {"id": "123"}}``) and the IPN (a query string like
+    ``?topic=merchant_order&id=123``) formats are understood.
+
+    Parameters
+    ----------
+    args : ``dict``
+        The query string parameters.
+    body : ``dict`` or ``None`` (optional)
+        The decoded JSON body.
+
+    Return
+    ------
+    resource : ``tuple`` or ``None``
+        The name of the accessor and the id (as a ``str``), or ``None`` for
+        the topics that aren't cached or an invalid notification.
+    """
+    body = body if isinstance(body, dict) else {}
+    data = body.get("data") if isinstance(body.get("data"), dict) else {}
+    topic = (
+        body.get("type")
+        or body.get("topic")
+        or args.get("type")
+        or args.get("topic")
+    )
+    resource_id = (
+        data.get("id")
+        or args.get("data.id")
+        or args.get("id")
+        or body.get("id")
+    )
+    if not resource_id and isinstance(body.get("resource"), str):
+        resource_id = body["resource"].rstrip("/").rpartition("/")[2]
+    name = NOTIFICATION_TOPICS.get(topic)
+    if name is None or not resource_id:
+        return None
+    return name, str(resource_id)
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class LookupCache(object):
+    """Bounded cache of the results of ``get`` of some resources.
+
+    The first read of a resource loads it and the next ones are served
+    from the cache, until a notification for it invalidates (or updates)
+    it, it is evicted by newer entries or, as a safety net for lost
+    notifications, ``ttl`` seconds pass. Each read gets its own copy of
+    the result. An invalidation during a load keeps the loaded result out
+    of the cache, so it can't bring back a stale state.
+
+    Parameters
+    ----------
+    maxsize : ``int``
+        Maximum number of resources kept.
+    ttl : ``float`` or ``None`` (optional)
+        Seconds a result is kept. Defaults to ``None``, until invalidated.
+    """
+
+    def __init__(self, maxsize: int, ttl: float = None):
+        self.ttl = ttl
+        self.invalidations = 0
+        self._entries = LRUCache(maxsize)
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def get(self, name: str, resource_id, loader, refresh: bool = False):
+        """Get the result of a resource, loading it when needed.
+
+        Parameters
+        ----------
+        name : ``str``
+            The name of the accessor, like ``"payment"``.
+        resource_id : ``int`` or ``str``
+            The id of the resource.
+        loader : callable
+            Called without arguments to get the result, like
+            ``mercadopago.payment().get(payment_id)``. Only the results
+            with status 200 are cached.
+        refresh : ``bool`` (optional)
+            Load it even if it is cached. Defaults to ``False``.
+
+        Return
+        ------
+        result : ``dict``
+            The result, with the ``status`` and the ``response``.
+        """
+        key = (name, str(resource_id))
+        if not refresh:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                entry[0] is None or entry[0] > time.monotonic()
+            ):
+                return json.loads(entry[1])
+        marker = object()
+        with self._lock:
+            self._loading[key] = marker
+        try:
+            result = loader()
+        finally:
+            with self._lock:
+                current = self._loading.get(key)
+                if current is marker:
+                    del self._loading[key]
+        if current is marker and result["status"] == 200:
+            self.put(name, resource_id, result)
+        return result
+
+    def put(self, name: str, resource_id, result: dict):
+        """Store the result of a resource, like the one of a notification.
+
+        Parameters
+        ----------
+        name : ``str``
+            The name of the accessor.
+        resource_id : ``int`` or ``str``
+            The id of the resource.
+        result : ``dict``
+            The result, with the ``status`` and the ``response``.
+        """
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        self._entries.put(
+            (name, str(resource_id)), (expires, json.dumps(result))
+        )
+
+    def invalidate(self, name: str, resource_id):
+        """Drop the result of a resource, and the one being loaded.
+
+        Parameters
+        ----------
+        name : ``str``
+            The name of the accessor.
+        resource_id : ``int`` or ``str``
+            The id of the resource.
+        """
+        key = (name, str(resource_id))
+        with self._lock:
+            self._loading.pop(key, None)
+            self.invalidations += 1
+        self._entries.pop(key)
+
+    def clear(self):
+        """Drop every result."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get the counters of the cache.
+
+        Return
+        ------
+        stats : ``dict``
+            The ``size``, ``hits``, ``misses`` and ``invalidations``.
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self._entries.hits,
+            "misses": self._entries.misses,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Immutable request options that can be shared between threads.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from types import MappingProxyType
+
+from mercadopago.config import RequestOptions
+
+from .utils import LRUCache
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Options of ``RequestOptions`` copied by ``freeze``.
+OPTION_NAMES = (
+    "access_token",
+    "connection_timeout",
+    "custom_headers",
+    "corporation_id",
+    "integrator_id",
+    "platform_id",
+    "max_retries",
+)
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class FrozenRequestOptions(RequestOptions):
+    """``RequestOptions`` that can't be changed once created.
+
+    A single instance can be shared by every thread. The options with
+    another value are derived with :meth:`replace`, and the ones with
+    another access token with :meth:`with_access_token`, which keeps the
+    derived options so the hot paths don't allocate them again::
+
+        options = FrozenRequestOptions(custom_headers={"x-meli-session-id": sid})
+        mercadopago.payment(request_options=options).get(payment_id)
+
+    It takes the same parameters as ``RequestOptions``. The custom headers
+    are copied.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        headers = self.custom_headers
+        if headers is not None:
+            object.__setattr__(
+                self,
+                "_RequestOptions__custom_headers",
+                MappingProxyType(dict(headers)),
+            )
+        object.__setattr__(self, "_derived", LRUCache(16))
+        object.__setattr__(self, "_frozen", True)
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(
+                f"{type(self).__name__} is immutable, use replace()"
+            )
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(
+            f"{type(self).__name__} is immutable, use replace()"
+        )
+
+    def as_dict(self) -> dict:
+        """Get the options given to the constructor.
+
+        Return
+        ------
+        options : ``dict``
+            The value of each option.
+        """
+        options = {name: getattr(self, name) for name in OPTION_NAMES}
+        if options["custom_headers"] is not None:
+            options["custom_headers"] = dict(options["custom_headers"])
+        return options
+
+    def replace(self, **changes) -> "FrozenRequestOptions":
+        """Create new options with some values changed.
+
+        Parameters
+        ----------
+        **changes
+            The options to change, as given to ``RequestOptions``.
+
+        Return
+        ------
+        options : ``FrozenRequestOptions``
+            The new options.
+        """
+        options = self.as_dict()
+        options.update(changes)
+        return type(self)(**options)
+
+    def with_access_token(self, access_token: str) -> "FrozenRequestOptions":
+        """Get the same options with another access token.
+
+        The options derived for the last 16 tokens are kept, so the same
+        object is returned for the same token.
+
+        Parameters
+        ----------
+        access_token : ``str``
+            The access token.
+
+        Return
+        ------
+        options : ``FrozenRequestOptions``
+            These options if they have the token, else the derived ones.
+
+        Raises
+        ------
+        ValueError
+            If the access token is not a string, like ``RequestOptions``.
+        """
+        if not isinstance(access_token, str):
+            raise ValueError("Param access_token must be a String")
+        if access_token == self.access_token:
+            return self
+        options = self._derived.get(access_token)
+        if options is None:
+            options = self.replace(access_token=access_token)
+            self._derived.put(access_token, options)
+        return options
+
+    def __repr__(self):
+        return f"<FrozenRequestOptions {self.as_dict()!r}>"
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def options_key(request_options) -> tuple:
+    """Get a hashable key of the values of some ``RequestOptions``.
+
+    Parameters
+    ----------
+    request_options : ``mercadopago.config.request_options``
+        The options.
+
+    Return
+    ------
+    key : ``tuple``
+        The value of each option, with the custom headers as a tuple.
+    """
+    values = [getattr(request_options, name) for name in OPTION_NAMES]
+    headers = values[OPTION_NAMES.index("custom_headers")]
+    if headers is not None:
+        values[OPTION_NAMES.index("custom_headers")] = tuple(
+            sorted(headers.items())
+        )
+    return tuple(values)
+
+
+def freeze(request_options, **changes) -> FrozenRequestOptions:
+    """Get immutable options with the values of some ``RequestOptions``.
+
+    Parameters
+    ----------
+    request_options : ``mercadopago.config.request_options``
+        The options to copy. Frozen options without changes are returned
+        as they are.
+    **changes
+        The options to change, as given to ``RequestOptions``.
+
+    Return
+    ------
+    options : ``FrozenRequestOptions``
+        The frozen options.
+    """
+    if isinstance(request_options, FrozenRequestOptions):
+        return (
+            request_options.replace(**changes) if changes else request_options
+        )
+    options = {name: getattr(request_options, name) for name in OPTION_NAMES}
+    options.update(changes)
+    return FrozenRequestOptions(**options)
@@ -0,0 +1,525 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Durable outbox of the creations sent once the API is reachable.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .adaptive import OVERLOAD_STATUSES
+from .scheduler import priority
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: States of an entry of the outbox.
+OUTBOX_STATES = ("pending", "sent", "failed")
+
+#: States of a ``CircuitBreaker``.
+BREAKER_STATES = ("closed", "open", "half_open")
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class CircuitBreaker(object):
+    """Stop calling the API after consecutive failures, for a while.
+
+    After ``threshold`` failures in a row the circuit opens and no call is
+    allowed for ``reset_timeout`` seconds. Then it is half open: a single
+    call probes the API, closing the circuit if it succeeds or opening it
+    again if it fails.
+
+    Parameters
+    ----------
+    threshold : ``int`` (optional)
+        Failures in a row that open the circuit. Defaults to 5.
+    reset_timeout : ``float`` (optional)
+        Seconds the circuit stays open. Defaults to 30.
+    """
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.trips = 0
+        self._opened = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _state(self) -> str:
+        if self._opened is None:
+            return "closed"
+        if time.monotonic() - self._opened < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    @property
+    def state(self) -> str:
+        """One of ``BREAKER_STATES``."""
+        with self._lock:
+            return self._state()
+
+    def allow(self) -> bool:
+        """Tell if a call can be made now, taking the probe if half open.
+
+        Return
+        ------
+        allowed : ``bool``
+            ``True`` if the circuit is closed, or half open and no probe
+            is in flight.
+        """
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "open" or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def retry_in(self) -> float:
+        """Get the seconds until the circuit is half open, 0 if it is."""
+        with self._lock:
+            if self._opened is None:
+                return 0.0
+            return max(
+                0.0, self._opened + self.reset_timeout - time.monotonic()
+            )
+
+    def success(self):
+        """Record a call that reached the API, closing the circuit."""
+        with self._lock:
+            self.failures = 0
+            self._opened = None
+            self._probing = False
+
+    def failure(self):
+        """Record a call that failed, opening the circuit when needed."""
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self._opened is not None or self.failures >= self.threshold:
+                if self._opened is None:
+                    self.trips += 1
+                self._opened = time.monotonic()
+
+    def stats(self) -> dict:
+        """Get the counters of the breaker.
+
+        Return
+        ------
+        stats : ``dict``
+            The ``state``, the ``failures`` in a row and the times the
+            circuit opened (``trips``).
+        """
+        with self._lock:
+            return {
+                "state": self._state(),
+                "failures": self.failures,
+                "trips": self.trips,
+            }
+
+
+class OutboxHandle(object):
+    """The creation of a resource submitted to an :class:`Outbox`.
+
+    Parameters
+    ----------
+    outbox : ``Outbox``
+        The outbox.
+    key : ``str``
+        The idempotency key of the creation.
+    """
+
+    def __init__(self, outbox, key: str):
+        self.outbox = outbox
+        self.key = key
+
+    @property
+    def state(self) -> str:
+        """One of ``OUTBOX_STATES``."""
+        return self.outbox.get(self.key)["state"]
+
+    def result(self):
+        """Get the answer of the API, or ``None`` while pending.
+
+        Return
+        ------
+        result : ``dict`` or ``None``
+            The ``status`` and the ``response``.
+        """
+        entry = self.outbox.get(self.key)
+        if entry["state"] == "pending":
+            return None
+        return {"status": entry["status"], "response": entry["response"]}
+
+    def wait(self, timeout: float = None):
+        """Wait for the answer of the API, unless the circuit is open.
+
+        Parameters
+        ----------
+        timeout : ``float`` or ``None`` (optional)
+            Seconds to wait. Defaults to ``None``, forever.
+
+        Return
+        ------
+        result : ``dict`` or ``None``
+            The answer, or ``None`` if it is still pending when the time
+            is over or the circuit is open.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        outbox = self.outbox
+        with outbox._cond:
+            while outbox.breaker.state != "open":
+                result = self.result()
+                if result is not None:
+                    return result
+                remaining = (
+                    None if deadline is None else deadline - time.monotonic()
+                )
+                if remaining is not None and remaining <= 0:
+                    break
+                outbox._cond.wait(remaining)
+        return self.result()
+
+    def __repr__(self):
+        return f"<OutboxHandle {self.key!r}>"
+
+
+class Outbox(object):
+    """Creations of resources kept in SQLite until the API answers them.
+
+    :meth:`submit` stores the creation with its idempotency key in a
+    single write and returns at once; a background thread sends the due
+    creations with ``workers`` threads. When a call fails, or is answered
+    with an overload status, the creation is sent again later (with the
+    same key, so the API never creates it twice) and the failure is
+    recorded in ``breaker``, which stops the sends while the API is down.
+    The sends run in the ``"default"`` priority class, behind the calls of
+    the requests. The creations left pending by a crash are sent after
+    :meth:`start`::
+
+        handle = mercadopago.outbox.submit("preference", preference_data)
+        result = handle.wait(timeout=2)  # None if the API is down
+
+    Parameters
+    ----------
+    path : ``str``
+        The database file (in WAL mode), or ``":memory:"``.
+    send : callable
+        Called with the accessor, the data and the idempotency key to make
+        the creation, returns a dict with the ``status`` and ``response``.
+    workers : ``int`` (optional)
+        Threads sending the creations. Defaults to 4.
+    breaker : ``CircuitBreaker`` or ``None`` (optional)
+        The breaker of the sends. Defaults to a new one.
+    backoff : ``float`` (optional)
+        Seconds before the first retry, doubled after each one. Defaults to
+        1.
+    max_backoff : ``float`` (optional)
+        Longest seconds between retries. Defaults to 300.
+    max_attempts : ``int`` or ``None`` (optional)
+        Sends after which a creation fails. Defaults to ``None``, never.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        send,
+        workers: int = 4,
+        breaker: CircuitBreaker = None,
+        backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        max_attempts: int = None,
+    ):
+        self.path = path
+        self.send = send
+        self.workers = workers
+        self.breaker = CircuitBreaker() if breaker is None else breaker
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self._cond = threading.Condition()
+        self._inflight = set()
+        self._thread = None
+        self._threads = []
+        self._stopped = False
+        self._pid = os.getpid()
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "key TEXT PRIMARY KEY, resource TEXT NOT NULL, "
+                "data TEXT NOT NULL, state TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, due REAL NOT NULL, "
+                "status INTEGER, response TEXT, created REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS outbox_due ON outbox (state, due)"
+            )
+        return conn
+
+    def _check_fork(self):
+        """Reopen the database and forget the sends of the parent."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._conn = self._connect()
+            self._inflight = set()
+            self._thread = None
+            self._threads = []
+
+    def submit(self, resource: str, data: dict, key: str = None):
+        """Store a creation, to be sent by the background thread.
+
+        Parameters
+        ----------
+        resource : ``str``
+            The accessor, like ``"preference"``.
+        data : ``dict``
+            The object created.
+        key : ``str`` or ``None`` (optional)
+            The idempotency key. Defaults to a new one. A key already
+            submitted keeps its first creation.
+
+        Return
+        ------
+        handle : ``OutboxHandle``
+            The pending creation.
+        """
+        key = uuid.uuid4().hex if key is None else key
+        now = time.time()
+        with self._cond:
+            self._check_fork()
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO outbox "
+                    "(key, resource, data, state, due, created) "
+                    "VALUES (?, ?, ?, 'pending', ?, ?)",
+                    (key, resource, json.dumps(data), now, now),
+                )
+            self._start()
+            self._cond.notify_all()
+        return OutboxHandle(self, key)
+
+    def get(self, key: str):
+        """Get an entry of the outbox, or ``None``.
+
+        Parameters
+        ----------
+        key : ``str``
+            The idempotency key.
+
+        Return
+        ------
+        entry : ``dict`` or ``None``
+            The ``key``, ``resource``, ``state``, ``attempts``, and the
+            ``status`` and ``response`` of the last answer.
+        """
+        with self._cond:
+            self._check_fork()
+            row = self._conn.execute(
+                "SELECT resource, state, attempts, status, response "
+                "FROM outbox WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "key": key,
+            "resource": row[0],
+            "state": row[1],
+            "attempts": row[2],
+            "status": row[3],
+            "response": None if row[4] is None else json.loads(row[4]),
+        }
+
+    def start(self):
+        """Start sending the pending creations, like the ones of a crash."""
+        with self._cond:
+            self._check_fork()
+            self._stopped = False
+            self._start()
+
+    def _start(self):
+        if self._thread is None and not self._stopped:
+            self._thread = threading.Thread(
+                target=self._run, name="mercadopago-outbox", daemon=True
+            )
+            self._thread.start()
+            # kept after _next_batch is done, until close() joins them
+            self._threads = [t for t in self._threads if t.is_alive()]
+            self._threads.append(self._thread)
+
+    def _next_batch(self):
+        """Wait for the creations to send, or get ``None`` when done."""
+        with self._cond:
+            while True:
+                if self._stopped or self._pid != os.getpid():
+                    self._thread = None
+                    return None
+                now = time.time()
+                free = self.workers - len(self._inflight)
+                rows = self._conn.execute(
+                    "SELECT key, resource, data, attempts FROM outbox "
+                    "WHERE state = 'pending' AND due <= ? "
+                    "ORDER BY due LIMIT ?",
+                    (now, self.workers),
+                ).fetchall()
+                rows = [row for row in rows if row[0] not in self._inflight]
+                batch = []
+                for row in rows[: max(0, free)]:
+                    if not self.breaker.allow():
+                        break
+                    self._inflight.add(row[0])
+                    batch.append(row)
+                if batch:
+                    return batch
+                if rows:
+                    delay = self.breaker.retry_in() or None
+                else:
+                    # the creations in flight are still pending, but their
+                    # end is notified by _deliver
+                    inflight = list(self._inflight)
+                    due = self._conn.execute(
+                        "SELECT MIN(due) FROM outbox WHERE state = 'pending' "
+                        "AND key NOT IN (%s)" % ", ".join("?" * len(inflight)),
+                        inflight,
+                    ).fetchone()[0]
+                    if due is None and not inflight:
+                        self._thread = None
+                        return None
+                    delay = None if due is None else max(0.0, due - now)
+                self._cond.wait(delay)
+
+    def _run(self):
+        """Send the due creations until none is pending."""
+        with ThreadPoolExecutor(self.workers) as executor:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    return
+                for row in batch:
+                    executor.submit(self._deliver, *row)
+
+    def _deliver(self, key: str, resource: str, data: str, attempts: int):
+        """Send a creation and record the answer."""
+        try:
+            with priority("default"):
+                result = self.send(resource, json.loads(data), key)
+        except Exception:  # noqa
+            logger.warning("Sending %s %s failed", resource, key)
+            result = None
+        status = None if result is None else result.get("status")
+        attempts += 1
+        with self._cond:
+            self._inflight.discard(key)
+            if status is None or status in OVERLOAD_STATUSES:
+                self.breaker.failure()
+                failed = (
+                    self.max_attempts is not None
+                    and attempts >= self.max_attempts
+                )
+                delay = min(
+                    self.backoff * 2 ** (attempts - 1), self.max_backoff
+                )
+                state = "failed" if failed else "pending"
+            else:
+                self.breaker.success()
+                state = "sent" if 200 <= status < 300 else "failed"
+                delay = 0.0
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE outbox SET state = ?, attempts = ?, due = ?, "
+                    "status = ?, response = ? WHERE key = ?",
+                    (
+                        state,
+                        attempts,
+                        time.time() + delay,
+                        status,
+                        (
+                            None
+                            if result is None
+                            else json.dumps(result.get("response"))
+                        ),
+                        key,
+                    ),
+                )
+            self._cond.notify_all()
+
+    def stop(self):
+        """Stop sending, keeping the pending creations for the next start."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def close(self):
+        """Stop sending, wait for the creations in flight and close."""
+        self.stop()
+        with self._cond:
+            threads = list(self._threads)
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join()
+        with self._cond:
+            self._conn.close()
+
+    def stats(self) -> dict:
+        """Get the counters of the outbox.
+
+        Return
+        ------
+        stats : ``dict``
+            The entries of each state, the ones ``inflight``, and the
+            counters of the ``breaker``.
+        """
+        with self._cond:
+            self._check_fork()
+            counts = dict(
+                self._conn.execute(
+                    "SELECT state, COUNT(*) FROM outbox GROUP BY state"
+                ).fetchall()
+            )
+            stats = {state: counts.get(state, 0) for state in OUTBOX_STATES}
+            stats["inflight"] = len(self._inflight)
+        stats["breaker"] = self.breaker.stats()
+        return stats
+
+    def __len__(self):
+        with self._cond:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE state = 'pending'"
+            ).fetchone()[0]
@@ -0,0 +1,412 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Background polling of the merchant orders waiting for a payment.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask.signals import Namespace
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Fields of a merchant order whose change is notified.
+STATE_FIELDS = ("status", "order_status")
+
+#: Values of ``status`` after which an order is no longer polled.
+FINAL_STATUSES = ("closed", "expired")
+
+_signals = Namespace()
+
+#: Sent by the app with ``order_id``, ``order`` and ``previous`` (the
+#: order before the change, or ``None`` on the first poll) when the state
+#: of a watched merchant order changes.
+merchant_order_changed = _signals.signal("mercadopago-merchant-order-changed")
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class _Watch(object):
+    """A watched order, shared by all its watchers."""
+
+    def __init__(self, order_id, interval: float, now: float):
+        self.order_id = order_id
+        self.callbacks = []
+        self.waiters = 0
+        self.interval = interval
+        self.due = now
+        self.started = now
+        self.order = None
+        self.state = None
+        self.version = 0
+        self.poked = False
+        self.done = False
+
+
+class OrderPoller(object):
+    """Poll the watched merchant orders from one background thread.
+
+    Each order is polled once no matter how many threads watch it, first
+    every ``min_interval`` seconds and, while its state doesn't change,
+    less and less often (the interval grows ``backoff`` times per poll up
+    to ``max_interval``). The orders due at the same time are polled as a
+    batch by ``workers`` threads. When the ``status`` or ``order_status``
+    of an order changes, its callbacks are called, the
+    ``merchant_order_changed`` signal is sent and the threads blocked in
+    :meth:`wait` wake up. The orders are dropped once closed or expired,
+    or after ``max_age`` seconds::
+
+        order = mercadopago.order_poller.wait(order_id, timeout=25)
+
+    Parameters
+    ----------
+    fetch : callable
+        Called with an order id, returns the result of
+        ``merchant_order().get``.
+    min_interval : ``float`` (optional)
+        Seconds between the first polls of an order. Defaults to 2.
+    max_interval : ``float`` (optional)
+        Longest seconds between polls. Defaults to 60.
+    backoff : ``float`` (optional)
+        Growth of the interval after each poll without a change. Defaults
+        to 1.5.
+    max_age : ``float`` or ``None`` (optional)
+        Seconds an order is watched. Defaults to 3600.
+    workers : ``int`` (optional)
+        Threads polling each batch. Defaults to 4.
+    sender : object (optional)
+        Sender of the ``merchant_order_changed`` signal, usually the app.
+    """
+
+    def __init__(
+        self,
+        fetch,
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+        backoff: float = 1.5,
+        max_age: float = 3600.0,
+        workers: int = 4,
+        sender=None,
+    ):
+        self.fetch = fetch
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_age = max_age
+        self.workers = workers
+        self.sender = sender
+        self.polls = 0
+        self.errors = 0
+        self.changes = 0
+        self._cond = threading.Condition()
+        self._watches = {}
+        self._queue = []
+        self._sequence = itertools.count()
+        self._thread = None
+        self._pid = os.getpid()
+
+    def watch(self, order_id, callback=None):
+        """Start polling an order, if it isn't polled yet.
+
+        Parameters
+        ----------
+        order_id : ``int`` or ``str``
+            The id of the merchant order.
+        callback : callable or ``None`` (optional)
+            Called with ``order_id``, ``order`` and ``previous`` when the
+            state of the order changes, from the thread of the poller.
+        """
+        with self._cond:
+            watch = self._watch(order_id)
+            if callback is not None and callback not in watch.callbacks:
+                watch.callbacks.append(callback)
+
+    def unwatch(self, order_id, callback=None):
+        """Remove a callback of an order, or stop polling it.
+
+        Parameters
+        ----------
+        order_id : ``int`` or ``str``
+            The id of the merchant order.
+        callback : callable or ``None`` (optional)
+            The callback to remove. Defaults to ``None``, every callback,
+            and the order is no longer polled unless a thread waits for it.
+        """
+        with self._cond:
+            watch = self._watches.get(order_id)
+            if watch is None:
+                return
+            if callback is None:
+                watch.callbacks = []
+            elif callback in watch.callbacks:
+                watch.callbacks.remove(callback)
+            if not watch.callbacks and not watch.waiters:
+                self._finish(watch)
+
+    def poke(self, order_id):
+        """Poll a watched order now, like when a notification arrives.
+
+        Parameters
+        ----------
+        order_id : ``int`` or ``str``
+            The id of the merchant order.
+
+        Return
+        ------
+        watched : ``bool``
+            If the order is watched.
+        """
+        with self._cond:
+            watch = self._watches.get(order_id)
+            if watch is None and str(order_id).isdigit():
+                watch = self._watches.get(int(order_id))
+            if watch is None:
+                return False
+            # kept until the next batch, so a poll in flight doesn't drop it
+            watch.poked = True
+            watch.interval = self.min_interval
+            self._schedule(watch, time.monotonic())
+            return True
+
+    def wait(self, order_id, timeout: float = None, final: bool = False):
+        """Wait for the next state of an order, polled by the poller.
+
+        The first poll of an order gives the state it is in, so when it
+        wasn't polled yet the wait lasts until a later poll changes it.
+
+        Parameters
+        ----------
+        order_id : ``int`` or ``str``
+            The id of the merchant order, watched if it isn't yet.
+        timeout : ``float`` or ``None`` (optional)
+            Seconds to wait. Defaults to ``None``, forever.
+        final : ``bool`` (optional)
+            Wait until the order is closed or expired, instead of until
+            its first change. Defaults to ``False``.
+
+        Return
+        ------
+        order : ``dict`` or ``None``
+            The merchant order, or the last one known (``None`` if it was
+            never polled) when the time is over.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            watch = self._watch(order_id)
+            # version 1 is the first state polled, not a change
+            version = max(watch.version, 1)
+            watch.waiters += 1
+            try:
+                while not watch.done and (final or watch.version <= version):
+                    remaining = (
+                        None
+                        if deadline is None
+                        else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            finally:
+                watch.waiters -= 1
+            if not watch.done and not watch.callbacks and not watch.waiters:
+                self._finish(watch)
+            return watch.order
+
+    def _watch(self, order_id) -> _Watch:
+        """Get the watch of an order, scheduling it if it is new."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._thread = None
+            self._watches.clear()
+            self._queue = []
+        watch = self._watches.get(order_id)
+        if watch is None or watch.done:
+            now = time.monotonic()
+            watch = _Watch(order_id, self.min_interval, now)
+            self._watches[order_id] = watch
+            self._schedule(watch, now)
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="mercadopago-poller", daemon=True
+            )
+            self._thread.start()
+        return watch
+
+    def _schedule(self, watch: _Watch, due: float):
+        """Queue the next poll of an order, replacing the queued one."""
+        watch.due = due
+        heapq.heappush(self._queue, (due, next(self._sequence), watch))
+        self._cond.notify_all()
+
+    def _finish(self, watch: _Watch):
+        """Stop polling an order and wake up its waiters."""
+        watch.done = True
+        if self._watches.get(watch.order_id) is watch:
+            del self._watches[watch.order_id]
+        self._cond.notify_all()
+
+    def _next_batch(self) -> list:
+        """Wait for the orders due, or get ``None`` when none is left."""
+        with self._cond:
+            while True:
+                while self._queue and self._stale(self._queue[0]):
+                    heapq.heappop(self._queue)
+                if not self._queue:
+                    self._thread = None
+                    return None
+                now = time.monotonic()
+                if self._queue[0][0] > now:
+                    self._cond.wait(self._queue[0][0] - now)
+                    continue
+                batch = []
+                while self._queue and self._queue[0][0] <= now:
+                    entry = heapq.heappop(self._queue)
+                    if not self._stale(entry):
+                        entry[2].poked = False
+                        batch.append(entry[2])
+                return batch
+
+    @staticmethod
+    def _stale(entry) -> bool:
+        """Tell if an entry of the queue was finished or rescheduled."""
+        return entry[2].done or entry[0] != entry[2].due
+
+    def _run(self):
+        """Poll the batches of orders until none is watched."""
+        with ThreadPoolExecutor(self.workers) as executor:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    return
+                for watch, result in zip(
+                    batch,
+                    executor.map(self._poll, [w.order_id for w in batch]),
+                ):
+                    try:
+                        self._update(watch, result)
+                    except Exception:  # noqa
+                        logger.exception(
+                            "Updating merchant order %s failed", watch.order_id
+                        )
+                        self._retry(watch)
+
+    def _retry(self, watch: _Watch):
+        """Schedule again an order whose update failed."""
+        with self._cond:
+            if watch.done:
+                return
+            now = time.monotonic()
+            self._schedule(watch, now if watch.poked else now + watch.interval)
+
+    def _poll(self, order_id):
+        """Fetch an order, getting ``None`` when it fails."""
+        try:
+            result = self.fetch(order_id)
+        except Exception:  # noqa
+            logger.warning("Polling merchant order %s failed", order_id)
+            return None
+        if result["status"] != 200:
+            return None
+        return result["response"]
+
+    def _update(self, watch: _Watch, order):
+        """Record the result of a poll, notify it and schedule the next."""
+        now = time.monotonic()
+        previous = watch.order
+        changed = False
+        with self._cond:
+            self.polls += 1
+            if order is None:
+                self.errors += 1
+            else:
+                state = tuple(order.get(field) for field in STATE_FIELDS)
+                changed = state != watch.state
+                watch.order, watch.state = order, state
+            if changed:
+                self.changes += 1
+                watch.version += 1
+                watch.interval = self.min_interval
+            else:
+                watch.interval = min(
+                    watch.interval * self.backoff, self.max_interval
+                )
+            expired = (
+                self.max_age is not None
+                and now - watch.started >= self.max_age
+            )
+            if expired or (changed and order.get("status") in FINAL_STATUSES):
+                self._finish(watch)
+            elif not watch.done:
+                self._schedule(
+                    watch, now if watch.poked else now + watch.interval
+                )
+            callbacks = list(watch.callbacks)
+            self._cond.notify_all()
+        if changed:
+            self._notify(watch.order_id, order, previous, callbacks)
+
+    def _notify(self, order_id, order, previous, callbacks):
+        """Call the callbacks of an order and send the signal."""
+        for callback in callbacks:
+            try:
+                callback(order_id, order, previous)
+            except Exception:  # noqa
+                logger.exception("Callback of merchant order %s", order_id)
+        if self.sender is not None:
+            merchant_order_changed.send(
+                self.sender, order_id=order_id, order=order, previous=previous
+            )
+
+    def stop(self):
+        """Stop polling every order, waking up their waiters."""
+        with self._cond:
+            for watch in list(self._watches.values()):
+                self._finish(watch)
+            self._queue = []
+
+    def stats(self) -> dict:
+        """Get the counters of the poller.
+
+        Return
+        ------
+        stats : ``dict``
+            The orders ``watched``, the threads ``waiting`` for them and
+            the ``polls``, failed polls (``errors``) and ``changes`` so far.
+        """
+        with self._cond:
+            return {
+                "watched": len(self._watches),
+                "waiting": sum(w.waiters for w in self._watches.values()),
+                "polls": self.polls,
+                "errors": self.errors,
+                "changes": self.changes,
+            }
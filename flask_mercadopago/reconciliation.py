@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Reconciliation of the payments with the orders of the application.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import math
+
+#: The ``numpy`` module, imported by the first reconciliation since it is
+#: slow to import and optional.
+numpy = None
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Columns of the payments read by the reconciliation.
+RECONCILE_COLUMNS = (
+    ("id", "id", "int64"),
+    ("external_reference", "external_reference", "string"),
+    ("status", "status", "string"),
+    ("transaction_amount", "transaction_amount", "float64"),
+    ("transaction_amount_refunded", "transaction_amount_refunded", "float64"),
+)
+
+#: Statuses of the payments that pay an order.
+PAID_STATUSES = ("approved",)
+
+#: Statuses of the payments that may still pay an order.
+PENDING_STATUSES = ("pending", "in_process", "authorized", "in_mediation")
+
+#: Outcome of each order, by its code in ``Reconciliation.outcomes``.
+ORDER_OUTCOMES = ("matched", "unpaid", "pending", "underpaid", "overpaid")
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _import_numpy():
+    """Import ``numpy`` on first use, or get ``None`` if not installed."""
+    global numpy
+    if numpy is None:
+        try:
+            import numpy as module
+        except ImportError:
+            return None
+        numpy = module
+    return numpy
+
+
+def _strings(np, values):
+    """Convert a column to an array of ``str``, with ``""`` for ``None``."""
+    if isinstance(values, np.ndarray) and values.dtype.kind == "U":
+        return values
+    return np.array(["" if v is None else str(v) for v in values], dtype=str)
+
+
+def _numbers(np, values):
+    """Convert a column to an array of ``float``, with 0 for ``None``."""
+    array = np.asarray(values, dtype=float)
+    return np.nan_to_num(array, nan=0.0)
+
+
+def _record_columns(np, records: list) -> dict:
+    """Convert the payments to the arrays of ``RECONCILE_COLUMNS``.
+
+    Each array is built in a single pass over the records, without the
+    lists of :func:`flask_mercadopago.export.to_columns`. The ids are left
+    out, since only the ones of the orphans are read.
+    """
+    columns = {}
+    for name, path, kind in RECONCILE_COLUMNS:
+        if name == "id":
+            continue
+        values = (record.get(path) for record in records)
+        if kind == "string":
+            columns[name] = np.array(
+                ["" if v is None else v for v in values], dtype=str
+            )
+        else:
+            columns[name] = np.fromiter(
+                (math.nan if v is None else v for v in values),
+                dtype=float,
+                count=len(records),
+            )
+    return columns
+
+
+def _hash_strings(np, strings, weights):
+    """Hash an array of ``str`` to ``int64``, weighting its code points."""
+    width = strings.dtype.itemsize // 4
+    codes = np.ascontiguousarray(strings).view(np.uint32)
+    return (
+        codes.reshape(len(strings), width).astype(np.int64) @ weights[:width]
+    )
+
+
+def _join(np, keys, values):
+    """Get the position in ``keys`` of each of ``values``, or -1.
+
+    The strings are joined by their hashes, since sorting and searching
+    integers is many times faster, and the matches are then compared.
+    """
+    index = np.full(len(values), -1)
+    if not len(keys):
+        return index
+    width = max(keys.dtype.itemsize, values.dtype.itemsize) // 4
+    weights = np.random.default_rng(0).integers(
+        1, 2**62, width, dtype=np.int64
+    )
+    hashed_keys = _hash_strings(np, keys, weights)
+    hashed_values = _hash_strings(np, values, weights)
+    sorter = np.argsort(hashed_keys)
+    ordered = hashed_keys[sorter]
+    if np.any(ordered[1:] == ordered[:-1]):
+        # repeated keys or a collision, join the strings themselves
+        hashed_keys, hashed_values = keys, values
+        sorter = np.argsort(keys, kind="stable")
+        ordered = keys[sorter]
+    # the search is faster for sorted values
+    order = np.argsort(hashed_values)
+    position = np.empty(len(values), dtype=np.intp)
+    position[order] = np.searchsorted(ordered, hashed_values[order])
+    position = np.minimum(position, len(ordered) - 1)
+    candidates = sorter[position]
+    matches = ordered[position] == hashed_values
+    matches[matches] = keys[candidates[matches]] == values[matches]
+    index[matches] = candidates[matches]
+    return index
+
+
+def reconcile(payments, orders, tolerance: float = 0.01):
+    """Match the payments with the orders by their ``external_reference``.
+
+    The payments are converted to one array per column, in a single pass
+    over the records for each, and joined with the orders by their hashes,
+    and the amounts received by each order are added with
+    ``numpy.bincount``, so no Python code runs per payment after the
+    conversion. Each order is classified as ``matched`` (the approved
+    payments, minus their refunds, add up to its amount within
+    ``tolerance``), ``unpaid``, ``pending`` (only payments still in
+    process), ``underpaid`` or ``overpaid`` (like when it was paid twice),
+    and the approved payments of unknown orders are reported as orphans::
+
+        pages = iter_search(mercadopago.payment(), filters)
+        payments = [p for page in pages for p in page["results"]]
+        result = reconcile(payments, {"order-1": 100.0, "order-2": 20.0})
+        result.summary()
+
+    It requires ``numpy`` (``pip install Flask-Mercadopago[reconcile]``).
+
+    Parameters
+    ----------
+    payments : iterable of ``dict`` or ``dict``
+        The payments, or their columns (like the result of
+        :func:`flask_mercadopago.export.to_columns` or the arrays of a
+        ``pyarrow.Table``) with at least the ones of ``RECONCILE_COLUMNS``.
+    orders : ``dict`` or iterable of ``tuple``
+        The amount of each order by reference, or the ``(reference,
+        amount)`` pairs. The references must be unique.
+    tolerance : ``float`` (optional)
+        Largest difference of an amount still matched. Defaults to 0.01.
+
+    Return
+    ------
+    result : :class:`Reconciliation`
+        The outcome of each order and the orphan payments.
+    """
+    np = _import_numpy()
+    if np is None:
+        raise RuntimeError(
+            "The reconciliation requires numpy, install it with "
+            "'pip install Flask-Mercadopago[reconcile]'"
+        )
+    records = None
+    if not isinstance(payments, dict):
+        records = payments if isinstance(payments, list) else list(payments)
+        payments = _record_columns(np, records)
+    if isinstance(orders, dict):
+        references, amounts = list(orders), list(orders.values())
+    else:
+        references, amounts = list(zip(*orders)) or ((), ())
+    references = _strings(np, references)
+    expected = _numbers(np, amounts)
+
+    refs = _strings(np, payments["external_reference"])
+    index = _join(np, references, refs)
+    found = (index >= 0) & (refs != "")
+
+    statuses = _strings(np, payments["status"])
+    paid = np.isin(statuses, PAID_STATUSES)
+    pending = np.isin(statuses, PENDING_STATUSES)
+    net = _numbers(np, payments["transaction_amount"])
+    refunded = payments.get("transaction_amount_refunded")
+    if refunded is not None:
+        net = net - _numbers(np, refunded)
+
+    size = len(references)
+    counted = paid & found
+    received = np.bincount(
+        index[counted], weights=net[counted], minlength=size
+    )
+    count = np.bincount(index[counted], minlength=size)
+    waiting = np.bincount(index[pending & found], minlength=size)
+    difference = received - expected
+    outcomes = np.select(
+        [
+            (count == 0) & (waiting > 0),
+            count == 0,
+            difference < -tolerance,
+            difference > tolerance,
+        ],
+        [2, 1, 3, 4],
+        default=0,
+    ).astype(np.int8)
+    orphans = np.flatnonzero(paid & ~found)
+    if records is None:
+        orphans = np.asarray(payments["id"])[orphans]
+    else:
+        orphans = np.array([records[i].get("id") for i in orphans.tolist()])
+    return Reconciliation(
+        references, expected, received, count, outcomes, orphans
+    )
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class Reconciliation(object):
+    """Result of :func:`reconcile`, as one array per field of the orders.
+
+    Parameters
+    ----------
+    references : ``numpy.ndarray``
+        The reference of each order.
+    expected : ``numpy.ndarray``
+        The amount of each order.
+    received : ``numpy.ndarray``
+        The amount of the approved payments of each order, minus refunds.
+    payments : ``numpy.ndarray``
+        The number of approved payments of each order.
+    outcomes : ``numpy.ndarray``
+        The index in ``ORDER_OUTCOMES`` of the outcome of each order.
+    orphans : ``numpy.ndarray``
+        The ids of the approved payments of unknown orders.
+    """
+
+    def __init__(
+        self, references, expected, received, payments, outcomes, orphans
+    ):
+        self.references = references
+        self.expected = expected
+        self.received = received
+        self.payments = payments
+        self.outcomes = outcomes
+        self.orphans = orphans
+
+    def __len__(self):
+        return len(self.references)
+
+    def summary(self) -> dict:
+        """Count the orders of each outcome and the orphan payments.
+
+        Return
+        ------
+        summary : ``dict``
+            The number of orders of each of ``ORDER_OUTCOMES``, and the
+            ``orphans``.
+        """
+        np = _import_numpy()
+        counts = np.bincount(self.outcomes, minlength=len(ORDER_OUTCOMES))
+        summary = dict(zip(ORDER_OUTCOMES, counts.tolist()))
+        summary["orphans"] = len(self.orphans)
+        return summary
+
+    def mismatches(self) -> list:
+        """Get the orders that aren't matched.
+
+        Return
+        ------
+        mismatches : ``list`` of ``dict``
+            The ``external_reference``, ``outcome``, ``expected`` and
+            ``received`` amounts and number of ``payments`` of each order
+            not matched, in the order given.
+        """
+        rows = _import_numpy().flatnonzero(self.outcomes)
+        return [
+            {
+                "external_reference": str(self.references[i]),
+                "outcome": ORDER_OUTCOMES[self.outcomes[i]],
+                "expected": float(self.expected[i]),
+                "received": float(self.received[i]),
+                "payments": int(self.payments[i]),
+            }
+            for i in rows.tolist()
+        ]
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Registry of the resources of the API that have an accessor.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import importlib
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Resource class of each accessor, as a class or its dotted path (so the
+#: SDK is only imported when the first resource object is created).
+RESOURCES = {
+    "advanced_payment": "mercadopago.resources.AdvancedPayment",
+    "card": "mercadopago.resources.Card",
+    "card_token": "mercadopago.resources.CardToken",
+    "chargeback": "mercadopago.resources.Chargeback",
+    "customer": "mercadopago.resources.Customer",
+    "disbursement_refund": "mercadopago.resources.DisbursementRefund",
+    "identification_type": "mercadopago.resources.IdentificationType",
+    "installments": "flask_mercadopago.installments.Installments",
+    "merchant_order": "mercadopago.resources.MerchantOrder",
+    "payment": "mercadopago.resources.Payment",
+    "payment_methods": "mercadopago.resources.PaymentMethods",
+    "plan": "mercadopago.resources.Plan",
+    "preapproval": "mercadopago.resources.PreApproval",
+    "preference": "mercadopago.resources.Preference",
+    "refund": "mercadopago.resources.Refund",
+    "subscription": "mercadopago.resources.Subscription",
+    "user": "mercadopago.resources.User",
+}
+
+#: Accessors of the SDK resources, never unregistered.
+BUILTIN_RESOURCES = frozenset(RESOURCES)
+
+_classes = {}
+
+_owners = []
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def resource_path(name: str) -> str:
+    """Get the dotted path of the resource class of an accessor.
+
+    Parameters
+    ----------
+    name : ``str``
+        The name of the accessor, like ``"payment"``.
+
+    Return
+    ------
+    path : ``str``
+        The path, like ``"mercadopago.resources.Payment"``.
+    """
+    resource = RESOURCES[name]
+    if isinstance(resource, str):
+        return resource
+    return f"{resource.__module__}.{resource.__qualname__}"
+
+
+def resource_class(name: str) -> type:
+    """Get the resource class of an accessor, importing it on first use.
+
+    Parameters
+    ----------
+    name : ``str``
+        The name of the accessor, like ``"payment"``.
+
+    Return
+    ------
+    cls : ``type``
+        A subclass of ``mercadopago.core.MPBase``.
+    """
+    try:
+        return _classes[name]
+    except KeyError:
+        resource = RESOURCES[name]
+        if isinstance(resource, str):
+            module, _, attr = resource.rpartition(".")
+            resource = getattr(importlib.import_module(module), attr)
+        return _classes.setdefault(name, resource)
+
+
+def _is_accessor(owner, name: str) -> bool:
+    """Tell if ``owner`` has no attribute ``name`` or has its accessor."""
+    attr = owner.__dict__.get(name)
+    return attr is None or getattr(attr, "resource_name", None) == name
+
+
+def bind_accessors(owner: type, make_accessor):
+    """Add the accessor of every resource, and of the ones registered later.
+
+    Parameters
+    ----------
+    owner : ``type``
+        The class receiving the accessors.
+    make_accessor : callable
+        Called with the name of a resource to create its accessor method.
+    """
+    _owners.append((owner, make_accessor))
+    for name in RESOURCES:
+        if _is_accessor(owner, name):
+            _set_accessor(owner, name, make_accessor)
+
+
+def _set_accessor(owner: type, name: str, make_accessor):
+    """Add the accessor of a resource to a class.
+
+    Parameters
+    ----------
+    owner : ``type``
+        The class receiving the accessor.
+    name : ``str``
+        The name of the resource.
+    make_accessor : callable
+        Called with ``name`` to create the accessor method.
+    """
+    accessor = make_accessor(name)
+    accessor.__name__ = name
+    accessor.__qualname__ = f"{owner.__name__}.{name}"
+    accessor.resource_name = name
+    setattr(owner, name, accessor)
+
+
+def register_resource(name: str, resource):
+    """Add a resource of the API, with an accessor named ``name``.
+
+    The accessor is added to ``Mercadopago`` and ``SellerClient``, and
+    calls go through the same path as the ones of the SDK resources::
+
+        from mercadopago.core import MPBase
+
+        class Dispute(MPBase):
+            def get(self, dispute_id):
+                return self._get(uri=f"/v1/disputes/{dispute_id}")
+
+        register_resource("dispute", Dispute)
+        mercadopago.dispute().get(dispute_id)
+
+    Parameters
+    ----------
+    name : ``str``
+        The name of the accessor, a valid identifier.
+    resource : ``type`` or ``str``
+        A subclass of ``mercadopago.core.MPBase``, or its dotted path.
+    """
+    if not name.isidentifier() or name.startswith("_"):
+        raise ValueError(f"Invalid resource name {name!r}")
+    if name in RESOURCES:
+        raise ValueError(f"Resource {name!r} is already registered")
+    for owner, _ in _owners:
+        if not _is_accessor(owner, name):
+            raise ValueError(f"{owner.__name__} already has a {name!r}")
+    RESOURCES[name] = resource
+    for owner, make_accessor in _owners:
+        _set_accessor(owner, name, make_accessor)
+
+
+def unregister_resource(name: str):
+    """Remove a resource added by :func:`register_resource`, and its accessors.
+
+    Parameters
+    ----------
+    name : ``str``
+        The name of the accessor, not one of ``BUILTIN_RESOURCES``.
+    """
+    if name in BUILTIN_RESOURCES:
+        raise ValueError(f"Resource {name!r} is not registered")
+    del RESOURCES[name]
+    _classes.pop(name, None)
+    for owner, _ in _owners:
+        if name in owner.__dict__:
+            delattr(owner, name)
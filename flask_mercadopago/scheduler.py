@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Priority classes of the calls to the API, sharing a rate budget.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import contextlib
+import contextvars
+import os
+import threading
+import time
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Priority classes of the calls, from the highest.
+PRIORITIES = ("interactive", "default", "batch")
+
+#: Class of the calls made outside of a :func:`priority` block.
+DEFAULT_PRIORITY = "interactive"
+
+_priority = contextvars.ContextVar("mercadopago_priority", default=None)
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+@contextlib.contextmanager
+def priority(name: str):
+    """Set the priority class of the calls made in a block.
+
+    The class is kept in a context variable, so it applies to the calls of
+    the current thread (or task) only::
+
+        with priority("batch"):
+            PaymentSync(mercadopago, sink).run()
+
+    Parameters
+    ----------
+    name : ``str``
+        One of ``PRIORITIES``.
+    """
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown priority {name!r}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """Get the priority class of the calls of the current context.
+
+    Return
+    ------
+    name : ``str``
+        The class set by :func:`priority`, or ``DEFAULT_PRIORITY``.
+    """
+    return _priority.get() or DEFAULT_PRIORITY
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class OutboundScheduler(object):
+    """Admit the calls to the API by priority class.
+
+    Each class runs at most ``limits[name]`` calls at once and every call
+    takes a token of a bucket refilled with ``rate`` tokens per second (up
+    to ``burst``), shared by all the classes. A call waits while a call of
+    a higher class that has room to run is waiting, so the interactive
+    calls get the next free token before any background one.
+
+    Parameters
+    ----------
+    limits : ``dict`` or ``None`` (optional)
+        The most concurrent calls of each class, by name. The classes left
+        out (and ``None``) are unlimited.
+    rate : ``float`` or ``None`` (optional)
+        Calls per second of all the classes. Defaults to ``None``,
+        unlimited.
+    burst : ``int`` or ``None`` (optional)
+        Most calls started at once after an idle period. Defaults to the
+        calls of one second.
+    """
+
+    def __init__(self, limits=None, rate: float = None, burst: int = None):
+        limits = dict(limits or {})
+        unknown = set(limits) - set(PRIORITIES)
+        if unknown:
+            raise ValueError(f"Unknown priorities {sorted(unknown)}")
+        self.limits = [limits.get(name) for name in PRIORITIES]
+        self.rate = rate
+        self.burst = max(1, burst or int(rate or 1))
+        self._cond = threading.Condition()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+        self._running = [0] * len(PRIORITIES)
+        self._waiting = [0] * len(PRIORITIES)
+        self._calls = [0] * len(PRIORITIES)
+        self._waited = [0.0] * len(PRIORITIES)
+
+    def _has_room(self, level: int) -> bool:
+        limit = self.limits[level]
+        return limit is None or self._running[level] < limit
+
+    def _can_start(self, level: int) -> bool:
+        """Tell if a call of a class may take a token now."""
+        if not self._has_room(level):
+            return False
+        return not any(
+            self._waiting[higher] and self._has_room(higher)
+            for higher in range(level)
+        )
+
+    def _refill(self, now: float):
+        if self.rate is not None:
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._refilled) * self.rate
+            )
+        self._refilled = now
+
+    def acquire(self, name: str = None, timeout: float = None):
+        """Wait until a call of a class can start.
+
+        Parameters
+        ----------
+        name : ``str`` or ``None`` (optional)
+            The class. Defaults to the one of the current context.
+        timeout : ``float`` or ``None`` (optional)
+            Most seconds to wait. Defaults to ``None``, forever.
+
+        Raises
+        ------
+        TimeoutError
+            If the call couldn't start in ``timeout`` seconds.
+        """
+        level = PRIORITIES.index(name or current_priority())
+        started = time.monotonic()
+        with self._cond:
+            if self._pid != os.getpid():
+                self._reset()
+            self._waiting[level] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    delay = None
+                    if self._can_start(level):
+                        if self.rate is None or self._tokens >= 1:
+                            break
+                        delay = (1 - self._tokens) / self.rate
+                    if timeout is not None:
+                        remaining = started + timeout - now
+                        if remaining <= 0:
+                            raise TimeoutError(
+                                f"No room for a {PRIORITIES[level]} call"
+                            )
+                        delay = (
+                            remaining
+                            if delay is None
+                            else min(delay, remaining)
+                        )
+                    self._cond.wait(delay)
+            finally:
+                self._waiting[level] -= 1
+                self._cond.notify_all()
+            if self.rate is not None:
+                self._tokens -= 1
+            self._running[level] += 1
+            self._calls[level] += 1
+            self._waited[level] += time.monotonic() - started
+
+    def release(self, name: str = None):
+        """End a call started by :meth:`acquire`.
+
+        Parameters
+        ----------
+        name : ``str`` or ``None`` (optional)
+            The class. Defaults to the one of the current context.
+        """
+        level = PRIORITIES.index(name or current_priority())
+        with self._cond:
+            if self._running[level]:
+                self._running[level] -= 1
+            self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self, name: str = None):
+        """Run a call of a class, waiting for its turn.
+
+        Parameters
+        ----------
+        name : ``str`` or ``None`` (optional)
+            The class. Defaults to the one of the current context.
+        """
+        name = name or current_priority()
+        self.acquire(name)
+        try:
+            yield
+        finally:
+            self.release(name)
+
+    def stats(self) -> dict:
+        """Get the counters of each class.
+
+        Return
+        ------
+        stats : ``dict``
+            The calls ``running`` and ``waiting``, the ``calls`` started and
+            the seconds they ``waited``, by class.
+        """
+        with self._cond:
+            return {
+                name: {
+                    "running": self._running[i],
+                    "waiting": self._waiting[i],
+                    "calls": self._calls[i],
+                    "waited": self._waited[i],
+                }
+                for i, name in enumerate(PRIORITIES)
+            }
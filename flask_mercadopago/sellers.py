@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Clients acting on behalf of the sellers of a marketplace.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from .options import FrozenRequestOptions
+from .resources import bind_accessors, resource_class, resource_path
+from .utils import LRUCache
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class SellerClient(object):
+    """Resources of the Mercadopago API acting on behalf of one seller.
+
+    The (frozen) request options and every resource object are created
+    once and reused by all the calls (and threads) for the seller. It has the same
+    accessors as the ``Mercadopago`` extension::
+
+        seller = mercadopago.for_seller(user_id)
+        seller.preference().create(preference_object)
+
+    Parameters
+    ----------
+    user_id : hashable
+        The Mercadopago user id of the seller.
+    access_token : ``str``
+        The access token of the seller.
+    http_client : ``mercadopago.http.http_client``
+        The transport shared by every seller.
+    hook : callable or ``None`` (optional)
+        Called with the name and each new resource object, returns the
+        object to use.
+    """
+
+    def __init__(self, user_id, access_token: str, http_client, hook=None):
+        self.user_id = user_id
+        self.access_token = access_token
+        self.http_client = http_client
+        self.hook = hook
+        self.request_options = FrozenRequestOptions(access_token=access_token)
+        self._resources = {}
+
+    def resource(self, name: str):
+        """Get the resource object with the given accessor name.
+
+        Parameters
+        ----------
+        name : ``str``
+            The name of the accessor, like ``"payment"``.
+
+        Return
+        ------
+        res : ``mercadopago.core.MPBase``
+            The resource object of the seller.
+        """
+        res = self._resources.get(name)
+        if res is None:
+            res = resource_class(name)(self.request_options, self.http_client)
+            if self.hook is not None:
+                res = self.hook(name, res)
+            res = self._resources.setdefault(name, res)
+        return res
+
+    def __repr__(self):
+        return f"<SellerClient user_id={self.user_id!r}>"
+
+
+def _make_seller_accessor(name):
+    """Create the accessor method of a resource for ``SellerClient``."""
+
+    def accessor(self):
+        """Get the resource of the seller (replaced below)."""
+        return self.resource(name)
+
+    accessor.__doc__ = f"The ``{resource_path(name)}`` resource of the seller."
+    return accessor
+
+
+bind_accessors(SellerClient, _make_seller_accessor)
+
+
+class SellerRegistry(object):
+    """Bounded registry of the ``SellerClient`` of each seller.
+
+    The least recently used clients are evicted when ``maxsize`` sellers
+    are registered.
+
+    Parameters
+    ----------
+    maxsize : ``int``
+        Maximum number of clients kept.
+    http_client : ``mercadopago.http.http_client``
+        The transport shared by every seller.
+    token_loader : callable or ``None`` (optional)
+        Called with the user id of a seller to get its access token.
+    hook : callable or ``None`` (optional)
+        The ``hook`` of the clients.
+    """
+
+    def __init__(
+        self, maxsize: int, http_client, token_loader=None, hook=None
+    ):
+        self.http_client = http_client
+        self.token_loader = token_loader
+        self.hook = hook
+        self._clients = LRUCache(maxsize)
+
+    def get(self, user_id, access_token: str = None) -> SellerClient:
+        """Get the client of a seller, creating it if needed.
+
+        Parameters
+        ----------
+        user_id : hashable
+            The Mercadopago user id of the seller.
+        access_token : ``str`` or ``None`` (optional)
+            The access token of the seller. When it differs from the token
+            of the registered client, the client is replaced. Defaults to
+            the token given by ``token_loader``.
+
+        Return
+        ------
+        client : ``SellerClient``
+            The client of the seller.
+        """
+        client = self._clients.get(user_id)
+        if client is not None and access_token in (None, client.access_token):
+            return client
+        if access_token is None and self.token_loader is not None:
+            access_token = self.token_loader(user_id)
+        if access_token is None:
+            raise ValueError(f"No access token for seller {user_id!r}")
+        client = SellerClient(
+            user_id, access_token, self.http_client, self.hook
+        )
+        self._clients.put(user_id, client)
+        return client
+
+    def forget(self, user_id):
+        """Remove the client of a seller, for example after a token refresh.
+
+        Parameters
+        ----------
+        user_id : hashable
+            The Mercadopago user id of the seller.
+        """
+        self._clients.pop(user_id)
+
+    def __len__(self):
+        return len(self._clients)
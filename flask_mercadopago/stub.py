@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Local server emulating the Mercadopago API, for offline tests and benchmarks.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Paths of the API answered by the stub, as used by the SDK resources.
+STUB_PATHS = re.compile(
+    r"^/(v1/(advanced_payments|card_tokens|chargebacks|customers"
+    r"|identification_types|payment_methods|payments)"
+    r"|checkout/preferences|merchant_orders|preapproval|preapproval_plan"
+    r"|users/me|oauth/token)(/|$)"
+)
+
+#: Paths answered with a list of objects.
+STUB_LIST_PATHS = re.compile(
+    r"^/v1/(identification_types|payment_methods|customers/[^/]+/cards"
+    r"|(advanced_)?payments/[^/]+/refunds)/?$"
+)
+
+#: A read-only call of each accessor of the extension, as the name of the
+#: method of the resource and its arguments.
+ACCESSOR_CALLS = {
+    "advanced_payment": ("get", (1,)),
+    "card": ("list_all", (1,)),
+    "card_token": ("get", ("1",)),
+    "chargeback": ("get", (1,)),
+    "customer": ("get", (1,)),
+    "disbursement_refund": ("list_all", (1,)),
+    "identification_type": ("list_all", ()),
+    "installments": ("get", ({"amount": 100, "bin": "450995"},)),
+    "merchant_order": ("get", (1,)),
+    "payment": ("get", (1,)),
+    "payment_methods": ("list_all", ()),
+    "plan": ("get", (1,)),
+    "preapproval": ("get", (1,)),
+    "preference": ("get", ("1",)),
+    "refund": ("list_all", (1,)),
+    "subscription": ("get", (1,)),
+    "user": ("get", ()),
+}
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class StubServer(object):
+    """Threaded HTTP server answering like the Mercadopago API.
+
+    Every endpoint called by the accessors of the extension and the OAuth
+    token endpoint are emulated: ``GET`` returns the object (or a page of
+    results for ``/search``), ``POST`` creates it with a new id, ``PUT``
+    echoes the changes and ``DELETE`` returns the removed object. Point an
+    application to it with::
+
+        stub = StubServer(latency=0.02).start()
+        app.config["BASE_URL"] = stub.url + "/v1"
+        app.config["TOKEN_ENDPOINT"] = stub.url + "/oauth/token"
+
+    Parameters
+    ----------
+    latency : ``float`` (optional)
+        Seconds waited before each answer. Defaults to 0.
+    error_rate : ``float`` (optional)
+        Fraction of the calls answered with ``error_status``. Defaults to 0.
+    error_status : ``int`` (optional)
+        Status of the failed calls. Defaults to 500.
+    payload_size : ``int`` (optional)
+        Bytes of padding added to each object. Defaults to 0.
+    search_size : ``int`` (optional)
+        Total of results of the ``/search`` endpoints. Defaults to 100.
+    seed : ``int`` or ``None`` (optional)
+        Seed of the errors, to make a run reproducible.
+    host : ``str`` (optional)
+        Address to listen on. Defaults to ``"127.0.0.1"``.
+    port : ``int`` (optional)
+        Port to listen on. Defaults to 0, a free port.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        payload_size: int = 0,
+        search_size: int = 100,
+        seed: int = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.payload_size = payload_size
+        self.search_size = search_size
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+        self._random = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """The origin of the server, like ``http://127.0.0.1:8080``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        """Serve the calls from a daemon thread.
+
+        Return
+        ------
+        stub : ``StubServer``
+            The started server.
+        """
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            args=(0.05,),
+            name="mercadopago-stub",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve the calls from the current thread, until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def answer(self, method: str, path: str, query: dict, body) -> tuple:
+        """Get the status and the JSON body answering a call.
+
+        Parameters
+        ----------
+        method : ``str``
+            The HTTP method.
+        path : ``str``
+            The path of the URL.
+        query : ``dict``
+            The query string parameters.
+        body : object
+            The decoded JSON body, or ``None``.
+
+        Return
+        ------
+        answer : ``tuple``
+            The status code and the object to encode.
+        """
+        with self._lock:
+            self.requests += 1
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if failed:
+            return self.error_status, {
+                "message": "stub error",
+                "error": "internal_error",
+                "status": self.error_status,
+                "cause": [],
+            }
+        if not STUB_PATHS.match(path):
+            return 404, {
+                "message": f"resource {path} not found",
+                "error": "not_found",
+                "status": 404,
+                "cause": [],
+            }
+        if path == "/oauth/token":
+            return 200, self._token()
+        segments = [s for s in path.split("/") if s]
+        body = body if isinstance(body, dict) else {}
+        if method == "POST":
+            return 201, self._object(next(self._ids), body)
+        if method in ("PUT", "DELETE"):
+            return 200, self._object(segments[-1], body)
+        if segments[-1] == "search":
+            return 200, self._search(query)
+        if STUB_LIST_PATHS.match(path):
+            return 200, [self._object(i, {}) for i in range(1, 4)]
+        return 200, self._object(segments[-1], {})
+
+    def _object(self, obj_id, fields: dict) -> dict:
+        obj = {
+            "id": int(obj_id) if str(obj_id).isdigit() else obj_id,
+            "status": "approved",
+            "date_created": "2022-07-01T00:00:00.000-04:00",
+            "date_last_updated": "2022-07-01T00:00:00.000-04:00",
+        }
+        obj.update(fields)
+        if self.payload_size:
+            obj["metadata"] = {"padding": "x" * self.payload_size}
+        return obj
+
+    def _search(self, query: dict) -> dict:
+        limit = int(query.get("limit", 30))
+        offset = int(query.get("offset", 0))
+        stop = min(offset + limit, self.search_size)
+        return {
+            "paging": {
+                "total": self.search_size,
+                "limit": limit,
+                "offset": offset,
+            },
+            "results": [
+                self._object(i, {}) for i in range(offset + 1, stop + 1)
+            ],
+        }
+
+    def _token(self) -> dict:
+        return {
+            "access_token": "APP_USR-stub-access-token",
+            "token_type": "bearer",
+            "expires_in": 15552000,
+            "scope": "offline_access read write",
+            "user_id": 1,
+            "refresh_token": "TG-stub-refresh-token",
+            "public_key": "APP_USR-stub-public-key",
+            "live_mode": False,
+        }
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Answer every request with ``StubServer.answer``."""
+
+            protocol_version = "HTTP/1.1"
+            # headers and body are written apart, don't wait for the ACK
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                """Count the new connection."""
+                with stub._lock:
+                    stub.connections += 1
+                super().setup()
+
+            def _answer(self):
+                url = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    body = None
+                if stub.latency:
+                    time.sleep(stub.latency)
+                status, obj = stub.answer(
+                    self.command, url.path, dict(parse_qsl(url.query)), body
+                )
+                data = json.dumps(obj).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _answer  # noqa: N815
+
+            def log_message(self, *args):
+                """Don't log the requests."""
+
+        return Handler
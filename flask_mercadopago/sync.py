@@ -0,0 +1,367 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+Incremental copy of the payments to a local store.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import datetime as dt
+import json
+import sqlite3
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Largest ``offset`` of a search accepted by the API.
+MAX_SEARCH_OFFSET = 10000
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def iter_search(resource, filters=None, page_size: int = 100):
+    """Iterate over the pages of a search, fetching them on demand.
+
+    Parameters
+    ----------
+    resource : ``mercadopago.core.MPBase``
+        A resource with a ``search`` method, like ``mercadopago.payment()``.
+    filters : ``dict`` or ``None`` (optional)
+        The filters of the search.
+    page_size : ``int`` (optional)
+        Results of each page. Defaults to 100.
+
+    Return
+    ------
+    pages : iterator of ``dict``
+        The responses, with the ``results`` and the ``paging``. It stops
+        after the last result or at the largest offset of the API.
+    """
+    filters = dict(filters or {})
+    offset = int(filters.pop("offset", 0))
+    while offset + page_size <= MAX_SEARCH_OFFSET:
+        res = resource.search(dict(filters, offset=offset, limit=page_size))
+        if res["status"] != 200:
+            raise RuntimeError(f"Mercadopago answered {res['status']}")
+        page = res["response"]
+        results = page.get("results") or []
+        if results:
+            yield page
+        offset += len(results)
+        total = page.get("paging", {}).get("total", 0)
+        if len(results) < page_size or offset >= total:
+            return
+
+
+def iter_range(
+    resource,
+    field: str,
+    begin: str,
+    end: str = "NOW",
+    filters=None,
+    page_size: int = 100,
+):
+    """Iterate over the pages of a search by date, past the largest offset.
+
+    The results are sorted by ``field`` in ascending order and, when a
+    search reaches the largest offset of the API, the next one starts from
+    the last date reached, skipping the results of that date already
+    given, so each result is given once.
+
+    Parameters
+    ----------
+    resource : ``mercadopago.core.MPBase``
+        A resource with a ``search`` method, like ``mercadopago.payment()``.
+    field : ``str``
+        The date searched, like ``"date_created"``.
+    begin : ``str``
+        The first date, like ``"NOW-1DAYS"`` or an ISO 8601 date.
+    end : ``str`` (optional)
+        The last date. Defaults to ``"NOW"``.
+    filters : ``dict`` or ``None`` (optional)
+        Extra filters of the search.
+    page_size : ``int`` (optional)
+        Results of each page. Defaults to 100.
+
+    Return
+    ------
+    pages : iterator of ``dict``
+        The responses, with the ``results`` and the ``paging``.
+    """
+    seen = set()
+    while True:
+        window = dict(
+            filters or {},
+            range=field,
+            begin_date=begin,
+            end_date=end,
+            sort=field,
+            criteria="asc",
+        )
+        fetched, total, last, boundary = 0, 0, None, set()
+        for page in iter_search(resource, window, page_size):
+            fetched += len(page["results"])
+            total = page.get("paging", {}).get("total", 0)
+            results = []
+            for result in page["results"]:
+                date = result.get(field)
+                if date == begin and result.get("id") in seen:
+                    continue
+                if date != last:
+                    last, boundary = date, set()
+                boundary.add(result.get("id"))
+                results.append(result)
+            if results:
+                yield dict(page, results=results)
+        if fetched >= total or last in (None, begin):
+            # done, or a single instant has more results than a search
+            return
+        begin, seen = last, boundary
+
+
+def shift_date(date: str, seconds: float) -> str:
+    """Move an ISO 8601 date of the API by some seconds.
+
+    Parameters
+    ----------
+    date : ``str``
+        A date like ``"2022-07-01T00:00:00.000-04:00"``. Other values (like
+        ``"NOW-1DAYS"``) are returned unchanged.
+    seconds : ``float``
+        The seconds added, negative to go back.
+
+    Return
+    ------
+    date : ``str``
+        The moved date, with milliseconds.
+    """
+    try:
+        value = dt.datetime.fromisoformat(date)
+    except ValueError:
+        return date
+    value += dt.timedelta(seconds=seconds)
+    return value.isoformat(timespec="milliseconds")
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class SQLiteSink(object):
+    """Store of the synced payments, in a SQLite database.
+
+    Each payment is kept as JSON in a row of ``table`` by its id, so a
+    payment fetched again replaces the old one. The checkpoints are kept in
+    the same database and written in the same transaction as the payments
+    of each page, so a crashed sync resumes after the last stored page.
+
+    Parameters
+    ----------
+    path : ``str``
+        The database file, or ``":memory:"``.
+    table : ``str`` (optional)
+        The table of the payments. Defaults to ``"payments"``.
+    """
+
+    def __init__(self, path: str, table: str = "payments"):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name {table!r}")
+        self.path = path
+        self.table = table
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "id INTEGER PRIMARY KEY, date_last_updated TEXT, "
+                "status TEXT, data TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "name TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    def write(self, records, name: str, checkpoint: str):
+        """Store records and the checkpoint reached, atomically.
+
+        Parameters
+        ----------
+        records : ``list`` of ``dict``
+            The payments.
+        name : ``str``
+            The name of the sync.
+        checkpoint : ``str``
+            The ``date_last_updated`` up to which the sync is complete.
+        """
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(id, date_last_updated, status, data) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        record["id"],
+                        record.get("date_last_updated"),
+                        record.get("status"),
+                        json.dumps(record, separators=(",", ":")),
+                    )
+                    for record in records
+                ],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (name, value) "
+                "VALUES (?, ?)",
+                (name, checkpoint),
+            )
+
+    def load_checkpoint(self, name: str):
+        """Get the checkpoint of a sync, or ``None`` if it never ran.
+
+        Parameters
+        ----------
+        name : ``str``
+            The name of the sync.
+
+        Return
+        ------
+        checkpoint : ``str`` or ``None``
+            The ``date_last_updated`` up to which the sync is complete.
+        """
+        row = self._conn.execute(
+            "SELECT value FROM checkpoints WHERE name = ?", (name,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def get(self, payment_id):
+        """Get a stored payment, or ``None``.
+
+        Parameters
+        ----------
+        payment_id : ``int``
+            The id of the payment.
+
+        Return
+        ------
+        payment : ``dict`` or ``None``
+            The payment, as it was last fetched.
+        """
+        row = self._conn.execute(
+            f"SELECT data FROM {self.table} WHERE id = ?", (payment_id,)
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def __len__(self):
+        return self._conn.execute(
+            f"SELECT COUNT(*) FROM {self.table}"
+        ).fetchone()[0]
+
+    def close(self):
+        """Close the database."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PaymentSync(object):
+    """Copy the payments updated since the last run to a sink.
+
+    The payments are searched by ``date_last_updated`` from the checkpoint
+    of the last run, in ascending order, and each page is written to the
+    sink with the date reached, so the daily run only fetches the payments
+    changed since the day before and a crashed run resumes where it
+    stopped::
+
+        with SQLiteSink("payments.db") as sink:
+            PaymentSync(mercadopago, sink).run()
+
+    Parameters
+    ----------
+    client : ``Mercadopago`` or ``SellerClient``
+        The object giving the ``payment`` resource.
+    sink : object
+        The store, with the ``write`` and ``load_checkpoint`` methods of
+        :class:`SQLiteSink`.
+    name : ``str`` (optional)
+        The name of the checkpoint. Defaults to ``"payments"``.
+    start : ``str`` (optional)
+        The first ``begin_date`` when there is no checkpoint. Defaults to
+        ``"NOW-30DAYS"``.
+    page_size : ``int`` (optional)
+        Payments of each search page. Defaults to 100.
+    overlap : ``float`` (optional)
+        Seconds before the checkpoint searched again, for the payments
+        updated in the same instant as the last one. Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        client,
+        sink,
+        name: str = "payments",
+        start: str = "NOW-30DAYS",
+        page_size: int = 100,
+        overlap: float = 1.0,
+    ):
+        self.client = client
+        self.sink = sink
+        self.name = name
+        self.start = start
+        self.page_size = page_size
+        self.overlap = overlap
+
+    def run(self) -> dict:
+        """Sync the payments updated since the checkpoint.
+
+        Return
+        ------
+        report : ``dict``
+            The ``pages`` and ``payments`` fetched, and the ``checkpoint``
+            reached.
+        """
+        checkpoint = self.sink.load_checkpoint(self.name)
+        begin = self.start if checkpoint is None else checkpoint
+        report = {"pages": 0, "payments": 0, "checkpoint": checkpoint}
+        resource = self.client.payment()
+        while True:
+            filters = {
+                "range": "date_last_updated",
+                "begin_date": shift_date(begin, -self.overlap),
+                "end_date": "NOW",
+                "sort": "date_last_updated",
+                "criteria": "asc",
+            }
+            fetched, total = 0, 0
+            for page in iter_search(resource, filters, self.page_size):
+                results = page["results"]
+                reached = results[-1].get("date_last_updated") or begin
+                self.sink.write(results, self.name, reached)
+                fetched += len(results)
+                total = page.get("paging", {}).get("total", 0)
+                report["pages"] += 1
+                report["payments"] += len(results)
+                report["checkpoint"] = reached
+            if fetched >= total or report["checkpoint"] in (None, begin):
+                # done, or a single instant has more payments than a search
+                return report
+            begin = report["checkpoint"]
@@ -0,0 +1,1090 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago
+
+HTTP transports implementing the ``mercadopago.http.HttpClient`` interface.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import ssl
+import threading
+import time
+import weakref
+from urllib.parse import urlencode, urlsplit
+
+from requests import exceptions as requests_exceptions
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+
+import urllib3
+from urllib3 import exceptions as urllib3_exceptions
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import Retry
+
+from .adaptive import resource_key
+
+#: The ``httpx`` module, imported by the first ``Http2Client`` since it is
+#: slow to import and only needed by it.
+httpx = None
+
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Origin of the API used by the Mercadopago SDK resources.
+API_ORIGIN = "https://api.mercadopago.com"
+
+#: Status codes retried by the Mercadopago SDK ``HttpClient``.
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+#: Methods that are safe to retry when an error status is returned.
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "PUT", "DELETE", "OPTIONS"])
+
+#: Fork-safe clients alive in this process, reset in the child after a fork.
+_FORK_SAFE_CLIENTS = weakref.WeakSet()
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _import_httpx():
+    """Import ``httpx`` on first use, or get ``None`` if not installed."""
+    global httpx
+    if httpx is None:
+        try:
+            import httpx as module
+        except ImportError:  # pragma: no cover
+            return None
+        httpx = module
+    return httpx
+
+
+def should_retry(method: str, status: int, attempt: int, retries) -> bool:
+    """Tell if a response must be retried, like the SDK ``HttpClient`` does.
+
+    Parameters
+    ----------
+    method : ``str``
+        The HTTP method of the request.
+    status : ``int``
+        The status code returned by the server.
+    attempt : ``int``
+        The number of retries already performed.
+    retries : ``int`` or ``None``
+        The maximum number of retries (``None`` means no retries).
+
+    Return
+    ------
+    retry : ``bool``
+        ``True`` if the request must be sent again.
+    """
+    return (
+        bool(retries)
+        and attempt < retries
+        and status in RETRY_STATUSES
+        and method.upper() in IDEMPOTENT_METHODS
+    )
+
+
+def retries_exhausted(method: str, status: int, retries) -> bool:
+    """Tell if the SDK ``HttpClient`` raises for a response not retried.
+
+    It raises ``requests.exceptions.RetryError`` when an idempotent call
+    keeps getting a retryable status after its retries, even 0. With
+    ``None`` retries the SDK retries forever; the transports of this
+    module return the response instead.
+
+    Parameters
+    ----------
+    method : ``str``
+        The HTTP method of the request.
+    status : ``int``
+        The status code of the last response.
+    retries : ``int`` or ``None``
+        The maximum number of retries.
+
+    Return
+    ------
+    exhausted : ``bool``
+        ``True`` if the call must raise.
+    """
+    return (
+        retries is not None
+        and status in RETRY_STATUSES
+        and method.upper() in IDEMPOTENT_METHODS
+    )
+
+
+def url_with_params(url: str, params: dict = None) -> str:
+    """Append the query string for ``params`` to ``url``.
+
+    Parameters
+    ----------
+    url : ``str``
+        The URL of the resource.
+    params : ``dict`` or ``None`` (optional)
+        The query parameters. ``None`` values are dropped, like
+        ``requests`` does.
+
+    Return
+    ------
+    url : ``str``
+        The URL with the encoded query string.
+    """
+    if not params:
+        return url
+    query = urlencode(
+        [(key, value) for key, value in params.items() if value is not None],
+        doseq=True,
+    )
+    if not query:
+        return url
+    separator = "&" if "?" in url else "?"
+    return f"{url}{separator}{query}"
+
+
+def as_requests_error(exc: Exception) -> Exception:
+    """Translate an ``urllib3`` or ``httpx`` error into the ``requests`` one.
+
+    The SDK ``HttpClient`` raises ``requests`` exceptions, so callers that
+    handle them keep working with the transports of this module.
+
+    Parameters
+    ----------
+    exc : ``Exception``
+        An exception raised by ``urllib3`` or ``httpx``.
+
+    Return
+    ------
+    error : ``requests.exceptions.RequestException``
+        The equivalent ``requests`` exception.
+    """
+    if httpx is not None and isinstance(exc, httpx.TransportError):
+        if isinstance(exc, httpx.ConnectTimeout):
+            return requests_exceptions.ConnectTimeout(exc)
+        if isinstance(exc, httpx.ReadTimeout):
+            return requests_exceptions.ReadTimeout(exc)
+        if isinstance(exc, httpx.TimeoutException):
+            return requests_exceptions.Timeout(exc)
+        if isinstance(exc.__context__, ssl.SSLError):
+            return requests_exceptions.SSLError(exc)
+        return requests_exceptions.ConnectionError(exc)
+    reason = getattr(exc, "reason", None) or exc
+    if isinstance(reason, urllib3_exceptions.ResponseError):
+        return requests_exceptions.RetryError(exc)
+    if isinstance(reason, urllib3_exceptions.ConnectTimeoutError):
+        return requests_exceptions.ConnectTimeout(exc)
+    if isinstance(reason, urllib3_exceptions.ReadTimeoutError):
+        return requests_exceptions.ReadTimeout(exc)
+    if isinstance(reason, urllib3_exceptions.SSLError):
+        return requests_exceptions.SSLError(exc)
+    return requests_exceptions.ConnectionError(exc)
+
+
+def _reset_after_fork():
+    """Drop the connections inherited by a child process."""
+    for client in list(_FORK_SAFE_CLIENTS):
+        client._after_fork()
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class DNSCache(object):
+    """Cache of host name resolutions with a time to live.
+
+    The pooled connections resolve their host through this cache, so a
+    host is resolved once per ``ttl`` instead of once per connection, and
+    the resolution can be done ahead of traffic with :meth:`prefetch`. When
+    a resolution expires and the resolver fails, the stale addresses keep
+    being used.
+
+    Parameters
+    ----------
+    ttl : ``float`` (optional)
+        Seconds a resolution is kept. Defaults to 300.0.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries = {}
+
+    def resolve(self, host: str, port: int = 443) -> list:
+        """Get the addresses of a host.
+
+        Parameters
+        ----------
+        host : ``str``
+            A host name or IP address.
+        port : ``int`` (optional)
+            The port to connect to. Defaults to 443.
+
+        Return
+        ------
+        addresses : ``list`` of ``str``
+            The IP addresses of the host, in the order given by the
+            resolver. Empty if the host can't be resolved.
+        """
+        entry = self._entries.get(host)
+        now = time.monotonic()
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        try:
+            infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        except OSError:
+            return [] if entry is None else entry[1]
+        addresses = []
+        for info in infos:
+            address = info[4][0]
+            if address not in addresses:
+                addresses.append(address)
+        self._entries[host] = (now + self.ttl, addresses)
+        return addresses
+
+    def prefetch(self, hosts) -> dict:
+        """Resolve the given hosts ahead of time.
+
+        Parameters
+        ----------
+        hosts : iterable of ``str``
+            The host names.
+
+        Return
+        ------
+        addresses : ``dict``
+            The addresses of each host.
+        """
+        return {host: self.resolve(host) for host in hosts}
+
+    def clear(self):
+        """Forget every resolution."""
+        self._entries.clear()
+
+
+class TLSSessionContext(ssl.SSLContext):
+    """``ssl.SSLContext`` resuming the last TLS session of each host.
+
+    New connections to a host present the session of the previous one, so
+    the server can skip the full handshake (TLS session resumption).
+    """
+
+    def __new__(cls, protocol=ssl.PROTOCOL_TLS_CLIENT, *args, **kwargs):
+        self = super().__new__(cls, protocol, *args, **kwargs)
+        self.sessions = {}
+        return self
+
+    def wrap_socket(self, sock, *args, **kwargs):
+        """Wrap a socket, resuming the session of its host if any."""
+        host = kwargs.get("server_hostname")
+        if kwargs.get("session") is None and host in self.sessions:
+            kwargs["session"] = self.sessions[host]
+        ssl_sock = super().wrap_socket(sock, *args, **kwargs)
+        self.save_session(ssl_sock)
+        return ssl_sock
+
+    def save_session(self, ssl_sock):
+        """Keep the session of a socket for the next connections."""
+        session = getattr(ssl_sock, "session", None)
+        if session is not None and ssl_sock.server_hostname:
+            self.sessions[ssl_sock.server_hostname] = session
+
+
+def make_tls_context() -> TLSSessionContext:
+    """Create a ``TLSSessionContext`` with the settings of ``urllib3``.
+
+    Return
+    ------
+    context : ``TLSSessionContext``
+        A context verifying certificates and host names, with TLS 1.2 or
+        newer.
+    """
+    context = TLSSessionContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.options |= ssl.OP_NO_COMPRESSION
+    return context
+
+
+def _pool_classes(resolver=None):
+    """Create connection pool classes for ``PooledHttpClient``.
+
+    The connections resolve their host through ``resolver`` (if any) and
+    keep the TLS session of their host for the next connections.
+    """
+
+    class ResolvingMixin(object):
+        """Connect to the addresses of the host cached by ``resolver``."""
+
+        def _new_conn(self):
+            if resolver is None:
+                return super()._new_conn()
+            host = self._dns_host
+            addresses = resolver.resolve(host, self.port) or [host]
+            error = None
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except urllib3_exceptions.NewConnectionError as exc:
+                    error = exc
+                finally:
+                    self._dns_host = host
+            raise error
+
+    class ResolvingHTTPConnection(ResolvingMixin, HTTPConnection):
+        """HTTP connection resolving its host through ``resolver``."""
+
+    class ResolvingHTTPSConnection(ResolvingMixin, HTTPSConnection):
+        """HTTPS connection resolving its host and keeping its session."""
+
+        def getresponse(self, *args, **kwargs):
+            """Get the response, then save the TLS session of the host."""
+            # TLS 1.3 session tickets arrive after the handshake.
+            response = super().getresponse(*args, **kwargs)
+            if isinstance(self.ssl_context, TLSSessionContext):
+                self.ssl_context.save_session(self.sock)
+            return response
+
+    class ResolvingHTTPConnectionPool(HTTPConnectionPool):
+        """Pool of ``ResolvingHTTPConnection``."""
+
+        ConnectionCls = ResolvingHTTPConnection
+
+    class ResolvingHTTPSConnectionPool(HTTPSConnectionPool):
+        """Pool of ``ResolvingHTTPSConnection``."""
+
+        ConnectionCls = ResolvingHTTPSConnection
+
+    return {
+        "http": ResolvingHTTPConnectionPool,
+        "https": ResolvingHTTPSConnectionPool,
+    }
+
+
+class BaseHttpClient(object):
+    """Base class for the transports of the ``HttpClient`` interface.
+
+    Subclasses implement :meth:`request`, and this class provides the
+    ``get``, ``post``, ``put`` and ``delete`` methods called by the
+    Mercadopago resources.
+    """
+
+    def request(self, method: str, url: str, maxretries=None, **kwargs):
+        """Makes a call to the API.
+
+        Parameters
+        ----------
+        method : ``str``
+            The HTTP method.
+        url : ``str``
+            The URL of the resource.
+        maxretries : ``int`` or ``None`` (optional)
+            How many times an idempotent call is retried when the server
+            answers with a retryable error status.
+        **kwargs
+            ``headers``, ``params``, ``data`` and ``timeout`` of the call.
+
+        Return
+        ------
+        response : ``dict``
+            A dict with the ``status`` code and the decoded JSON
+            ``response``.
+        """
+        raise NotImplementedError()
+
+    def get(self, url, headers, params=None, timeout=None, maxretries=None):
+        """Makes a GET request to the API."""
+        return self.request(
+            "GET",
+            url=url,
+            headers=headers,
+            params=params,
+            timeout=timeout,
+            maxretries=maxretries,
+        )
+
+    def post(
+        self,
+        url,
+        headers,
+        data=None,
+        params=None,
+        timeout=None,
+        maxretries=None,
+    ):
+        """Makes a POST request to the API."""
+        return self.request(
+            "POST",
+            url=url,
+            headers=headers,
+            data=data,
+            params=params,
+            timeout=timeout,
+            maxretries=maxretries,
+        )
+
+    def put(
+        self,
+        url,
+        headers,
+        data=None,
+        params=None,
+        timeout=None,
+        maxretries=None,
+    ):
+        """Makes a PUT request to the API."""
+        return self.request(
+            "PUT",
+            url=url,
+            headers=headers,
+            data=data,
+            params=params,
+            timeout=timeout,
+            maxretries=maxretries,
+        )
+
+    def delete(self, url, headers, params=None, timeout=None, maxretries=None):
+        """Makes a DELETE request to the API."""
+        return self.request(
+            "DELETE",
+            url=url,
+            headers=headers,
+            params=params,
+            timeout=timeout,
+            maxretries=maxretries,
+        )
+
+    def warmup(self, urls, connections: int = 1) -> int:
+        """Open connections to ``urls`` before the first call.
+
+        Parameters
+        ----------
+        urls : iterable of ``str``
+            URLs (only the origin is used) of the hosts to connect to.
+        connections : ``int`` (optional)
+            How many connections are opened to each host. Defaults to 1.
+
+        Return
+        ------
+        opened : ``int``
+            The number of connections ready in the pool.
+        """
+        return 0
+
+    def stats(self) -> dict:
+        """Get counters of the connections of the client.
+
+        Return
+        ------
+        stats : ``dict``
+            The counters, empty if the client doesn't keep any.
+        """
+        return {}
+
+    def close(self):
+        """Close every connection of the client."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RebasedHttpClient(BaseHttpClient):
+    """Send the calls of the SDK resources to another origin.
+
+    The SDK resources always call ``API_ORIGIN``; this client rewrites the
+    origin of their URLs, for example to reach a ``StubServer`` or a proxy.
+
+    Parameters
+    ----------
+    http_client : ``mercadopago.http.http_client``
+        The client making the calls.
+    origin : ``str``
+        The origin the calls are sent to, like ``"http://127.0.0.1:8080"``.
+    api_origin : ``str`` (optional)
+        The origin that is rewritten. Defaults to ``API_ORIGIN``.
+    """
+
+    def __init__(self, http_client, origin: str, api_origin: str = API_ORIGIN):
+        self.http_client = http_client
+        self.origin = origin.rstrip("/")
+        self.api_origin = api_origin
+
+    def rebase(self, url: str) -> str:
+        """Get the URL with the origin rewritten.
+
+        Parameters
+        ----------
+        url : ``str``
+            A URL.
+
+        Return
+        ------
+        url : ``str``
+            The URL on ``origin`` if it was on ``api_origin``, else ``url``.
+        """
+        if not url.startswith(self.api_origin):
+            return url
+        return self.origin + url[len(self.api_origin) :]  # noqa: E203
+
+    def request(self, method: str, url: str, maxretries=None, **kwargs):
+        """Makes a call to the API with the wrapped client."""
+        send = getattr(self.http_client, method.lower())
+        return send(url=self.rebase(url), maxretries=maxretries, **kwargs)
+
+    def warmup(self, urls, connections: int = 1) -> int:
+        """Open connections of the wrapped client to the rewritten ``urls``."""
+        warmup = getattr(self.http_client, "warmup", None)
+        if warmup is None:
+            return 0
+        return warmup([self.rebase(url) for url in urls], connections)
+
+    def stats(self) -> dict:
+        """Get the counters of the wrapped client."""
+        stats = getattr(self.http_client, "stats", None)
+        return {} if stats is None else stats()
+
+    def close(self):
+        """Close every connection of the wrapped client."""
+        close = getattr(self.http_client, "close", None)
+        if close is not None:
+            close()
+
+
+class AdaptiveHttpClient(BaseHttpClient):
+    """Limit the calls in flight of each resource to adaptive limits.
+
+    The calls to each resource (see
+    :func:`flask_mercadopago.adaptive.resource_key`) go through an
+    ``AdaptiveLimiter``, which lowers its limit when the API slows down or
+    fails and raises it again while it keeps up.
+
+    Parameters
+    ----------
+    http_client : ``mercadopago.http.http_client``
+        The client making the calls.
+    limiter : ``AdaptiveLimiter``
+        The limits of the resources.
+    """
+
+    def __init__(self, http_client, limiter):
+        self.http_client = http_client
+        self.limiter = limiter
+
+    def request(self, method: str, url: str, maxretries=None, **kwargs):
+        """Makes a call to the API with the wrapped client, within limits."""
+        send = getattr(self.http_client, method.lower())
+        return self.limiter.call(
+            resource_key(url),
+            lambda: send(url=url, maxretries=maxretries, **kwargs),
+        )
+
+    def warmup(self, urls, connections: int = 1) -> int:
+        """Open connections of the wrapped client to ``urls``."""
+        warmup = getattr(self.http_client, "warmup", None)
+        return 0 if warmup is None else warmup(urls, connections)
+
+    def stats(self) -> dict:
+        """Get the counters of the wrapped client and the limits."""
+        stats = getattr(self.http_client, "stats", None)
+        stats = {} if stats is None else dict(stats())
+        stats["limits"] = self.limiter.stats()
+        return stats
+
+    def close(self):
+        """Close every connection of the wrapped client."""
+        close = getattr(self.http_client, "close", None)
+        if close is not None:
+            close()
+
+
+class ScheduledHttpClient(BaseHttpClient):
+    """Make the calls when an ``OutboundScheduler`` lets them start.
+
+    Each call waits for a turn of the priority class of its context (see
+    :func:`flask_mercadopago.scheduler.priority`), so the batch jobs never
+    take the connections or the rate budget the interactive calls wait for.
+
+    Parameters
+    ----------
+    http_client : ``mercadopago.http.http_client``
+        The client making the calls.
+    scheduler : ``OutboundScheduler``
+        The scheduler admitting them.
+    """
+
+    def __init__(self, http_client, scheduler):
+        self.http_client = http_client
+        self.scheduler = scheduler
+
+    def request(self, method: str, url: str, maxretries=None, **kwargs):
+        """Makes a call to the API with the wrapped client, in its turn."""
+        send = getattr(self.http_client, method.lower())
+        with self.scheduler.slot():
+            return send(url=url, maxretries=maxretries, **kwargs)
+
+    def warmup(self, urls, connections: int = 1) -> int:
+        """Open connections of the wrapped client to ``urls``."""
+        warmup = getattr(self.http_client, "warmup", None)
+        return 0 if warmup is None else warmup(urls, connections)
+
+    def stats(self) -> dict:
+        """Get the counters of the wrapped client and of the scheduler."""
+        stats = getattr(self.http_client, "stats", None)
+        stats = {} if stats is None else dict(stats())
+        stats["scheduler"] = self.scheduler.stats()
+        return stats
+
+    def close(self):
+        """Close every connection of the wrapped client."""
+        close = getattr(self.http_client, "close", None)
+        if close is not None:
+            close()
+
+
+class ForkSafeHttpClient(BaseHttpClient):
+    """Transport whose connections are built lazily in each process.
+
+    The connections of a client created before a fork (for example in the
+    ``init_app`` of a ``gunicorn --preload`` application) are never shared
+    with the workers: the child drops them right after ``os.fork`` and, as
+    a fallback, the pool is rebuilt whenever the PID of the process changes.
+    Subclasses implement :meth:`_build` and :meth:`_dispose`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._state = None
+        _FORK_SAFE_CLIENTS.add(self)
+
+    def _build(self):
+        """Create the connection state of the current process."""
+        raise NotImplementedError()
+
+    def _dispose(self, state):
+        """Release the connection state created by :meth:`_build`."""
+
+    def _get_state(self):
+        """Return the connection state, rebuilding it after a fork."""
+        state, pid = self._state, os.getpid()
+        if state is not None and self._pid == pid:
+            return state
+        with self._lock:
+            if self._state is None or self._pid != pid:
+                self._state = self._build()
+                self._pid = pid
+            return self._state
+
+    def _after_fork(self):
+        """Forget the state inherited from the parent process.
+
+        The inherited sockets are not closed: they are still used by the
+        parent process.
+        """
+        self._lock = threading.Lock()
+        self._state = None
+        self._pid = None
+
+    def close(self):
+        """Close every connection of the client."""
+        with self._lock:
+            state, self._state = self._state, None
+            if state is not None and self._pid == os.getpid():
+                self._dispose(state)
+            self._pid = None
+
+
+class PooledHttpClient(ForkSafeHttpClient):
+    """Connection pooled implementation of the ``HttpClient`` interface.
+
+    The SDK ``HttpClient`` opens a new ``requests.Session`` (and therefore a
+    new connection and TLS handshake) on every call. This client keeps one
+    ``urllib3.PoolManager`` per process, so persistent connections are
+    reused by every call of every thread::
+
+        from flask_mercadopago import PooledHttpClient
+        http_client = PooledHttpClient(maxsize=20)
+        mercadopago.payment(http_client=http_client).get(payment_id)
+
+    Parameters
+    ----------
+    num_pools : ``int`` (optional)
+        Number of hosts whose connections are kept. Defaults to 10.
+    maxsize : ``int`` (optional)
+        Connections kept open to each host. Defaults to 10.
+    block : ``bool`` (optional)
+        Wait for a free connection instead of opening a throwaway one when
+        all of them are in use. Defaults to ``False``.
+    resolver : ``DNSCache`` or ``None`` (optional)
+        Cache used to resolve the host of each new connection. Defaults to
+        ``None``, a resolution per connection.
+    tls_sessions : ``bool`` (optional)
+        Resume the TLS session of the previous connection to a host.
+        Defaults to ``True``.
+    **kwargs
+        Extra keyword arguments passed to ``urllib3.PoolManager``. The
+        certificates are verified with the ``certifi`` bundle used by the
+        SDK unless ``ca_certs`` is given.
+    """
+
+    def __init__(
+        self,
+        num_pools: int = 10,
+        maxsize: int = 10,
+        block: bool = False,
+        resolver: DNSCache = None,
+        tls_sessions: bool = True,
+        **kwargs,
+    ):
+        super().__init__()
+        self.num_pools = num_pools
+        self.maxsize = maxsize
+        self.block = block
+        self.resolver = resolver
+        kwargs.setdefault("ca_certs", DEFAULT_CA_BUNDLE_PATH)
+        if tls_sessions:
+            kwargs.setdefault("ssl_context", make_tls_context())
+        self._pool_kwargs = kwargs
+
+    def _build(self):
+        """Create the ``urllib3.PoolManager`` of the current process."""
+        manager = urllib3.PoolManager(
+            num_pools=self.num_pools,
+            maxsize=self.maxsize,
+            block=self.block,
+            **self._pool_kwargs,
+        )
+        manager.pool_classes_by_scheme = _pool_classes(self.resolver)
+        return manager
+
+    def _dispose(self, state):
+        """Close the connections of the ``urllib3.PoolManager``."""
+        state.clear()
+
+    @property
+    def pool(self) -> urllib3.PoolManager:
+        """``urllib3.PoolManager`` of the current process."""
+        return self._get_state()
+
+    def request(self, method: str, url: str, maxretries=None, **kwargs):
+        """Makes a call to the API.
+
+        Parameters
+        ----------
+        method : ``str``
+            The HTTP method.
+        url : ``str``
+            The URL of the resource.
+        maxretries : ``int`` or ``None`` (optional)
+            How many times an idempotent call is retried when the server
+            answers with a retryable error status. Like the SDK
+            ``HttpClient``, ``requests.exceptions.RetryError`` is raised
+            when the status is still retryable after them (see
+            :func:`retries_exhausted`).
+        **kwargs
+            ``headers``, ``params``, ``data`` and ``timeout`` of the call.
+
+        Return
+        ------
+        response : ``dict``
+            A dict with the ``status`` code and the decoded JSON
+            ``response``.
+        """
+        retries = Retry(
+            total=maxretries or 0,
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=maxretries is not None,
+        )
+        try:
+            api_result = self.pool.urlopen(
+                method,
+                url_with_params(url, kwargs.get("params")),
+                body=kwargs.get("data"),
+                headers=kwargs.get("headers"),
+                timeout=kwargs.get("timeout"),
+                retries=retries,
+                redirect=False,
+            )
+        except urllib3_exceptions.HTTPError as exc:
+            raise as_requests_error(exc) from exc
+        response = {
+            "status": api_result.status,
+            "response": (
+                json.loads(api_result.data) if api_result.data else None
+            ),
+        }
+        return response
+
+    def warmup(self, urls, connections: int = 1) -> int:
+        """Open connections to ``urls`` before the first call.
+
+        Failures are logged and never raised, so a warm-up can't prevent a
+        worker from starting.
+
+        Parameters
+        ----------
+        urls : iterable of ``str``
+            URLs (only the origin is used) of the hosts to connect to.
+        connections : ``int`` (optional)
+            How many connections are opened to each host, up to ``maxsize``.
+            Defaults to 1.
+
+        Return
+        ------
+        opened : ``int``
+            The number of connections ready in the pool.
+        """
+        opened = 0
+        for url in urls:
+            host_pool = self.pool.connection_from_url(url)
+            conns = []
+            try:
+                for _ in range(min(connections, self.maxsize)):
+                    conn = host_pool._get_conn()
+                    conns.append(conn)
+                    if getattr(conn, "sock", None) is None:
+                        conn.connect()
+                    opened += 1
+            except Exception as exc:  # noqa
+                logger.warning(
+                    "Mercadopago warm-up of %s failed: %s", url, exc
+                )
+            finally:
+                for conn in conns:
+                    host_pool._put_conn(conn)
+        return opened
+
+    def stats(self) -> dict:
+        """Get counters of the connection pools of the current process.
+
+        Return
+        ------
+        stats : ``dict``
+            The number of ``hosts`` with a pool, and the ``connections``
+            opened, the ``requests`` sent and the ``idle`` connections of
+            all of them.
+        """
+        stats = {"hosts": 0, "connections": 0, "requests": 0, "idle": 0}
+        manager = self._state
+        if manager is None or self._pid != os.getpid():
+            return stats
+        for key in manager.pools.keys():
+            host_pool = manager.pools.get(key)
+            if host_pool is None:
+                continue
+            stats["hosts"] += 1
+            stats["connections"] += host_pool.num_connections
+            stats["requests"] += host_pool.num_requests
+            queue = host_pool.pool
+            if queue is not None:
+                # the free slots of the queue are filled with None
+                with queue.mutex:
+                    stats["idle"] += sum(c is not None for c in queue.queue)
+        return stats
+
+
+class Http2Client(ForkSafeHttpClient):
+    """HTTP/2 implementation of the ``HttpClient`` interface.
+
+    Every concurrent call is multiplexed as a stream over a small set of
+    persistent connections, instead of needing one HTTP/1.1 socket per
+    in-flight request. The connections are driven by an ``httpx.AsyncClient``
+    running in a private event loop thread, so the client can be shared by
+    every thread of the application. It requires the optional
+    ``httpx[http2]`` dependency (``pip install Flask-Mercadopago[http2]``)::
+
+        from flask_mercadopago import Http2Client
+        http_client = Http2Client()
+        mercadopago.payment(http_client=http_client).get(payment_id)
+
+    Parameters
+    ----------
+    max_connections : ``int`` (optional)
+        Maximum number of connections opened to each host. Defaults to 4.
+    keepalive_expiry : ``float`` (optional)
+        Seconds an idle connection is kept open. Defaults to 30.0.
+    http1 : ``bool`` (optional)
+        Allow to fall back to HTTP/1.1 when the server does not negotiate
+        HTTP/2 through ALPN. With ``False`` the client talks HTTP/2 with
+        prior knowledge, which is needed for cleartext (``http://``)
+        servers. Defaults to ``True``.
+    **kwargs
+        Extra keyword arguments passed to ``httpx.AsyncClient``.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 4,
+        keepalive_expiry: float = 30.0,
+        http1: bool = True,
+        **kwargs,
+    ):
+        if _import_httpx() is None:  # pragma: no cover
+            raise RuntimeError(
+                "Http2Client requires 'httpx[http2]', install it with "
+                "'pip install Flask-Mercadopago[http2]'"
+            )
+        super().__init__()
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http1 = http1
+        self._client_kwargs = kwargs
+
+    def _build(self):
+        """Start the event loop thread and its ``httpx.AsyncClient``."""
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        client = httpx.AsyncClient(
+            http1=self.http1, http2=True, limits=limits, **self._client_kwargs
+        )
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=loop.run_forever, name="mercadopago-http2", daemon=True
+        )
+        thread.start()
+        return client, loop, thread
+
+    def _dispose(self, state):
+        """Close the client and stop its event loop thread."""
+        client, loop, thread = state
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def _run(self, factory):
+        """Run the coroutine made by ``factory(client)`` in the event loop.
+
+        ``httpx`` transport errors are raised as the ``requests`` ones.
+        """
+        client, loop, _ = self._get_state()
+        future = asyncio.run_coroutine_threadsafe(factory(client), loop)
+        try:
+            return future.result()
+        except httpx.TransportError as exc:
+            raise as_requests_error(exc) from exc
+
+    def _send(self, method, url, **options):
+        """Send one request through the event loop of the client."""
+        return self._run(lambda client: client.request(method, url, **options))
+
+    def request(self, method: str, url: str, maxretries=None, **kwargs):
+        """Makes a call to the API.
+
+        Parameters
+        ----------
+        method : ``str``
+            The HTTP method.
+        url : ``str``
+            The URL of the resource.
+        maxretries : ``int`` or ``None`` (optional)
+            How many times an idempotent call is retried when the server
+            answers with a retryable error status. Like the SDK
+            ``HttpClient``, ``requests.exceptions.RetryError`` is raised
+            when the status is still retryable after them (see
+            :func:`retries_exhausted`).
+        **kwargs
+            ``headers``, ``params``, ``data`` and ``timeout`` of the call.
+
+        Return
+        ------
+        response : ``dict``
+            A dict with the ``status`` code and the decoded JSON
+            ``response``.
+        """
+        timeout = kwargs.pop("timeout", None)
+        options = {
+            "headers": kwargs.pop("headers", None),
+            "params": kwargs.pop("params", None),
+            "content": kwargs.pop("data", None),
+        }
+        if timeout is not None:
+            options["timeout"] = timeout
+
+        attempt = 0
+        while True:
+            api_result = self._send(method, url, **options)
+            if not should_retry(
+                method, api_result.status_code, attempt, maxretries
+            ):
+                break
+            attempt += 1
+        if retries_exhausted(method, api_result.status_code, maxretries):
+            raise requests_exceptions.RetryError(
+                f"Too many {api_result.status_code} error responses"
+            )
+
+        response = {
+            "status": api_result.status_code,
+            "response": api_result.json() if api_result.content else None,
+        }
+        return response
+
+    def warmup(self, urls, connections: int = 1) -> int:
+        """Open a multiplexed connection to each of ``urls``.
+
+        A ``HEAD`` request is sent to the origin of each URL, so its
+        connection (TCP, TLS and the negotiated protocol) is left in the
+        pool of the client. A single HTTP/2 connection serves every
+        concurrent call, so ``connections`` is ignored. Failures are logged
+        and never raised.
+
+        Parameters
+        ----------
+        urls : iterable of ``str``
+            URLs (only the origin is used) of the hosts to connect to.
+        connections : ``int`` (optional)
+            Ignored.
+
+        Return
+        ------
+        opened : ``int``
+            The number of hosts connected.
+        """
+        opened = 0
+        for url in urls:
+            parts = urlsplit(url)
+            try:
+                self._send("HEAD", f"{parts.scheme}://{parts.netloc}/")
+                opened += 1
+            except Exception as exc:  # noqa
+                logger.warning(
+                    "Mercadopago warm-up of %s failed: %s", url, exc
+                )
+        return opened
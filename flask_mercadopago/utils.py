@@ -17,6 +17,16 @@
 Implementation of Mercadopago OAuth in Flask.
 """
 
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
 # =============================================================================
 # FUNCTIONS
 # =============================================================================
@@ -67,3 +77,133 @@ def get_headers(access_token: str) -> dict:
         "Content-Type": "application/json",
     }
     return headers
+
+
+def get_origin(url: str) -> str:
+    """Get the origin (scheme and host) of an URL.
+
+    Parameters
+    ----------
+    url : str
+        An URL, like the ``BASE_URL`` config key.
+
+    Return
+    ------
+    origin : str
+        The origin of the URL, for example ``"https://api.mercadopago.com"``.
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_sri(data: bytes, algorithm: str = "sha384") -> str:
+    """Get the subresource integrity of some content.
+
+    Parameters
+    ----------
+    data : bytes
+        The content of the resource.
+    algorithm : str (optional)
+        ``"sha256"``, ``"sha384"`` or ``"sha512"``. Defaults to
+        ``"sha384"``.
+
+    Return
+    ------
+    sri : str
+        The value of the ``integrity`` attribute, for example
+        ``"sha384-oqVuAfXRKap7fdgcCY5uykM6+R9GqQ8K/uxy9rx7HNQlGYl1kPzQho1wx4JwY8wC"``.
+    """
+    digest = hashlib.new(algorithm, data).digest()
+    return f"{algorithm}-{base64.b64encode(digest).decode()}"
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class LRUCache(object):
+    """Thread-safe mapping bounded by size, evicting the least recently used.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Get the value of a key, marking it as recently used.
+
+        Parameters
+        ----------
+        key : hashable
+            The key.
+        default : object (optional)
+            Returned when the key is missing. Defaults to None.
+
+        Return
+        ------
+        value : object
+            The value of the key or ``default``.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Set the value of a key, evicting the least recently used one.
+
+        Parameters
+        ----------
+        key : hashable
+            The key.
+        value : object
+            The value.
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Remove a key.
+
+        Parameters
+        ----------
+        key : hashable
+            The key.
+        default : object (optional)
+            Returned when the key is missing. Defaults to None.
+
+        Return
+        ------
+        value : object
+            The removed value or ``default``.
+        """
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        """Remove every key."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
@@ -38,6 +38,12 @@ REQUIREMENTS = [
     "mercadopago>=2.2.0",
 ]
 
+EXTRAS_REQUIRE = {
+    "arrow": ["pyarrow>=8.0.0"],
+    "http2": ["httpx[http2]>=0.23.0"],
+    "reconcile": ["numpy>=1.21.0"],
+}
+
 with open(PATH / "flask_mercadopago" / "__init__.py") as fp:
     for line in fp.readlines():
         if line.startswith("__version__ = "):
@@ -73,6 +79,7 @@ setup(
     platforms="any",
     license="The MIT License",
     install_requires=REQUIREMENTS,
+    extras_require=EXTRAS_REQUIRE,
     keywords=["API", "Flask", "Mercado Pago"],
     project_urls={
         "Source": source,
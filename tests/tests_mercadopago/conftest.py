@@ -21,11 +21,22 @@ Implementation of Mercadopago API OAuth in Flask.
 # TESTS
 # =============================================================================
 
+import os
+import re
+
 from flask_mercadopago import Mercadopago
 
 import pytest as pt
 
+#: Directory of the cassettes of the tests calling the API, recorded on the
+#: first run and replayed on the next ones.
+CASSETTES = os.environ.get("MERCADOPAGO_CASSETTES")
+
 
 @pt.fixture(autouse=True)
-def mercadopago(app):
+def mercadopago(app, request):
+    if CASSETTES:
+        name = re.sub(r"[^\w.-]+", "-", request.node.nodeid)
+        path = os.path.join(CASSETTES, f"{name}.jsonl")
+        app.config["MERCADOPAGO_CASSETTE"] = path
     yield Mercadopago(app)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import threading
+import time
+
+from flask import Flask
+
+from flask_mercadopago import (
+    AdaptiveHttpClient,
+    AdaptiveLimiter,
+    Mercadopago,
+    StubServer,
+    priority,
+    resource_key,
+)
+
+import pytest
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://api.mercadopago.com/v1/payments/123", "/v1/payments"),
+        (
+            "https://api.mercadopago.com/v1/payments/search?x=1",
+            "/v1/payments/search",
+        ),
+        ("https://api.mercadopago.com/merchant_orders/9", "/merchant_orders"),
+        (
+            "https://api.mercadopago.com/checkout/preferences/1-ab",
+            "/checkout/preferences",
+        ),
+        ("https://api.mercadopago.com/v1/customers/1/cards", "/v1/customers"),
+        ("https://api.mercadopago.com/", "/"),
+    ],
+)
+def test_resource_key(url, expected):
+    assert resource_key(url) == expected
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(min_limit=0)
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(min_limit=5, max_limit=4)
+
+
+def test_increase_when_used():
+    limiter = AdaptiveLimiter(initial=2, max_limit=4)
+    for _ in range(10):
+        limiter.acquire("/v1/payments")
+        limiter.release("/v1/payments", 0.01)
+    assert limiter.limit("/v1/payments") == 2
+    for _ in range(20):
+        limiter.acquire("/v1/payments")
+        limiter.acquire("/v1/payments")
+        limiter.release("/v1/payments", 0.01)
+        limiter.release("/v1/payments", 0.01)
+    assert limiter.limit("/v1/payments") == 4
+
+
+def test_decrease_once_per_round_trip():
+    limiter = AdaptiveLimiter(initial=10)
+    for _ in range(3):
+        limiter.acquire("/v1/payments")
+        limiter.release("/v1/payments", 0.05, overloaded=True)
+    assert limiter.limit("/v1/payments") == 7
+    time.sleep(0.06)
+    limiter.acquire("/v1/payments")
+    limiter.release("/v1/payments", 0.05, overloaded=True)
+    assert limiter.limit("/v1/payments") == 4
+    assert limiter.stats()["/v1/payments"]["drops"] == 2
+
+
+def test_decrease_when_slow():
+    limiter = AdaptiveLimiter(initial=10, tolerance=2.0)
+    limiter.acquire("/v1/payments")
+    limiter.release("/v1/payments", 0.001)
+    limiter.acquire("/v1/payments")
+    limiter.release("/v1/payments", 0.0015)
+    assert limiter.limit("/v1/payments") == 10
+    limiter.acquire("/v1/payments")
+    limiter.release("/v1/payments", 0.01)
+    assert limiter.limit("/v1/payments") == 7
+    assert limiter.limit("/v1/preapproval") == 10
+
+
+def test_min_limit():
+    limiter = AdaptiveLimiter(initial=2, min_limit=1)
+    for _ in range(5):
+        limiter.acquire("/v1/payments")
+        limiter.release("/v1/payments", 0.0, overloaded=True)
+    assert limiter.limit("/v1/payments") == 1
+
+
+def test_wait_for_room():
+    limiter = AdaptiveLimiter(initial=1)
+    limiter.acquire("/v1/payments")
+    with pytest.raises(TimeoutError):
+        limiter.acquire("/v1/payments", timeout=0.05)
+    limiter.acquire("/v1/customers", timeout=0.05)
+    waiter = threading.Thread(target=limiter.acquire, args=("/v1/payments",))
+    waiter.start()
+    time.sleep(0.02)
+    assert limiter.stats()["/v1/payments"]["waiting"] == 1
+    limiter.release("/v1/payments", 0.0)
+    waiter.join()
+    assert limiter.stats()["/v1/payments"]["inflight"] == 1
+
+
+def test_interactive_first():
+    limiter = AdaptiveLimiter(initial=1)
+    limiter.acquire("/v1/payments")
+    order = []
+
+    def call(name):
+        with priority(name):
+            limiter.acquire("/v1/payments")
+        order.append(name)
+        limiter.release("/v1/payments", 0.0)
+
+    batch = threading.Thread(target=call, args=("batch",))
+    batch.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=call, args=("interactive",))
+    interactive.start()
+    time.sleep(0.02)
+    limiter.release("/v1/payments", 0.0)
+    batch.join()
+    interactive.join()
+    assert order == ["interactive", "batch"]
+
+
+def test_call():
+    limiter = AdaptiveLimiter(initial=10)
+
+    def fail():
+        raise ConnectionError("boom")
+
+    with pytest.raises(ConnectionError):
+        limiter.call("/v1/payments", fail)
+    assert limiter.limit("/v1/payments") == 7
+    time.sleep(0.01)
+    result = limiter.call("/v1/payments", lambda: {"status": 503})
+    assert result == {"status": 503}
+    stats = limiter.stats()["/v1/payments"]
+    assert stats["limit"] == 4
+    assert stats["calls"] == 2
+    assert stats["inflight"] == 0
+
+
+def test_adaptive_transport():
+    with StubServer() as stub:
+        app = Flask(__name__)
+        app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+        app.config["BASE_URL"] = stub.url + "/v1"
+        app.config["MERCADOPAGO_ADAPTIVE_LIMITS"] = True
+        mercadopago = Mercadopago(app)
+        with app.app_context():
+            assert isinstance(mercadopago.transport, AdaptiveHttpClient)
+            assert mercadopago.payment().get(1)["status"] == 200
+            assert mercadopago.payment().get(2)["status"] == 200
+            limits = mercadopago.stats()["transport"]["limits"]
+        assert stub.requests == 2
+        assert limits["/v1/payments"]["calls"] == 2
+        assert limits["/v1/payments"]["inflight"] == 0
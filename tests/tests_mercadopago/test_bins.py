@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from flask_mercadopago import BinIndex, bin_ranges, expand_pattern
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+MASTER = "^(5[1-5]|2(2(2[1-9]|[3-9])|[3-6]|7([0-1]|20)))"
+
+
+def method(method_id, pattern, exclusion=None, status="active"):
+    return {
+        "id": method_id,
+        "status": status,
+        "payment_type_id": "credit_card",
+        "settings": [
+            {
+                "bin": {
+                    "pattern": pattern,
+                    "exclusion_pattern": exclusion,
+                    "installments_pattern": pattern,
+                },
+                "card_number": {"length": 16, "validation": "standard"},
+            }
+        ],
+    }
+
+
+METHODS = [
+    method("visa", "^4", "^(400163|40117[8-9]|(45763[1-2])|400276)"),
+    method("debvisa", "^(400276|400615)"),
+    method("master", MASTER, "^(536105)"),
+    method("amex", "^((34)|(37))"),
+    method("old", "^6", status="deactive"),
+    method("cabal", "^60[0-9]{4}"),
+]
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_expand_pattern():
+    assert expand_pattern("^((34)|(37))") == ["34", "37"]
+    assert expand_pattern("^(?:4|5[0-2])") == ["4", "50", "51", "52"]
+    assert expand_pattern(MASTER) == [
+        "2221",
+        "2222",
+        "2223",
+        "2224",
+        "2225",
+        "2226",
+        "2227",
+        "2228",
+        "2229",
+        "223",
+        "224",
+        "225",
+        "226",
+        "227",
+        "228",
+        "229",
+        "23",
+        "24",
+        "25",
+        "26",
+        "270",
+        "271",
+        "2720",
+        "51",
+        "52",
+        "53",
+        "54",
+        "55",
+    ]
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["4", "^4{2}", "^(4", "^4)", "^[0-9", "^[9-0]", "^4$", "^[0-9]" * 5],
+)
+def test_expand_pattern_unsupported(pattern):
+    with pytest.raises(ValueError):
+        expand_pattern(pattern)
+
+
+def test_bin_ranges():
+    ranges = bin_ranges(METHODS[0]["settings"][0])
+    assert ranges == [
+        (400000, 400163),
+        (400164, 400276),
+        (400277, 401178),
+        (401180, 457631),
+        (457633, 500000),
+    ]
+    assert bin_ranges({"bin": {"pattern": "^4"}}, digits=2) == [(40, 50)]
+    assert bin_ranges({"bin": {"pattern": "^4567890"}}) == [(456789, 456790)]
+    assert bin_ranges({"bin": {"pattern": None}}) == []
+
+
+@pytest.mark.parametrize(
+    "bin_number, expected",
+    [
+        ("450995", ["visa"]),
+        ("4509953566233704", ["visa"]),
+        (401179, []),
+        ("400276", ["debvisa"]),
+        ("400615", ["visa", "debvisa"]),
+        ("222100", ["master"]),
+        ("272099", ["master"]),
+        ("272100", []),
+        ("536105", []),
+        ("371180", ["amex"]),
+        ("601234", ["cabal"]),
+        ("650000", []),
+        ("000000", []),
+        ("999999", []),
+    ],
+)
+def test_resolve(bin_number, expected):
+    index = BinIndex(METHODS)
+    assert [m["id"] for m in index.resolve(bin_number)] == expected
+
+
+@pytest.mark.parametrize("bin_number", ["4509", "45O995", ""])
+def test_resolve_invalid(bin_number):
+    with pytest.raises(ValueError):
+        BinIndex(METHODS).resolve(bin_number)
+
+
+def test_rebuild_reuses_the_patterns():
+    index = BinIndex(METHODS)
+    assert index.expanded == 5
+    methods = METHODS[:3] + [method("amex", "^3[47]"), method("elo", "^636")]
+    rebuilt = BinIndex(methods, previous=index)
+    assert rebuilt.expanded == 2
+    assert [m["id"] for m in rebuilt.resolve("636297")] == ["elo"]
+    assert [m["id"] for m in rebuilt.resolve("450995")] == ["visa"]
+    assert rebuilt.resolve("601234") == []
+
+
+def test_fallback_keeps_the_catalog_order():
+    methods = [method("cabal", "^60[0-9]{4}"), method("discover", "^60")]
+    index = BinIndex(methods)
+    assert [m["id"] for m in index.resolve("601234")] == ["cabal", "discover"]
+
+
+def test_invalid_pattern_never_matches():
+    index = BinIndex([method("bad", "^4(")])
+    assert index.resolve("450995") == []
+
+
+@pytest.mark.usefixtures("client")
+def test_resolve_bin(mercadopago):
+    catalogs = mercadopago._get_state().catalogs
+    catalogs.put("payment_methods", METHODS)
+    assert mercadopago.resolve_bin("450995")[0]["id"] == "visa"
+    index = mercadopago._get_state().bin_index
+    assert mercadopago.resolve_bin("371180")[0]["id"] == "amex"
+    assert mercadopago._get_state().bin_index is index
+    catalogs.put("payment_methods", [method("elo", "^((34)|(37))")])
+    assert mercadopago.resolve_bin("371180")[0]["id"] == "elo"
+    assert mercadopago._get_state().bin_index.expanded == 0
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import threading
+
+from flask import Flask
+
+from flask_mercadopago import (
+    Bulkhead,
+    BulkheadFull,
+    BulkheadHttpClient,
+    DEFAULT_BULKHEADS,
+    Mercadopago,
+    StubServer,
+    merge_bulkheads,
+)
+
+import pytest
+
+from requests import exceptions as requests_exceptions
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+class Client(object):
+    """Fake client blocking the calls to ``/slow`` until released."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.calls = []
+        self.release = threading.Event()
+        self.closed = False
+
+    def get(self, url, maxretries=None, **kwargs):
+        if url.endswith("/slow"):
+            self.release.wait(5)
+        self.calls.append(url)
+        return {"status": 200, "response": None}
+
+    def stats(self):
+        return {"connections": self.maxsize, "host": "api"}
+
+    def close(self):
+        self.closed = True
+
+
+API = "https://api.mercadopago.com"
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_merge_bulkheads():
+    assert merge_bulkheads() == DEFAULT_BULKHEADS
+    bulkheads = merge_bulkheads(
+        {
+            "reporting": {"workers": 1},
+            "oauth": None,
+            "disputes": {"paths": ["/v1/disputes"]},
+        }
+    )
+    assert bulkheads["reporting"]["workers"] == 1
+    assert bulkheads["reporting"]["paths"] == (
+        DEFAULT_BULKHEADS["reporting"]["paths"]
+    )
+    assert "oauth" not in bulkheads
+    assert bulkheads["disputes"] == {
+        "paths": ("/v1/disputes",),
+        "maxsize": 10,
+        "workers": None,
+    }
+    assert DEFAULT_BULKHEADS["reporting"]["workers"] == 4
+    with pytest.raises(ValueError):
+        merge_bulkheads({"disputes": {"workers": 1}})
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/v1/payments", "payments"),
+        ("/v1/payments/123?x=1", "payments"),
+        ("/v1/card_tokens", "payments"),
+        ("/v1/payments/search", "reporting"),
+        ("/merchant_orders/search", "reporting"),
+        ("/merchant_orders/123", "preferences"),
+        ("/checkout/preferences", "preferences"),
+        ("/oauth/token", "oauth"),
+        ("/v1/payments_report", "default"),
+        ("/v1/disputes/1", "default"),
+    ],
+)
+def test_route(path, expected):
+    client = BulkheadHttpClient(Client)
+    assert client.route(API + path).name == expected
+
+
+def test_bulkhead_full():
+    bulkhead = Bulkhead("reporting", Client(1), workers=1)
+    with bulkhead.enter():
+        with pytest.raises(BulkheadFull) as excinfo:
+            with bulkhead.enter(timeout=0.01):
+                pass
+        assert isinstance(excinfo.value, requests_exceptions.ConnectionError)
+    with bulkhead.enter(timeout=0.01):
+        pass
+    stats = bulkhead.stats()
+    assert stats["calls"] == 2
+    assert stats["rejected"] == 1
+    assert stats["active"] == 0
+
+
+def test_isolation():
+    client = BulkheadHttpClient(
+        Client, merge_bulkheads({"reporting": {"workers": 1}}), timeout=0.05
+    )
+    reporting = client.bulkheads["reporting"].http_client
+    slow = threading.Thread(
+        target=client.get,
+        kwargs={"url": API + "/v1/payments/search/slow", "headers": {}},
+    )
+    slow.start()
+    try:
+        with pytest.raises(BulkheadFull):
+            client.get(url=API + "/v1/payments/search", headers={})
+        assert (
+            client.get(url=API + "/v1/payments/1", headers={})["status"] == 200
+        )
+    finally:
+        reporting.release.set()
+        slow.join()
+    assert client.bulkheads["payments"].http_client.calls == [
+        API + "/v1/payments/1"
+    ]
+    assert client.bulkheads["payments"].http_client.maxsize == 10
+    stats = client.stats()
+    assert stats["connections"] == 10 + 5 + 2 + 2 + 10
+    assert "host" not in stats
+    assert stats["bulkheads"]["reporting"]["rejected"] == 1
+    client.close()
+    assert all(b.http_client.closed for b in client.bulkheads.values())
+
+
+def test_bulkhead_transport():
+    with StubServer() as stub:
+        app = Flask(__name__)
+        app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+        app.config["BASE_URL"] = stub.url + "/v1"
+        app.config["MERCADOPAGO_TRANSPORT"] = "pooled"
+        app.config["MERCADOPAGO_BULKHEADS"] = {"reporting": {"maxsize": 1}}
+        mercadopago = Mercadopago(app)
+        with app.app_context():
+            assert mercadopago.payment().get(1)["status"] == 200
+            assert mercadopago.payment().search()["status"] == 200
+            stats = mercadopago.stats()["transport"]
+        assert stub.requests == 2
+        assert stats["bulkheads"]["payments"]["calls"] == 1
+        assert stats["bulkheads"]["reporting"]["calls"] == 1
+        assert stats["connections"] == 2
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import json
+import time
+
+from flask_mercadopago import (
+    CassetteHttpClient,
+    CassetteMissError,
+    StubServer,
+    create_transport,
+    interaction_key,
+)
+
+from mercadopago.http import HttpClient
+
+import pytest
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+URL = "https://api.mercadopago.com/v1/payments"
+
+
+class FakeClient(object):
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, headers, params=None, timeout=None, maxretries=None):
+        self.calls.append(("GET", url, params))
+        return {"status": 200, "response": {"n": len(self.calls)}}
+
+    def post(self, url, headers, data=None, **kwargs):
+        self.calls.append(("POST", url, data))
+        return {"status": 201, "response": json.loads(data)}
+
+
+def test_interaction_key():
+    key = interaction_key("get", URL, {"a": 1, "b": 2})
+    assert key == interaction_key("GET", URL, {"b": 2, "a": 1})
+    assert key != interaction_key("GET", URL, {"a": 1})
+    assert interaction_key("POST", URL, data='{"a": 1}') != interaction_key(
+        "POST", URL, data='{"a": 2}'
+    )
+    assert len(key) == 40
+
+
+def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    fake = FakeClient()
+    recorder = CassetteHttpClient(fake, path, mode="record")
+    assert recorder.get(URL, {"x-idempotency-key": "1"})["response"] == {
+        "n": 1
+    }
+    assert recorder.get(URL, {})["response"] == {"n": 2}
+    recorder.post(URL, {}, data='{"amount": 10}')
+    assert len(fake.calls) == 3
+    assert len(open(path).readlines()) == 3
+
+    player = CassetteHttpClient(None, path, mode="replay", latency=0.01)
+    assert len(player) == 3
+    start = time.perf_counter()
+    assert player.get(URL, {"x-idempotency-key": "2"})["response"] == {"n": 1}
+    assert time.perf_counter() - start >= 0.01
+    first = player.get(URL, {})
+    assert first["response"] == {"n": 2}
+    first["response"]["n"] = 0
+    assert player.get(URL, {})["response"] == {"n": 2}
+    assert player.post(URL, {}, data='{"amount": 10}')["status"] == 201
+    with pytest.raises(CassetteMissError):
+        player.get(URL, {}, params={"status": "approved"})
+    with pytest.raises(CassetteMissError):
+        player.post(URL, {}, data='{"amount": 11}')
+
+
+def test_once(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    fake = FakeClient()
+    client = CassetteHttpClient(fake, path)
+    client.get(URL, {})
+    client.get(URL, {})
+    assert len(fake.calls) == 1
+    client = CassetteHttpClient(fake, path)
+    client.get(URL, {})
+    client.get(URL, {}, params={"limit": 1})
+    assert len(fake.calls) == 2
+    assert len(client) == 2
+
+
+def test_modes(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    with pytest.raises(ValueError):
+        CassetteHttpClient(HttpClient(), path, mode="foo")
+    with pytest.raises(ValueError):
+        CassetteHttpClient(None, path, mode="record")
+
+
+@pytest.mark.usefixtures("client")
+def test_cassette_of_the_app(app, mercadopago, tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+    app.config["MERCADOPAGO_CASSETTE"] = path
+    app.config["MERCADOPAGO_CASSETTE_MODE"] = "record"
+    with StubServer() as stub:
+        app.config["BASE_URL"] = stub.url + "/v1"
+        recorder = create_transport(app.config)
+        assert isinstance(recorder, CassetteHttpClient)
+        res = mercadopago.payment(http_client=recorder).get(1)
+        assert res["status"] == 200
+        recorder.close()
+
+    app.config["MERCADOPAGO_CASSETTE_MODE"] = "replay"
+    assert mercadopago.transport.mode == "replay"
+    assert mercadopago.payment().get(1) == res
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import json
+import threading
+
+from flask_mercadopago import CatalogCache, StubServer
+
+import pytest
+
+import requests
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_catalog_cache(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache" / "catalogs.json")
+    now = [1000.0]
+    monkeypatch.setattr("time.time", lambda: now[0])
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return [{"id": "visa"}]
+
+    cache = CatalogCache(60, path)
+    assert cache.get("payment_methods", loader) == [{"id": "visa"}]
+    assert cache.get("payment_methods", loader) == [{"id": "visa"}]
+    assert len(loads) == 1
+    assert json.load(open(path))["payment_methods"][0] == 1000.0
+
+    other = CatalogCache(60, path)
+    assert other.get("payment_methods", loader) == [{"id": "visa"}]
+    assert len(loads) == 1
+    assert other.stats()["catalogs"]["payment_methods"] == {
+        "age": 0.0,
+        "size": 1,
+        "fresh": True,
+    }
+
+    now[0] += 61
+    other.get("payment_methods", loader)
+    assert len(loads) == 2
+    other.get("payment_methods", loader, refresh=True)
+    assert len(loads) == 3
+    assert (other.hits, other.misses) == (1, 2)
+    other.clear()
+    assert other.stats()["catalogs"] == {}
+
+
+def test_catalog_cache_shared_file(tmp_path):
+    # each cache stands for a process, with its own lock
+    path = str(tmp_path / "catalogs.json")
+    caches = [CatalogCache(60, path) for _ in range(8)]
+    threads = [
+        threading.Thread(
+            target=lambda cache=cache, i=i: [
+                cache.put(f"catalog-{i}-{n}", [n]) for n in range(10)
+            ]
+        )
+        for i, cache in enumerate(caches)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(json.load(open(path))) == 80
+
+
+@pytest.mark.usefixtures("client")
+def test_catalog(app, mercadopago):
+    app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+    app.config["MERCADOPAGO_TRANSPORT"] = "pooled"
+    with StubServer() as stub:
+        app.config["BASE_URL"] = stub.url + "/v1"
+        methods = mercadopago.catalog("payment_methods")
+        assert mercadopago.catalog("payment_methods") is methods
+        assert len(mercadopago.catalog("identification_types")) == 3
+        assert stub.requests == 2
+        stub.error_rate = 1.0
+        # the retries of the SDK resources run out, like with its client
+        with pytest.raises(requests.exceptions.RetryError):
+            mercadopago.catalog("payment_methods", refresh=True)
+        stats = mercadopago.stats()
+        mercadopago.transport.close()
+    assert stats["catalogs"]["hits"] == 1
+    assert stats["sellers"] == {"clients": 0}
+    assert stats["transport"]["hosts"] == 1
+    with pytest.raises(ValueError):
+        mercadopago.catalog("foo")
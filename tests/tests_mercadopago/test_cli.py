@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import json
+import os
+import subprocess
+import sys
+import threading
+
+from flask import Flask
+
+from flask_mercadopago import Mercadopago, StubServer
+
+import pytest
+
+from werkzeug.serving import make_server
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_loadtest_command(app, mercadopago):
+    runner = app.test_cli_runner()
+    result = runner.invoke(
+        args=["mercadopago", "loadtest", "-d", "0.05", "-c", "1,2"]
+    )
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0].startswith("scenario checkout on http://127.0.0.1:")
+    assert lines[1].split()[0] == "concurrency"
+    assert [line.split()[0] for line in lines[2:]] == ["1", "2"]
+
+
+def test_loadtest_command_json(app, mercadopago):
+    app.config["MERCADOPAGO_TRANSPORT"] = "pooled"
+    runner = app.test_cli_runner()
+    result = runner.invoke(
+        args=[
+            "mercadopago",
+            "loadtest",
+            "--scenario",
+            "preference",
+            "--duration",
+            "0.05",
+            "--concurrency",
+            "3",
+            "--latency",
+            "0",
+            "--json",
+        ]
+    )
+    assert result.exit_code == 0, result.output
+    report = json.loads(result.output)
+    assert report["scenario"] == "preference"
+    assert report["concurrency"] == 3
+    assert report["iterations"] > 0
+    assert 1 <= report["connections"] <= 3
+
+
+def test_loadtest_command_uses_the_app_transport(app, mercadopago):
+    app.config["MERCADOPAGO_PRIORITY_LIMITS"] = {"interactive": 2}
+    runner = app.test_cli_runner()
+    result = runner.invoke(
+        args=["mercadopago", "loadtest", "-d", "0.05", "-c", "2", "--json"]
+    )
+    assert result.exit_code == 0, result.output
+    iterations = json.loads(result.output)["iterations"]
+    with app.app_context():
+        stats = mercadopago.stats()["transport"]["scheduler"]
+        mercadopago.transport.close()
+    # a card token and a payment per checkout
+    assert stats["interactive"]["calls"] == 2 * iterations
+    result = runner.invoke(args=["mercadopago", "loadtest", "-d", "0.05"])
+    assert result.exit_code == 2
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["-c", "0"],
+        ["-c", "a,b"],
+        ["--no-stub"],
+        ["-s", "foo"],
+    ],
+)
+def test_loadtest_command_errors(app, mercadopago, args):
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["mercadopago", "loadtest"] + args)
+    assert result.exit_code == 2
+
+
+def test_warm_command(app, mercadopago, tmp_path):
+    path = str(tmp_path / "catalogs.json")
+    app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+    app.config["MERCADOPAGO_CATALOG_FILE"] = path
+    with StubServer() as stub:
+        app.config["BASE_URL"] = stub.url + "/v1"
+        result = app.test_cli_runner().invoke(args=["mercadopago", "warm"])
+        with app.app_context():
+            mercadopago.transport.close()
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines() == [
+        "identification_types: 3 entries",
+        "payment_methods: 3 entries",
+    ]
+    assert sorted(json.load(open(path))) == [
+        "identification_types",
+        "payment_methods",
+    ]
+
+
+def test_assets_command(app, mercadopago, tmp_path):
+    runner = app.test_cli_runner()
+    result = runner.invoke(
+        args=["mercadopago", "assets", "--output", str(tmp_path)]
+    )
+    assert result.exit_code == 0, result.output
+    manifest = json.load(open(tmp_path / "sri.json"))
+    assert manifest["js/mercadopago/v2.js"].startswith("sha384-")
+    assert os.listdir(tmp_path) == ["sri.json"]
+    result = runner.invoke(args=["mercadopago", "assets"])
+    assert result.exit_code == 2
+
+    local = Flask(__name__)
+    local.config["MERCADOPAGO_SERVE_LOCAL"] = True
+    local.config["MERCADOPAGO_SRI_FILE"] = str(tmp_path / "sri.json")
+    Mercadopago(local)
+    with local.test_request_context():
+        script = local.extensions["mercadopago"].load_js()
+    assert f'integrity="{manifest["js/mercadopago/v2.js"]}"' in script
+
+
+def test_stats_command(app, mercadopago):
+    worker = Flask(__name__)
+    worker.config["MERCADOPAGO_STATS_ROUTE"] = "/mercadopago/stats"
+    Mercadopago(worker)
+    server = make_server("127.0.0.1", 0, worker, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/mercadopago/stats"
+    try:
+        result = app.test_cli_runner().invoke(
+            args=["mercadopago", "stats", url]
+        )
+    finally:
+        server.shutdown()
+        thread.join()
+    assert result.exit_code == 0, result.output
+    assert set(json.loads(result.output)) == {
+        "catalogs",
+        "inbox",
+        "installments",
+        "lookups",
+        "outbox",
+        "poller",
+        "sellers",
+        "transport",
+    }
+    result = app.test_cli_runner().invoke(
+        args=["mercadopago", "stats", "http://127.0.0.1:1/"]
+    )
+    assert result.exit_code == 1
+    assert "Can't get the stats" in result.output
+
+
+def test_commands_are_imported_on_first_use(app):
+    code = (
+        "import sys; from flask import Flask; "
+        "from flask_mercadopago import Mercadopago; "
+        "app = Flask('app'); Mercadopago(app); "
+        "assert 'flask_mercadopago.cli' not in sys.modules; "
+        "group = app.cli.get_command(None, 'mercadopago'); "
+        "assert 'stats' in group.list_commands(None)"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_probe_command(app, mercadopago):
+    app.config["MERCADOPAGO_TRANSPORT"] = "pooled"
+    with StubServer() as stub:
+        app.config["BASE_URL"] = stub.url + "/v1"
+        result = app.test_cli_runner().invoke(
+            args=["mercadopago", "probe", "-n", "3"]
+        )
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0] == f"probing {stub.url}/v1 (/v1/payment_methods)"
+    assert [line.split()[1] for line in lines[1:4]] == ["200"] * 3
+    assert lines[4].startswith("first ")
+    assert stub.connections == 1
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import csv
+import datetime as dt
+
+from flask_mercadopago import (
+    PAYMENT_COLUMNS,
+    StubServer,
+    arrow_schema,
+    export_payments,
+    iter_batches,
+    iter_range,
+    to_columns,
+)
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+def date(second):
+    value = dt.datetime(2022, 7, 1, tzinfo=dt.timezone(dt.timedelta(hours=-4)))
+    value += dt.timedelta(seconds=second)
+    return value.isoformat(timespec="milliseconds")
+
+
+class Payments(object):
+    """Fake ``payment()`` searching payments by creation date, two per
+    second so some dates are split between two searches."""
+
+    def __init__(self, count):
+        self.payments = [
+            {
+                "id": i,
+                "status": "approved",
+                "date_created": date(i // 2),
+                "transaction_amount": 10 + i,
+                "installments": 1,
+                "payer": {"id": str(100 + i), "email": f"payer{i}@test.com"},
+                "transaction_details": {"net_received_amount": 9.5 + i},
+                "live_mode": False,
+            }
+            for i in range(1, count + 1)
+        ]
+        self.searches = []
+
+    def payment(self):
+        return self
+
+    def search(self, filters):
+        self.searches.append(filters)
+        begin = dt.datetime.fromisoformat(filters["begin_date"])
+        matches = [
+            p
+            for p in self.payments
+            if dt.datetime.fromisoformat(p["date_created"]) >= begin
+        ]
+        offset, limit = filters["offset"], filters["limit"]
+        return {
+            "status": 200,
+            "response": {
+                "paging": {"total": len(matches), "offset": offset},
+                "results": matches[offset : offset + limit],  # noqa: E203
+            },
+        }
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_iter_range_gives_each_result_once(monkeypatch):
+    monkeypatch.setattr("flask_mercadopago.sync.MAX_SEARCH_OFFSET", 15)
+    payments = Payments(45)
+    pages = list(iter_range(payments, "date_created", date(0), page_size=5))
+    ids = [r["id"] for page in pages for r in page["results"]]
+    assert ids == list(range(1, 46))
+    begins = [s["begin_date"] for s in payments.searches if not s["offset"]]
+    assert begins[:2] == [date(0), date(7)]
+
+
+def test_iter_batches():
+    pages = [{"results": list(range(i, i + 4))} for i in range(0, 12, 4)]
+    assert [len(b) for b in iter_batches(pages, 5)] == [5, 5, 2]
+    assert sum(iter_batches(pages, 5), []) == list(range(12))
+
+
+def test_to_columns():
+    columns = to_columns(Payments(2).payments[:1] + [{"id": "3"}])
+    assert list(columns) == [name for name, _, _ in PAYMENT_COLUMNS]
+    assert columns["id"] == [1, 3]
+    assert columns["payer_email"] == ["payer1@test.com", None]
+    assert columns["net_received_amount"] == [10.5, None]
+    assert columns["transaction_amount"] == [11.0, None]
+    assert columns["date_created"][0] == dt.datetime.fromisoformat(date(0))
+    assert columns["date_approved"] == [None, None]
+
+
+def test_export_csv(tmp_path):
+    path = str(tmp_path / "payments.csv")
+    report = export_payments(
+        Payments(25), path, begin=date(0), page_size=10, batch_size=10
+    )
+    assert report == {"path": path, "format": "csv", "rows": 25, "batches": 3}
+    with open(path, newline="") as fp:
+        rows = list(csv.DictReader(fp))
+    assert len(rows) == 25
+    assert rows[0]["id"] == "1"
+    assert rows[0]["payer_id"] == "101"
+    assert rows[0]["date_created"] == date(0)
+    assert rows[0]["date_approved"] == ""
+
+
+def test_export_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "payments.parquet")
+    report = export_payments(
+        Payments(25), path, begin=date(0), page_size=10, batch_size=10
+    )
+    assert report["format"] == "parquet"
+    parquet = pq.ParquetFile(path)
+    assert parquet.schema_arrow == arrow_schema()
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.num_rows == 25
+    assert table.column("id").to_pylist() == list(range(1, 26))
+    assert table.column("transaction_amount").to_pylist()[-1] == 35.0
+
+
+def test_export_arrow(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / "payments.arrow")
+    report = export_payments(Payments(5), path, begin=date(0))
+    assert report["format"] == "arrow"
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+    assert table.schema == arrow_schema()
+    assert table.column("payer_email").to_pylist()[0] == "payer1@test.com"
+
+
+def test_export_falls_back_to_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "flask_mercadopago.export._import_pyarrow", lambda: None
+    )
+    report = export_payments(
+        Payments(3), str(tmp_path / "payments"), begin=date(0)
+    )
+    assert report["format"] == "csv"
+    with pytest.raises(RuntimeError):
+        export_payments(
+            Payments(3), str(tmp_path / "payments.parquet"), begin=date(0)
+        )
+
+
+def test_export_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        export_payments(
+            Payments(3), str(tmp_path / "payments"), file_format="xlsx"
+        )
+
+
+def test_export_command(app, mercadopago, tmp_path):
+    path = str(tmp_path / "payments.csv")
+    with StubServer(search_size=30) as stub:
+        app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+        app.config["BASE_URL"] = stub.url + "/v1"
+        result = app.test_cli_runner().invoke(
+            args=["mercadopago", "export", path, "--batch-size", "20"]
+        )
+        with app.app_context():
+            mercadopago.transport.close()
+    assert result.exit_code == 0, result.output
+    assert "30 payments in 2 batches" in result.output
+    with open(path, newline="") as fp:
+        assert len(list(csv.DictReader(fp))) == 30
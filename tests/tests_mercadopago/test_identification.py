@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from flask_mercadopago import (
+    CHECKSUMS,
+    normalize_identification,
+    validate_identification,
+)
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+IDENTIFICATION_TYPES = [
+    {"id": "CPF", "type": "number", "min_length": 11, "max_length": 11},
+    {"id": "CNPJ", "type": "number", "min_length": 14, "max_length": 14},
+    {"id": "DNI", "type": "number", "min_length": 7, "max_length": 8},
+    {"id": "Otro", "type": "string", "min_length": 5, "max_length": 20},
+]
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    "type_id, number",
+    [
+        ("CPF", "529.982.247-25"),
+        ("CNPJ", "11.222.333/0001-81"),
+        ("CUIT", "30-50001091-2"),
+        ("CUIL", "27-12345678-0"),
+        ("RUC", "20131312955"),
+        ("RUC", "20100000131"),
+        ("CI", "1.234.567-2"),
+        ("RUT", "12.345.678-5"),
+        ("RUT", "10.000.013-k"),
+    ],
+)
+def test_checksums(type_id, number):
+    assert CHECKSUMS[type_id](normalize_identification(number))
+
+
+@pytest.mark.parametrize(
+    "type_id, number",
+    [
+        ("CPF", "529.982.247-24"),
+        ("CPF", "111.111.111-11"),
+        ("CPF", "5299822472"),
+        ("CNPJ", "11.222.333/0001-80"),
+        ("CNPJ", "00000000000000"),
+        ("CUIT", "30-50001091-3"),
+        ("CUIT", "3050001091"),
+        ("RUC", "20131312954"),
+        ("RUC", "20100000130"),
+        ("CI", "1.234.567-3"),
+        ("RUT", "12.345.678-K"),
+        ("RUT", "5-1"),
+    ],
+)
+def test_checksums_invalid(type_id, number):
+    assert not CHECKSUMS[type_id](normalize_identification(number))
+
+
+def test_normalize_identification():
+    assert normalize_identification(" 11.222.333/0001-81 ") == "11222333000181"
+    assert normalize_identification("10.000.013-k") == "10000013K"
+    assert normalize_identification(12345678) == "12345678"
+
+
+def test_validate_identification():
+    assert validate_identification("CPF", "529.982.247-25") == "52998224725"
+    number = validate_identification("DNI", "12.345.678", IDENTIFICATION_TYPES)
+    assert number == "12345678"
+    assert validate_identification("Otro", "AB1234", IDENTIFICATION_TYPES)
+
+
+@pytest.mark.parametrize(
+    "type_id, number",
+    [
+        ("CPF", "529.982.247-24"),
+        ("DNI", "123456"),
+        ("DNI", "1234567A"),
+        ("Otro", "AB_1234"),
+        ("Otro", ""),
+        ("CUIT", "30-50001091-2"),
+    ],
+)
+def test_validate_identification_invalid(type_id, number):
+    with pytest.raises(ValueError):
+        validate_identification(type_id, number, IDENTIFICATION_TYPES)
+
+
+def test_validate_identification_unknown_type():
+    with pytest.raises(ValueError):
+        validate_identification("DNI", "12345678")
+
+
+@pytest.mark.usefixtures("client")
+def test_mercadopago_validate_identification(mercadopago):
+    catalogs = mercadopago._get_state().catalogs
+    catalogs.put("identification_types", IDENTIFICATION_TYPES)
+    assert mercadopago.validate_identification("CNPJ", "11222333000181")
+    with pytest.raises(ValueError):
+        mercadopago.validate_identification("CNPJ", "11222333000180")
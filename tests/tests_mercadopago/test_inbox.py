@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import threading
+import time
+
+from flask import Flask
+
+from flask_mercadopago import (
+    Inbox,
+    Mercadopago,
+    StubServer,
+    notification_received,
+)
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+class Handler(object):
+    """Fake handler recording the batches, failing the first ones."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = []
+        self.called = threading.Event()
+
+    def __call__(self, name, resource_ids):
+        self.calls.append((name, resource_ids))
+        self.called.set()
+        if len(self.calls) <= self.failures:
+            raise ConnectionError("down")
+
+
+@pytest.fixture
+def inbox(tmp_path):
+    inbox = Inbox(str(tmp_path / "inbox.db"), Handler(), lease=0.05)
+    yield inbox
+    inbox.close()
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_process(inbox):
+    assert inbox._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    for name, resource_id in [
+        ("payment", 1),
+        ("merchant_order", "7"),
+        ("payment", "2"),
+        ("payment", 1),
+    ]:
+        inbox.append(name, resource_id)
+    assert len(inbox) == 4
+    assert inbox.process() == 4
+    assert inbox.handler.calls == [
+        ("payment", ["1", "2"]),
+        ("merchant_order", ["7"]),
+    ]
+    assert inbox.process() == 0
+    assert inbox.stats() == {
+        "pending": 0,
+        "dead": 0,
+        "batches": 1,
+        "processed": 4,
+        "duplicates": 1,
+        "errors": 0,
+    }
+
+
+def test_batch_size(tmp_path):
+    inbox = Inbox(str(tmp_path / "inbox.db"), Handler(), batch_size=2)
+    for resource_id in range(5):
+        inbox.append("payment", resource_id)
+    assert [inbox.process() for _ in range(4)] == [2, 2, 1, 0]
+    assert inbox.handler.calls[0] == ("payment", ["0", "1"])
+    inbox.close()
+
+
+def test_retry_after_lease(tmp_path):
+    inbox = Inbox(str(tmp_path / "inbox.db"), Handler(failures=1), lease=0.05)
+    inbox.append("payment", 1)
+    assert inbox.process() == 1
+    assert len(inbox) == 1
+    assert inbox.process() == 0
+    time.sleep(0.06)
+    assert inbox.process() == 1
+    assert len(inbox) == 0
+    assert inbox.handler.calls == [("payment", ["1"])] * 2
+    assert inbox.stats()["errors"] == 1
+    inbox.close()
+
+
+def test_dead_letters(tmp_path):
+    inbox = Inbox(
+        str(tmp_path / "inbox.db"),
+        Handler(failures=3),
+        lease=0,
+        max_attempts=2,
+    )
+    inbox.append("payment", 1)
+    inbox.append("payment", 2)
+    assert [inbox.process() for _ in range(3)] == [2, 2, 0]
+    assert len(inbox) == 0
+    assert inbox.dead_letters() == [("payment", "1", 2), ("payment", "2", 2)]
+    assert inbox.stats()["dead"] == 2
+    assert inbox.stats()["errors"] == 2
+    assert inbox.requeue() == 2
+    assert inbox.dead_letters() == []
+    assert inbox.process() == 2
+    assert inbox.process() == 2
+    assert len(inbox) == 0
+    assert inbox.stats()["dead"] == 0
+    assert len(inbox.handler.calls) == 4
+    inbox.close()
+
+
+def test_ack_of_reclaimed_batch(inbox):
+    inbox.append("payment", 1)
+    first, rows = inbox.claim()
+    assert rows == [("payment", "1")]
+    time.sleep(0.06)
+    second, rows = inbox.claim()
+    assert rows == [("payment", "1")]
+    inbox.ack(first)
+    assert len(inbox) == 1
+    inbox.ack(second)
+    assert len(inbox) == 0
+
+
+def test_recover_after_crash(tmp_path):
+    path = str(tmp_path / "inbox.db")
+    crashed = Inbox(path, Handler())
+    crashed.append("payment", 1)
+    crashed.claim()
+    crashed.close()
+    inbox = Inbox(path, Handler(), lease=0)
+    assert inbox.process() == 1
+    assert inbox.handler.calls == [("payment", ["1"])]
+    inbox.close()
+
+
+def test_background_thread(inbox):
+    inbox.start()
+    inbox.append("payment", 1)
+    assert inbox.handler.called.wait(5)
+    inbox.close()
+    assert inbox.handler.calls == [("payment", ["1"])]
+
+
+def test_enqueue_notifications(tmp_path):
+    received = []
+
+    def on_notification(sender, **kwargs):
+        received.append(kwargs)
+
+    with StubServer() as stub:
+        app = Flask(__name__)
+        app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+        app.config["BASE_URL"] = stub.url + "/v1"
+        app.config["MERCADOPAGO_NOTIFICATION_ROUTE"] = "/notify"
+        app.config["MERCADOPAGO_INBOX"] = True
+        app.config["MERCADOPAGO_INBOX_FILE"] = str(tmp_path / "inbox.db")
+        mercadopago = Mercadopago(app)
+        inbox = mercadopago._get_state(app).inbox
+        inbox.stop()
+        client = app.test_client()
+        with notification_received.connected_to(on_notification, app):
+            for body in [
+                {"type": "payment", "data": {"id": "5"}},
+                {"type": "payment", "data": {"id": "6"}},
+                {"type": "payment", "data": {"id": "5"}},
+            ]:
+                assert client.post("/notify", json=body).status_code == 200
+            assert (
+                client.post("/notify?topic=merchant_order&id=7").status_code
+                == 200
+            )
+            assert stub.requests == 0
+            assert len(inbox) == 4
+            assert inbox.process() == 4
+        assert stub.requests == 3
+        assert received == [
+            {"name": "payment", "resource_id": "5"},
+            {"name": "payment", "resource_id": "6"},
+            {"name": "merchant_order", "resource_id": "7"},
+        ]
+        with app.app_context():
+            assert mercadopago.lookup("payment", 6)["response"]["id"] == 6
+            assert mercadopago.stats()["inbox"]["duplicates"] == 1
+        assert stub.requests == 3
+        inbox.close()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import json
+
+from flask_mercadopago import InstallmentQuotes, derive_options
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+RATES = {1: 0.0, 3: 10.0, 6: 21.07, 12: 45.5}
+
+
+def quote(filters, max_allowed=None):
+    """Fake ``installments().get`` response, computed from ``RATES``.
+
+    The payer costs whose allowed amounts exclude the amount are left out,
+    like the API does; ``max_allowed`` maps installments to their
+    ``max_allowed_amount``.
+    """
+    amount = filters["amount"]
+    costs = [
+        {
+            "installments": n,
+            "installment_rate": rate,
+            "discount_rate": 0,
+            "min_allowed_amount": 50 if n == 12 else 0,
+            "max_allowed_amount": (max_allowed or {}).get(n, 250000),
+            "installment_amount": round(amount * (1 + rate / 100) / n, 2),
+            "total_amount": round(amount * (1 + rate / 100), 2),
+            "recommended_message": f"{n} cuotas",
+        }
+        for n, rate in RATES.items()
+    ]
+    return [
+        {
+            "payment_method_id": "visa",
+            "issuer": {"id": 310},
+            "payer_costs": [
+                cost
+                for cost in costs
+                if cost["min_allowed_amount"]
+                <= amount
+                <= cost["max_allowed_amount"]
+            ],
+        }
+    ]
+
+
+class Loader(object):
+    def __init__(self, max_allowed=None):
+        self.max_allowed = max_allowed
+        self.calls = []
+
+    def __call__(self, filters):
+        self.calls.append(filters)
+        return quote(filters, self.max_allowed)
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_derive_options():
+    options = derive_options(quote({"amount": 100.0}), 333.33)
+    costs = options[0]["payer_costs"]
+    assert [c["total_amount"] for c in costs] == [
+        333.33,
+        366.66,
+        403.56,
+        485.0,
+    ]
+    assert [c["installment_amount"] for c in costs] == [
+        333.33,
+        122.22,
+        67.26,
+        40.42,
+    ]
+    assert costs[0]["recommended_message"] is None
+    assert options[0]["issuer"] == {"id": 310}
+
+
+def test_derive_options_allowed_amounts():
+    costs = derive_options(quote({"amount": 100.0}), 40.0)[0]["payer_costs"]
+    assert [c["installments"] for c in costs] == [1, 3, 6]
+
+
+def test_derive_options_needs_the_rates():
+    options = quote({"amount": 100.0})
+    options[0]["payer_costs"][1]["discount_rate"] = 5
+    assert derive_options(options, 120.0) is None
+    del options[0]["payer_costs"][1]["installment_rate"]
+    assert derive_options(options, 120.0) is None
+
+
+def test_quote_derives_the_bucket():
+    quotes = InstallmentQuotes(16)
+    loader = Loader()
+    first = quotes.quote(120.0, loader, "4509953566233704")
+    assert loader.calls == [{"amount": 120.0, "bin": "450995"}]
+    assert quotes.quote(120.0, loader, "450995") == first
+    # a single answer may lack payer costs allowed at other amounts
+    quotes.quote(100.0, loader, "450995")
+    assert len(loader.calls) == 2
+    derived = quotes.quote(110.0, loader, "450995")
+    costs = derived[0]["payer_costs"]
+    assert (
+        costs[2]["total_amount"]
+        == quote({"amount": 110.0})[0]["payer_costs"][2]["total_amount"]
+    )
+    assert len(loader.calls) == 2
+    quotes.quote(125.0, loader, "450995")
+    quotes.quote(124.0, loader, "450995")
+    assert len(loader.calls) == 3
+    quotes.quote(300.0, loader, "450995")
+    quotes.quote(120.0, loader, "450995", payment_method_id="visa")
+    quotes.quote(120.0, loader, "400276")
+    assert len(loader.calls) == 6
+    assert loader.calls[4] == {
+        "amount": 120.0,
+        "bin": "450995",
+        "payment_method_id": "visa",
+    }
+    assert quotes.stats() == {"size": 4, "hits": 5, "misses": 4, "derived": 2}
+
+
+def test_quote_max_allowed_amount():
+    quotes = InstallmentQuotes(16)
+    loader = Loader(max_allowed={12: 110})
+    quotes.quote(120.0, loader, "450995")
+    quotes.quote(126.0, loader, "450995")
+    assert quotes.quote(100.0, loader, "450995") == quote(
+        {"amount": 100.0}, loader.max_allowed
+    )
+    assert len(loader.calls) == 3
+    quotes.quote(105.0, loader, "450995")
+    costs = quotes.quote(102.0, loader, "450995")[0]["payer_costs"]
+    assert [c["installments"] for c in costs] == [1, 3, 6, 12]
+    assert len(loader.calls) == 4
+    costs = quotes.quote(112.0, loader, "450995")[0]["payer_costs"]
+    assert [c["installments"] for c in costs] == [1, 3, 6]
+    assert len(loader.calls) == 5
+    assert quotes.stats()["derived"] == 1
+
+
+def test_quote_returns_copies():
+    quotes = InstallmentQuotes(16)
+    loader = Loader()
+    quotes.quote(100.0, loader, "450995")
+    quotes.quote(100.0, loader, "450995")[0]["payer_costs"].clear()
+    assert quotes.quote(100.0, loader, "450995")[0]["payer_costs"]
+
+
+def test_quote_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    quotes = InstallmentQuotes(16, ttl=10)
+    loader = Loader()
+    quotes.quote(100.0, loader, "450995", issuer_id=310)
+    now[0] += 11
+    quotes.quote(100.0, loader, "450995", issuer_id=310)
+    assert len(loader.calls) == 2
+    assert loader.calls[0]["issuer.id"] == 310
+
+
+def test_quote_buckets():
+    quotes = InstallmentQuotes(16, growth=10)
+    assert quotes.bucket(1) == quotes.bucket(9.99) == 0
+    assert quotes.bucket(10) == 1
+    with pytest.raises(ValueError):
+        quotes.bucket(0)
+    with pytest.raises(ValueError):
+        InstallmentQuotes(16, growth=1)
+
+
+def test_quote_installments(app, mercadopago):
+    app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+    loader = Loader()
+
+    class FakeInstallments(object):
+        def get(self, filters):
+            loader(filters)
+            if filters["amount"] > 1000:
+                return {"status": 400, "response": {}}
+            return {"status": 200, "response": quote(filters)}
+
+    with app.app_context():
+        mercadopago.resource_hook(
+            lambda name, res: (
+                FakeInstallments() if name == "installments" else None
+            )
+        )
+        options = mercadopago.quote_installments(110.0, "450995")
+        assert json.dumps(options) == json.dumps(quote({"amount": 110.0}))
+        mercadopago.quote_installments(100.0, "450995")
+        mercadopago.quote_installments(105.0, "450995")
+        assert len(loader.calls) == 2
+        with pytest.raises(RuntimeError):
+            mercadopago.quote_installments(5000.0, "450995")
+        assert mercadopago.stats()["installments"]["derived"] == 1
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask
+
+from flask_mercadopago import (
+    Mercadopago,
+    RequestLoader,
+    StubServer,
+    current_priority,
+    priority,
+)
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+class Fetch(object):
+    """Fake ``fetch`` recording the calls and their threads."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.threads = set()
+
+    def __call__(self, name, resource_id):
+        self.calls.append((name, resource_id))
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        if resource_id == "boom":
+            raise ConnectionError("boom")
+        return {"status": 200, "response": {"id": resource_id}}
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(8) as executor:
+        yield executor
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_loader_batches_the_prefetched_reads(executor):
+    fetch = Fetch(delay=0.05)
+    loader = RequestLoader(fetch, executor)
+    loader.prefetch("payment", range(1, 9))
+    loader.prefetch("payment", [1, "2"])
+    started = time.monotonic()
+    assert loader.get("payment", 3)["response"] == {"id": 3}
+    assert time.monotonic() - started < 0.3
+    assert len(fetch.calls) == 8
+    assert len(fetch.threads) > 1
+    assert [
+        r["response"]["id"] for r in loader.get_many("payment", [1, 2])
+    ] == [
+        1,
+        2,
+    ]
+    assert ("payment", "8") in loader
+    assert ("merchant_order", 8) not in loader
+    assert (loader.calls, loader.batches) == (8, 1)
+
+
+def test_loader_memoizes_the_reads():
+    fetch = Fetch()
+    loader = RequestLoader(fetch)
+    first = loader.get("payment", 1)
+    assert loader.get("payment", "1") is first
+    loader.get("merchant_order", 1)
+    assert fetch.calls == [("payment", 1), ("merchant_order", 1)]
+    assert loader.batches == 2
+
+
+def test_loader_errors_are_not_memoized(executor):
+    fetch = Fetch()
+    loader = RequestLoader(fetch, executor)
+    loader.prefetch("payment", ["boom", 1])
+    with pytest.raises(ConnectionError):
+        loader.get("payment", "boom")
+    assert loader.get("payment", 1)["status"] == 200
+    with pytest.raises(ConnectionError):
+        loader.get("payment", "boom")
+    assert fetch.calls.count(("payment", "boom")) == 2
+
+
+def test_loader_keeps_the_priority(executor):
+    priorities = []
+
+    def fetch(name, resource_id):
+        priorities.append(current_priority())
+        return {"status": 200, "response": {"id": resource_id}}
+
+    with priority("batch"):
+        loader = RequestLoader(fetch, executor)
+        loader.prefetch("payment", range(4))
+        loader.get("payment", 0)
+    assert priorities == ["batch"] * 4
+
+
+def test_mercadopago_loader():
+    with StubServer(latency=0.05) as stub:
+        app = Flask(__name__)
+        app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+        app.config["BASE_URL"] = stub.url + "/v1"
+        mercadopago = Mercadopago(app)
+        with app.test_request_context():
+            loader = mercadopago.loader
+            assert mercadopago.loader is loader
+            loader.prefetch("payment", range(1, 11))
+            started = time.monotonic()
+            results = loader.get_many("payment", range(1, 11))
+            elapsed = time.monotonic() - started
+            assert loader.get("payment", 5) is results[4]
+            assert [r["response"]["id"] for r in results] == list(range(1, 11))
+            assert stub.requests == 10
+        assert elapsed < 0.4
+        with app.test_request_context():
+            assert mercadopago.loader is not loader
+            mercadopago.loader.get("payment", 5)
+            assert stub.requests == 11
+        with app.app_context():
+            mercadopago.transport.close()
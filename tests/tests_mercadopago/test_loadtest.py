@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from flask_mercadopago import (
+    SCENARIOS,
+    SellerClient,
+    StubServer,
+    create_transport,
+    percentile,
+    run_load,
+)
+
+import pytest
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    "values, q, expected",
+    [
+        ([], 50, 0.0),
+        ([1.0], 99, 1.0),
+        ([1.0, 2.0, 3.0, 4.0], 50, 2.0),
+        ([1.0, 2.0, 3.0, 4.0], 90, 4.0),
+        (list(range(1, 101)), 99, 99),
+    ],
+)
+def test_percentile(values, q, expected):
+    assert percentile(values, q) == expected
+
+
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+def test_run_load(app, mercadopago, scenario):
+    with StubServer() as stub:
+        app.config["BASE_URL"] = stub.url + "/v1"
+        transport = create_transport(app.config)
+        client = SellerClient("loadtest", "TEST-token", transport)
+        report = run_load(SCENARIOS[scenario], client, 2, iterations=3)
+        transport.close()
+    assert report["iterations"] == 6
+    assert report["errors"] == 0
+    assert report["p50"] <= report["p99"] <= report["max"]
+    assert stub.requests >= 6
+
+
+def test_run_load_counts_errors():
+    def scenario(client):
+        raise RuntimeError()
+
+    report = run_load(scenario, None, 1, duration=0.01)
+    assert report["errors"] == report["iterations"] > 0
+    with pytest.raises(ValueError):
+        run_load(scenario, None, 1)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import threading
+
+from flask import Flask
+
+from flask_mercadopago import (
+    LookupCache,
+    Mercadopago,
+    StubServer,
+    notification_received,
+    parse_notification,
+)
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture
+def stub_app():
+    with StubServer() as stub:
+        app = Flask(__name__)
+        app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+        app.config["BASE_URL"] = stub.url + "/v1"
+        app.config["MERCADOPAGO_NOTIFICATION_ROUTE"] = "/notify"
+        mercadopago = Mercadopago(app)
+        yield app, mercadopago, stub
+        with app.app_context():
+            mercadopago.transport.close()
+
+
+def result(status="approved"):
+    return {"status": 200, "response": {"id": 1, "status": status}}
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    "args, body, expected",
+    [
+        ({}, {"type": "payment", "data": {"id": "12"}}, ("payment", "12")),
+        ({"type": "payment", "data.id": "12"}, None, ("payment", "12")),
+        ({"topic": "merchant_order", "id": 7}, None, ("merchant_order", "7")),
+        (
+            {},
+            {
+                "topic": "merchant_order",
+                "resource": "https://api.mercadolibre.com/merchant_orders/7",
+            },
+            ("merchant_order", "7"),
+        ),
+        (
+            {},
+            {"type": "topic_merchant_order_wh", "id": 7},
+            ("merchant_order", "7"),
+        ),
+        ({"topic": "chargebacks", "id": 3}, None, None),
+        ({"topic": "payment"}, "not a dict", None),
+    ],
+)
+def test_parse_notification(args, body, expected):
+    assert parse_notification(args, body) == expected
+
+
+def test_lookup_cache():
+    cache = LookupCache(2)
+    loads = []
+
+    def loader(status="approved"):
+        return lambda: loads.append(status) or result(status)
+
+    first = cache.get("payment", 1, loader())
+    first["response"]["status"] = "changed"
+    assert cache.get("payment", "1", loader()) == result()
+    assert loads == ["approved"]
+    cache.invalidate("payment", 1)
+    assert cache.get("payment", 1, loader("refunded")) == result("refunded")
+    cache.put("payment", 2, result("x"))
+    cache.put("payment", 3, result("y"))
+    assert cache.get("payment", 1, loader("evicted")) == result("evicted")
+    assert cache.get("payment", 4, lambda: {"status": 404}) == {"status": 404}
+    assert cache.stats() == {
+        "size": 2,
+        "hits": 1,
+        "misses": 4,
+        "invalidations": 1,
+    }
+
+
+def test_lookup_cache_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    cache = LookupCache(10, ttl=5)
+    cache.put("payment", 1, result())
+    assert cache.get("payment", 1, lambda: result("new")) == result()
+    now[0] += 5
+    assert cache.get("payment", 1, lambda: result("new")) == result("new")
+
+
+def test_invalidation_during_a_load():
+    cache = LookupCache(10)
+    loading, invalidated = threading.Event(), threading.Event()
+
+    def slow_loader():
+        loading.set()
+        invalidated.wait(5)
+        return result("stale")
+
+    thread = threading.Thread(
+        target=cache.get, args=("payment", 1, slow_loader)
+    )
+    thread.start()
+    loading.wait(5)
+    cache.invalidate("payment", 1)
+    invalidated.set()
+    thread.join()
+    assert cache.get("payment", 1, lambda: result("fresh")) == result("fresh")
+
+
+def test_lookup_and_notifications(stub_app):
+    app, mercadopago, stub = stub_app
+    received = []
+
+    def on_notification(sender, **kwargs):
+        received.append(kwargs)
+
+    with app.app_context():
+        assert mercadopago.lookup("payment", 5)["response"]["id"] == 5
+        assert mercadopago.lookup("payment", 5)["response"]["id"] == 5
+        assert stub.requests == 1
+        with pytest.raises(ValueError):
+            mercadopago.lookup("customer", 5)
+
+    with notification_received.connected_to(on_notification, app):
+        response = app.test_client().post(
+            "/notify", json={"type": "payment", "data": {"id": "5"}}
+        )
+        assert response.status_code == 200
+        app.test_client().post("/notify?topic=chargebacks&id=1")
+    assert received == [{"name": "payment", "resource_id": "5"}]
+
+    with app.app_context():
+        mercadopago.lookup("payment", 5)
+        assert stub.requests == 2
+        assert mercadopago.handle_notification(
+            {"topic": "payment", "id": "5"}, refresh=True
+        ) == ("payment", "5")
+        assert stub.requests == 3
+        mercadopago.lookup("payment", 5)
+        assert stub.requests == 3
+        assert mercadopago.stats()["lookups"]["invalidations"] == 2
+
+
+def test_poller_feeds_the_lookups(stub_app):
+    app, mercadopago, stub = stub_app
+    app.config["MERCADOPAGO_POLL_MIN_INTERVAL"] = 60
+    with app.app_context():
+        poller = mercadopago.order_poller
+        assert poller.wait(7, timeout=5)["id"] == 7
+        assert stub.requests == 1
+        assert mercadopago.lookup("merchant_order", 7)["response"]["id"] == 7
+        assert stub.requests == 1
+        poller.watch(7, lambda *args: None)
+        mercadopago.handle_notification({"topic": "merchant_order", "id": 7})
+        for _ in range(100):
+            if poller.stats()["polls"] == 2:
+                break
+            threading.Event().wait(0.01)
+        assert poller.stats()["polls"] == 2
+        assert not poller.poke(8)
+        poller.stop()
@@ -21,12 +21,23 @@ Implementation of Mercadopago API OAuth in Flask.
 # IMPORTS
 # =====================================================================
 
-from flask import current_app, redirect, request
+import threading
 
-from flask_mercadopago import scripts_with_sri, simple_scripts_js
+from flask import Flask, current_app, redirect, request
+
+from flask_mercadopago import (
+    Mercadopago,
+    PooledHttpClient,
+    create_transport,
+    scripts_with_sri,
+    simple_scripts_js,
+)
+from flask_mercadopago import core
 
 from markupsafe import Markup
 
+from mercadopago.http import HttpClient
+
 import pytest
 
 # =====================================================================
@@ -205,3 +216,78 @@ class TestMercadopago:
 
     def api_get_identification_types(self):
         pass
+
+    def test_accessors_share_the_transport(self, app, mercadopago):
+        app.config["APP_ACCESS_TOKEN"] = "foo"
+        transport = mercadopago.transport
+        assert isinstance(transport, HttpClient)
+        assert mercadopago.transport is transport
+        res = mercadopago.payment()
+        assert res._MPBase__http_client is transport
+        http_client = HttpClient()
+        res = mercadopago.payment(http_client=http_client)
+        assert res._MPBase__http_client is http_client
+
+    def test_create_transport(self, app):
+        app.config["MERCADOPAGO_TRANSPORT"] = "sdk"
+        assert isinstance(create_transport(app.config), HttpClient)
+        app.config["MERCADOPAGO_TRANSPORT"] = "pooled"
+        app.config["MERCADOPAGO_POOL_MAXSIZE"] = 3
+        transport = create_transport(app.config)
+        assert transport.maxsize == 3
+        assert transport.resolver.ttl == 300
+        app.config["MERCADOPAGO_DNS_TTL"] = 0
+        assert create_transport(app.config).resolver is None
+        app.config["MERCADOPAGO_TRANSPORT"] = "foo"
+        with pytest.raises(ValueError):
+            create_transport(app.config)
+
+    def test_warmup(self, app, mercadopago, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            PooledHttpClient,
+            "warmup",
+            lambda self, urls, connections: calls.append((urls, connections)),
+        )
+        assert mercadopago.warmup(app) == 0
+        app.config["MERCADOPAGO_TRANSPORT"] = "pooled"
+        app.extensions["mercadopago_state"]._transport = None
+        mercadopago.warmup(app)
+        app.config["TOKEN_ENDPOINT"] = "https://auth.test/oauth/token"
+        mercadopago.warmup(connections=5)
+        assert calls == [
+            (["https://api.mercadopago.com"], 2),
+            (["https://api.mercadopago.com", "https://auth.test"], 5),
+        ]
+
+    def test_warmup_in_init_app(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            Mercadopago, "warmup", lambda self, app: calls.append(app)
+        )
+        app = Flask(__name__)
+        app.config["MERCADOPAGO_WARMUP"] = True
+        Mercadopago(app)
+        assert calls == [app]
+
+    def test_warmup_after_fork(self, monkeypatch):
+        warmed = threading.Event()
+        calls = []
+
+        def warmup(self, app):
+            calls.append(app)
+            warmed.set()
+
+        monkeypatch.setattr(Mercadopago, "warmup", warmup)
+        app = Flask(__name__)
+        app.config["MERCADOPAGO_WARMUP_AFTER_FORK"] = True
+        Mercadopago(app)
+        other = Flask(__name__)
+        Mercadopago(other)
+        assert app.extensions["mercadopago_state"] in core._WARMUP_AFTER_FORK
+        assert other.extensions["mercadopago_state"] not in (
+            core._WARMUP_AFTER_FORK
+        )
+        core._warmup_after_fork()
+        assert warmed.wait(1)
+        assert app in calls
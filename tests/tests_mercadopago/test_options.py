@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from concurrent.futures import ThreadPoolExecutor
+
+from flask_mercadopago import FrozenRequestOptions, freeze
+
+from mercadopago.config import RequestOptions
+
+import pytest
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_frozen_request_options():
+    headers = {"x-foo": "1"}
+    options = FrozenRequestOptions(
+        access_token="A", custom_headers=headers, max_retries=1
+    )
+    headers["x-foo"] = "2"
+    assert options.custom_headers["x-foo"] == "1"
+    assert options.get_headers()["Authorization"] == "Bearer A"
+    assert options.get_headers()["x-foo"] == "1"
+    with pytest.raises(AttributeError):
+        options.access_token = "B"
+    with pytest.raises(AttributeError):
+        del options.max_retries
+    with pytest.raises(TypeError):
+        options.custom_headers["x-foo"] = "3"
+
+    other = options.replace(max_retries=5)
+    assert (other.access_token, other.max_retries) == ("A", 5)
+    assert options.max_retries == 1
+    with pytest.raises(ValueError):
+        options.replace(max_retries="5")
+
+
+def test_with_access_token():
+    options = FrozenRequestOptions(access_token="A", connection_timeout=5.0)
+    assert options.with_access_token("A") is options
+    derived = options.with_access_token("B")
+    assert derived.access_token == "B"
+    assert derived.connection_timeout == 5.0
+    assert options.with_access_token("B") is derived
+    assert options.access_token == "A"
+
+
+def test_freeze():
+    options = RequestOptions(access_token="A", integrator_id="dev")
+    frozen = freeze(options)
+    assert isinstance(frozen, FrozenRequestOptions)
+    assert frozen.as_dict()["integrator_id"] == "dev"
+    assert freeze(frozen) is frozen
+    assert freeze(frozen, access_token="B").access_token == "B"
+    assert freeze(options, access_token="B").access_token == "B"
+    assert options.access_token == "A"
+
+
+@pytest.mark.usefixtures("client")
+def test_accessors_do_not_modify_request_options(app, mercadopago):
+    app.config["APP_ACCESS_TOKEN"] = "APP"
+    shared = FrozenRequestOptions(custom_headers={"x-foo": "1"})
+
+    def options_of_call(_):
+        with app.app_context():
+            res = mercadopago.payment(request_options=shared)
+            return res._MPBase__request_options
+
+    with ThreadPoolExecutor(8) as pool:
+        used = set(map(id, pool.map(options_of_call, range(64))))
+    assert len(used) == 1
+    assert shared.access_token is None
+    derived = mercadopago.payment(request_options=shared)
+    assert derived._MPBase__request_options.access_token == "APP"
+
+    plain = RequestOptions(access_token="OTHER")
+    res = mercadopago.preference(request_options=plain)
+    assert plain.access_token == "OTHER"
+    assert res._MPBase__request_options.access_token == "APP"
+    plain = RequestOptions(access_token="APP")
+    res = mercadopago.preference(request_options=plain)
+    assert res._MPBase__request_options is plain
+
+    default = mercadopago.payment()._MPBase__request_options
+    assert mercadopago.card()._MPBase__request_options is default
+
+
+@pytest.mark.usefixtures("client")
+def test_missing_access_token(app, mercadopago):
+    with pytest.raises(ValueError):
+        mercadopago.payment()
+    with pytest.raises(ValueError):
+        mercadopago.payment(request_options=RequestOptions())
+    with pytest.raises(ValueError):
+        FrozenRequestOptions().with_access_token(None)
+
+
+@pytest.mark.usefixtures("client")
+def test_plain_request_options_are_frozen_once(app, mercadopago):
+    app.config["APP_ACCESS_TOKEN"] = "APP"
+    plain = RequestOptions(access_token="OTHER", custom_headers={"x": "1"})
+    first = mercadopago.payment(request_options=plain)
+    second = mercadopago.card(request_options=plain)
+    assert first._MPBase__request_options is second._MPBase__request_options
+    plain.custom_headers = {"x": "2"}
+    third = mercadopago.payment(request_options=plain)._MPBase__request_options
+    assert third.custom_headers["x"] == "2"
+    app.config["APP_ACCESS_TOKEN"] = "NEW"
+    fourth = mercadopago.payment(
+        request_options=plain
+    )._MPBase__request_options
+    assert fourth.access_token == "NEW"
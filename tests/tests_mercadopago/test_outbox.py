@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import threading
+import time
+
+from flask import Flask
+
+from flask_mercadopago import (
+    CircuitBreaker,
+    Mercadopago,
+    Outbox,
+    OutboxHandle,
+    current_priority,
+)
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+class Send(object):
+    """Fake ``send`` failing the first ``failures`` calls."""
+
+    def __init__(self, failures=0, status=201):
+        self.failures = failures
+        self.status = status
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, resource, data, key):
+        with self.lock:
+            self.calls.append((resource, data, key))
+            if len(self.calls) <= self.failures:
+                raise ConnectionError("down")
+        return {"status": self.status, "response": dict(data, id=1)}
+
+
+class Transport(object):
+    """Fake transport recording the headers of the calls."""
+
+    def __init__(self):
+        self.headers = []
+
+    def post(self, url, headers, data=None, **kwargs):
+        self.headers.append(headers)
+        return {"status": 201, "response": {"id": 7}}
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.db"), Send(), backoff=0.01)
+    yield outbox
+    outbox.close()
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_breaker():
+    breaker = CircuitBreaker(threshold=2, reset_timeout=0.05)
+    breaker.failure()
+    assert breaker.allow()
+    breaker.failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert 0 < breaker.retry_in() <= 0.05
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.failure()
+    assert breaker.state == "open"
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.success()
+    assert breaker.state == "closed"
+    assert breaker.retry_in() == 0
+    assert breaker.stats() == {"state": "closed", "failures": 0, "trips": 1}
+
+
+def test_submit(outbox):
+    handle = outbox.submit("preference", {"items": []})
+    assert isinstance(handle, OutboxHandle)
+    assert handle.wait(5) == {
+        "status": 201,
+        "response": {"items": [], "id": 1},
+    }
+    assert handle.state == "sent"
+    assert outbox.send.calls == [("preference", {"items": []}, handle.key)]
+    assert len(outbox) == 0
+    stats = outbox.stats()
+    assert stats["sent"] == 1
+    assert stats["pending"] == stats["inflight"] == 0
+    assert stats["breaker"]["state"] == "closed"
+
+
+def test_close_waits_for_the_sends(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    sending, release = threading.Event(), threading.Event()
+    priorities = []
+
+    def send(resource, data, key):
+        priorities.append(current_priority())
+        sending.set()
+        release.wait(5)
+        return {"status": 201, "response": {"id": 1}}
+
+    outbox = Outbox(path, send)
+    handle = outbox.submit("preference", {"items": []})
+    assert sending.wait(5)
+    outbox.stop()
+    closing = threading.Thread(target=outbox.close)
+    closing.start()
+    closing.join(0.1)
+    assert closing.is_alive()
+    release.set()
+    closing.join(5)
+    assert not closing.is_alive()
+    assert priorities == ["default"]
+    other = Outbox(path, send)
+    assert other.get(handle.key)["state"] == "sent"
+    other.close()
+
+
+def test_no_wakeups_while_sending(tmp_path):
+    release = threading.Event()
+    waits = []
+
+    class Condition(type(threading.Condition())):
+        def wait(self, timeout=None):
+            waits.append(timeout)
+            return super().wait(timeout)
+
+    def send(resource, data, key):
+        release.wait(5)
+        return {"status": 201, "response": {"id": 1}}
+
+    outbox = Outbox(str(tmp_path / "outbox.db"), send)
+    outbox._cond = Condition()
+    handle = outbox.submit("preference", {"items": []})
+    time.sleep(0.3)
+    assert len(waits) <= 2
+    release.set()
+    assert handle.wait(5)["status"] == 201
+    outbox.close()
+
+
+def test_same_key(outbox):
+    outbox.stop()
+    outbox.submit("preference", {"items": [1]}, key="cart-1")
+    outbox.submit("preference", {"items": [2]}, key="cart-1")
+    assert len(outbox) == 1
+    outbox.start()
+    assert OutboxHandle(outbox, "cart-1").wait(5)["response"]["items"] == [1]
+
+
+def test_retry_with_same_key(tmp_path):
+    send = Send(failures=2)
+    with_retries = Outbox(str(tmp_path / "outbox.db"), send, backoff=0.01)
+    handle = with_retries.submit("payment", {"amount": 10})
+    assert handle.wait(5)["status"] == 201
+    assert {call[2] for call in send.calls} == {handle.key}
+    assert with_retries.get(handle.key)["attempts"] == 3
+    with_retries.close()
+
+
+def test_client_error(tmp_path):
+    send = Send(status=400)
+    outbox = Outbox(str(tmp_path / "outbox.db"), send)
+    handle = outbox.submit("preference", {"items": []})
+    assert handle.wait(5)["status"] == 400
+    assert handle.state == "failed"
+    assert len(send.calls) == 1
+    outbox.close()
+
+
+def test_max_attempts(tmp_path):
+    send = Send(failures=10)
+    outbox = Outbox(
+        str(tmp_path / "outbox.db"), send, backoff=0.01, max_attempts=2
+    )
+    handle = outbox.submit("preference", {"items": []})
+    deadline = time.monotonic() + 5
+    while handle.state == "pending" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert handle.state == "failed"
+    assert len(send.calls) == 2
+    outbox.close()
+
+
+def test_open_circuit(tmp_path):
+    send = Send(failures=100)
+    breaker = CircuitBreaker(threshold=1, reset_timeout=60)
+    outbox = Outbox(str(tmp_path / "outbox.db"), send, breaker=breaker)
+    first = outbox.submit("preference", {"items": []})
+    started = time.monotonic()
+    assert first.wait(5) is None
+    second = outbox.submit("preference", {"items": []})
+    assert second.wait(5) is None
+    assert time.monotonic() - started < 1
+    assert len(send.calls) == 1
+    assert second.state == "pending"
+    assert outbox.stats()["breaker"]["state"] == "open"
+    outbox.close()
+
+
+def test_recover_after_crash(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    crashed = Outbox(path, Send())
+    crashed.stop()
+    key = crashed.submit("preference", {"items": []}).key
+    crashed.close()
+    send = Send()
+    outbox = Outbox(path, send)
+    assert outbox._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    outbox.start()
+    assert OutboxHandle(outbox, key).wait(5)["status"] == 201
+    assert send.calls[0][2] == key
+    outbox.close()
+
+
+def test_mercadopago_outbox(tmp_path):
+    app = Flask(__name__)
+    app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+    app.config["MERCADOPAGO_OUTBOX_FILE"] = str(tmp_path / "outbox.db")
+    mercadopago = Mercadopago(app)
+    transport = Transport()
+    mercadopago._get_state(app)._transport = transport
+    with app.app_context():
+        handle = mercadopago.outbox.submit("preference", {"items": []})
+        assert handle.wait(5) == {"status": 201, "response": {"id": 7}}
+        assert mercadopago.stats()["outbox"]["sent"] == 1
+    assert transport.headers[0]["x-idempotency-key"] == handle.key
+    assert transport.headers[0]["Authorization"] == "Bearer TEST-token"
+    mercadopago._get_state(app).outbox.close()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import threading
+
+from flask_mercadopago import OrderPoller, StubServer, merchant_order_changed
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+class Orders(object):
+    """Fake ``merchant_order().get`` following a list of states."""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, order_id):
+        with self.lock:
+            self.calls.append(order_id)
+            status = (
+                self.statuses.pop(0)
+                if len(self.statuses) > 1
+                else (self.statuses[0])
+            )
+        if status is None:
+            return {"status": 404, "response": {}}
+        return {
+            "status": 200,
+            "response": {"id": order_id, "status": status},
+        }
+
+
+@pytest.fixture
+def make_poller():
+    pollers = []
+
+    def make(fetch, **kwargs):
+        kwargs.setdefault("min_interval", 0.01)
+        kwargs.setdefault("max_interval", 0.05)
+        pollers.append(OrderPoller(fetch, **kwargs))
+        return pollers[-1]
+
+    yield make
+    for poller in pollers:
+        poller.stop()
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_wait_until_final(make_poller):
+    fetch = Orders("opened", "opened", "opened", "closed")
+    poller = make_poller(fetch)
+    order = poller.wait(1, timeout=5, final=True)
+    assert order == {"id": 1, "status": "closed"}
+    assert fetch.calls == [1, 1, 1, 1]
+    assert poller.stats() == {
+        "watched": 0,
+        "waiting": 0,
+        "polls": 4,
+        "errors": 0,
+        "changes": 2,
+    }
+
+
+def test_watchers_are_deduplicated(make_poller):
+    fetch = Orders("opened", "opened", "closed")
+    poller = make_poller(fetch, min_interval=0.05)
+    changes = []
+    poller.watch(1, lambda *args: changes.append(args))
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(poller.wait(1, 5, final=True))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [{"id": 1, "status": "closed"}] * 8
+    assert fetch.calls == [1, 1, 1]
+    assert changes == [
+        (1, {"id": 1, "status": "opened"}, None),
+        (1, {"id": 1, "status": "closed"}, {"id": 1, "status": "opened"}),
+    ]
+
+
+def test_backoff_and_max_age(make_poller):
+    fetch = Orders("opened")
+    poller = make_poller(
+        fetch, min_interval=0.01, max_interval=0.04, backoff=2, max_age=0.3
+    )
+    assert poller.wait(1, timeout=5, final=True) == {
+        "id": 1,
+        "status": "opened",
+    }
+    # 0.01, 0.02, 0.04, 0.04... instead of a poll every 0.01 seconds
+    assert 4 <= len(fetch.calls) <= 12
+
+
+def test_errors_are_retried(make_poller):
+    fetch = Orders(None, None, "closed")
+    poller = make_poller(fetch)
+    assert poller.wait(1, timeout=5) == {"id": 1, "status": "closed"}
+    assert poller.stats()["errors"] == 2
+
+
+def test_wait_for_a_change(make_poller):
+    fetch = Orders("opened", "opened", "paid")
+    poller = make_poller(fetch)
+    assert poller.wait(1, timeout=5) == {"id": 1, "status": "paid"}
+    assert fetch.calls == [1, 1, 1]
+
+
+def test_poke_during_a_poll_is_kept(make_poller):
+    polling, proceed, polled_again = (threading.Event() for _ in range(3))
+
+    def fetch(order_id):
+        if polling.is_set():
+            polled_again.set()
+        else:
+            polling.set()
+            proceed.wait(5)
+        return {"status": 200, "response": {"id": 1, "status": "opened"}}
+
+    poller = make_poller(fetch, min_interval=30, max_interval=30)
+    poller.watch(1)
+    assert polling.wait(5)
+    assert poller.poke(1)
+    proceed.set()
+    assert polled_again.wait(5)
+
+
+def test_update_errors_are_logged(make_poller, caplog):
+    sender = object()
+    changes = []
+
+    def on_change(sender, **kwargs):
+        changes.append(kwargs["order"]["status"])
+        if len(changes) == 1:
+            raise RuntimeError("boom")
+
+    poller = make_poller(Orders("opened", "paid", "closed"), sender=sender)
+    with merchant_order_changed.connected_to(on_change, sender):
+        assert poller.wait(1, timeout=5, final=True)["status"] == "closed"
+    assert changes == ["opened", "paid", "closed"]
+    assert "Updating merchant order 1 failed" in caplog.text
+
+
+def test_wait_timeout_and_unwatch(make_poller):
+    fetch = Orders("opened")
+    poller = make_poller(fetch, min_interval=10)
+    assert poller.wait(1, timeout=0.2) == {"id": 1, "status": "opened"}
+    assert poller.wait(1, timeout=0.05) == {"id": 1, "status": "opened"}
+    callback = lambda *args: None  # noqa: E731
+    poller.watch(2, callback)
+    poller.watch(2, callback)
+    assert poller.stats()["watched"] == 1
+    poller.unwatch(2, callback)
+    poller.unwatch(3)
+    assert poller.stats()["watched"] == 0
+
+
+def test_callback_errors_are_logged(make_poller, caplog):
+    poller = make_poller(Orders("closed"))
+
+    def fail(*args):
+        raise RuntimeError("boom")
+
+    called = threading.Event()
+    poller.watch(1, fail)
+    poller.watch(1, lambda *args: called.set())
+    assert called.wait(5)
+    assert "Callback of merchant order 1" in caplog.text
+
+
+def test_extension_poller(app, mercadopago):
+    received = []
+    sent = threading.Event()
+
+    def on_change(sender, **kwargs):
+        received.append((sender, kwargs["order_id"], kwargs["previous"]))
+        sent.set()
+
+    with StubServer() as stub:
+        app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+        app.config["BASE_URL"] = stub.url + "/v1"
+        app.config["MERCADOPAGO_POLL_MIN_INTERVAL"] = 0.01
+        app.config["MERCADOPAGO_POLL_MAX_INTERVAL"] = 10
+        app.config["MERCADOPAGO_POLL_BACKOFF"] = 1000
+        with merchant_order_changed.connected_to(on_change, app):
+            with app.app_context():
+                mercadopago.order_poller.watch(7)
+                assert sent.wait(5)
+                order = mercadopago.order_poller.wait(7, timeout=0)
+                assert order["id"] == 7
+                assert mercadopago.stats()["poller"]["polls"] == 1
+                mercadopago.order_poller.stop()
+                mercadopago.transport.close()
+    assert received == [(app, 7, None)]
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from flask_mercadopago import ORDER_OUTCOMES, reconcile, to_columns
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+def payment(payment_id, reference, amount, status="approved", refunded=0):
+    return {
+        "id": payment_id,
+        "external_reference": reference,
+        "status": status,
+        "transaction_amount": amount,
+        "transaction_amount_refunded": refunded,
+    }
+
+
+PAYMENTS = [
+    payment(1, "order-1", 100.0),
+    payment(2, "order-2", 50.0),
+    payment(3, "order-2", 50.0),
+    payment(4, "order-3", 10.0, status="rejected"),
+    payment(5, "order-4", 30.0, status="in_process"),
+    payment(6, "order-5", 80.0),
+    payment(7, "unknown", 5.0),
+    payment(8, None, 5.0),
+    payment(9, "order-6", 100.0, refunded=100.0),
+    payment(10, "order-7", 19.995),
+]
+
+ORDERS = {
+    "order-1": 100.0,
+    "order-2": 50.0,
+    "order-3": 10.0,
+    "order-4": 30.0,
+    "order-5": 90.0,
+    "order-6": 100.0,
+    "order-7": 20.0,
+}
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_reconcile_outcomes():
+    result = reconcile(PAYMENTS, ORDERS)
+    assert len(result) == 7
+    outcomes = [ORDER_OUTCOMES[code] for code in result.outcomes]
+    assert outcomes == [
+        "matched",
+        "overpaid",
+        "unpaid",
+        "pending",
+        "underpaid",
+        "underpaid",
+        "matched",
+    ]
+    assert result.received.tolist() == [100.0, 100.0, 0, 0, 80.0, 0, 19.995]
+    assert result.orphans.tolist() == [7, 8]
+
+
+def test_reconcile_summary_and_mismatches():
+    result = reconcile(PAYMENTS, ORDERS)
+    assert result.summary() == {
+        "matched": 2,
+        "unpaid": 1,
+        "pending": 1,
+        "underpaid": 2,
+        "overpaid": 1,
+        "orphans": 2,
+    }
+    mismatches = result.mismatches()
+    assert [m["external_reference"] for m in mismatches] == [
+        "order-2",
+        "order-3",
+        "order-4",
+        "order-5",
+        "order-6",
+    ]
+    assert mismatches[0] == {
+        "external_reference": "order-2",
+        "outcome": "overpaid",
+        "expected": 50.0,
+        "received": 100.0,
+        "payments": 2,
+    }
+
+
+def test_reconcile_tolerance():
+    result = reconcile(PAYMENTS, {"order-7": 20.0}, tolerance=0.001)
+    assert result.summary()["underpaid"] == 1
+
+
+def test_reconcile_columns_and_pairs():
+    columns = {
+        name: np.asarray(values)
+        for name, values in to_columns(PAYMENTS[:3]).items()
+        if name in ("id", "status", "transaction_amount")
+    }
+    columns["external_reference"] = np.array(["order-1", "order-2", "x"])
+    result = reconcile(columns, [("order-2", 50.0), ("order-1", 100.0)])
+    assert result.summary()["matched"] == 2
+    assert result.orphans.tolist() == [3]
+
+
+def test_reconcile_empty():
+    assert reconcile([], {"order-1": 1.0}).summary()["unpaid"] == 1
+    result = reconcile(PAYMENTS, {})
+    assert len(result) == 0
+    assert len(result.orphans) == 8
+
+
+def test_reconcile_requires_numpy(monkeypatch):
+    monkeypatch.setattr(
+        "flask_mercadopago.reconciliation._import_numpy", lambda: None
+    )
+    with pytest.raises(RuntimeError):
+        reconcile(PAYMENTS, ORDERS)
+
+
+def test_reconcile_repeated_references():
+    result = reconcile(PAYMENTS, [("order-1", 100.0), ("order-1", 100.0)])
+    assert [ORDER_OUTCOMES[code] for code in result.outcomes] == [
+        "matched",
+        "unpaid",
+    ]
+
+
+def test_reconcile_records_iterator(monkeypatch):
+    records = iter(PAYMENTS + [{"id": 11, "status": "approved"}])
+    result = reconcile(records, ORDERS)
+    assert result.orphans.tolist() == [7, 8, 11]
+    # the result is usable before numpy is imported by a reconciliation
+    monkeypatch.setattr("flask_mercadopago.reconciliation.numpy", None)
+    assert result.summary()["orphans"] == 3
+    assert len(result.mismatches()) == 5
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from flask_mercadopago import (
+    Mercadopago,
+    RESOURCES,
+    SellerClient,
+    StubServer,
+    register_resource,
+    resource_class,
+    resource_path,
+    unregister_resource,
+)
+
+from mercadopago.config import RequestOptions
+from mercadopago.core import MPBase
+from mercadopago.http import HttpClient
+from mercadopago.resources import Payment
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+class Dispute(MPBase):
+    def get(self, dispute_id):
+        return self._get(uri=f"/v1/chargebacks/{dispute_id}")
+
+
+@pytest.fixture
+def dispute():
+    register_resource("dispute", Dispute)
+    yield
+    unregister_resource("dispute")
+
+
+@pytest.fixture
+def stub_app(app, mercadopago):
+    with StubServer() as stub:
+        app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+        app.config["BASE_URL"] = stub.url + "/v1"
+        with app.app_context():
+            yield app
+            mercadopago.transport.close()
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_resource_class():
+    assert resource_class("payment") is Payment
+    assert resource_path("payment") == "mercadopago.resources.Payment"
+    assert set(RESOURCES) <= set(dir(Mercadopago))
+    assert set(RESOURCES) <= set(dir(SellerClient))
+    assert "mercadopago.resources.Payment" in Mercadopago.payment.__doc__
+
+
+def test_register_resource(stub_app, mercadopago, dispute):
+    assert resource_path("dispute") == f"{__name__}.Dispute"
+    res = mercadopago.dispute()
+    assert isinstance(res, Dispute)
+    assert res.get(1)["status"] == 200
+    seller = SellerClient(1, "TOKEN-1", mercadopago.transport)
+    assert seller.dispute().get(1)["status"] == 200
+    assert "dispute" in Mercadopago.dispute.__qualname__
+
+
+def test_register_resource_errors(dispute):
+    with pytest.raises(ValueError):
+        register_resource("dispute", Dispute)
+    with pytest.raises(ValueError):
+        register_resource("transport", Dispute)
+    with pytest.raises(ValueError):
+        register_resource("not valid", Dispute)
+    with pytest.raises(ValueError):
+        register_resource("_private", Dispute)
+    with pytest.raises(ValueError):
+        unregister_resource("payment")
+    assert "payment" in RESOURCES
+    assert hasattr(Mercadopago, "payment")
+    unregister_resource("dispute")
+    assert not hasattr(Mercadopago, "dispute")
+    assert not hasattr(SellerClient, "dispute")
+    register_resource("dispute", f"{__name__}.Dispute")
+    assert resource_class("dispute") is Dispute
+
+
+@pytest.mark.usefixtures("client")
+def test_resources_are_reused(app, mercadopago):
+    app.config["APP_ACCESS_TOKEN"] = "TOKEN-1"
+    payment = mercadopago.payment()
+    assert mercadopago.payment() is payment
+    assert payment._MPBase__request_options.access_token == "TOKEN-1"
+    assert payment._MPBase__http_client is mercadopago.transport
+    app.config["APP_ACCESS_TOKEN"] = "TOKEN-2"
+    assert mercadopago.payment() is not payment
+    http_client = HttpClient()
+    res = mercadopago.payment(http_client=http_client)
+    assert res._MPBase__http_client is http_client
+    assert res is not mercadopago.payment(http_client=http_client)
+    options = RequestOptions(access_token="TOKEN-2")
+    res = mercadopago.resource("payment", request_options=options)
+    assert res._MPBase__request_options is options
+
+
+@pytest.mark.usefixtures("client")
+def test_resource_hook(app, mercadopago):
+    app.config["APP_ACCESS_TOKEN"] = "TOKEN-1"
+    calls = []
+    payment = mercadopago.payment()
+
+    @mercadopago.resource_hook
+    def hook(name, res):
+        calls.append(name)
+
+    @mercadopago.resource_hook
+    def wrap(name, res):
+        return ("wrapped", res)
+
+    wrapped = mercadopago.payment()
+    assert wrapped[0] == "wrapped" and wrapped[1] is not payment
+    assert mercadopago.payment() is wrapped
+    assert calls == ["payment"]
+    seller = mercadopago.for_seller(1, "TOKEN-1")
+    assert seller.preference()[0] == "wrapped"
+    assert calls == ["payment", "preference"]
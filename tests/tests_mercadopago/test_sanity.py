@@ -43,3 +43,36 @@ def test_can_initialize_app_and_extesion_with_factory_func():
     app = Flask(__name__)
     mercadopago = Mercadopago()
     mercadopago.init_app(app)
+
+
+def test_import_does_not_load_the_sdk():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "from flask import Flask\n"
+        "from flask_mercadopago import Mercadopago\n"
+        "Mercadopago(Flask('app'))\n"
+        "names = ('mercadopago', 'requests', 'urllib3', 'httpx')\n"
+        "print(','.join(n for n in names if n in sys.modules))\n"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+    assert output.strip() == ""
+
+
+def test_lazy_names():
+    import flask_mercadopago
+    from flask_mercadopago import core
+
+    from mercadopago.resources import Payment
+
+    import pytest
+
+    assert flask_mercadopago.StubServer.__module__ == "flask_mercadopago.stub"
+    assert flask_mercadopago.Payment is Payment
+    assert core.Payment is Payment
+    assert "SellerClient" in dir(flask_mercadopago)
+    for module in (flask_mercadopago, core):
+        with pytest.raises(AttributeError):
+            module.foo
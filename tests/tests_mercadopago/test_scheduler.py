@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import threading
+import time
+
+from flask import Flask
+
+from flask_mercadopago import (
+    Mercadopago,
+    OutboundScheduler,
+    ScheduledHttpClient,
+    StubServer,
+    current_priority,
+    priority,
+)
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+def start(target, *args):
+    thread = threading.Thread(target=target, args=args)
+    thread.start()
+    return thread
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_priority():
+    assert current_priority() == "interactive"
+    with priority("batch"):
+        assert current_priority() == "batch"
+        with priority("default"):
+            assert current_priority() == "default"
+        assert current_priority() == "batch"
+    assert current_priority() == "interactive"
+    with pytest.raises(ValueError):
+        with priority("urgent"):
+            pass
+
+
+def test_priority_of_each_thread():
+    seen = []
+    with priority("batch"):
+        start(lambda: seen.append(current_priority())).join()
+    assert seen == ["interactive"]
+
+
+def test_unknown_limits():
+    with pytest.raises(ValueError):
+        OutboundScheduler({"urgent": 1})
+
+
+def test_class_limit():
+    scheduler = OutboundScheduler({"batch": 2})
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def call():
+        with scheduler.slot("batch"):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+    threads = [start(call) for _ in range(6)]
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+    stats = scheduler.stats()["batch"]
+    assert stats["calls"] == 6
+    assert stats["running"] == stats["waiting"] == 0
+    assert stats["waited"] > 0
+
+
+def test_interactive_preempts_batch():
+    scheduler = OutboundScheduler(rate=10, burst=1)
+    scheduler.acquire("batch")
+    order = []
+
+    def call(name):
+        scheduler.acquire(name)
+        order.append(name)
+
+    batch = start(call, "batch")
+    time.sleep(0.02)
+    interactive = start(call, "interactive")
+    batch.join()
+    interactive.join()
+    assert order == ["interactive", "batch"]
+
+
+def test_full_class_does_not_block_lower():
+    scheduler = OutboundScheduler({"interactive": 1})
+    scheduler.acquire("interactive")
+    waiter = start(scheduler.acquire, "interactive")
+    time.sleep(0.02)
+    assert scheduler.stats()["interactive"]["waiting"] == 1
+    scheduler.acquire("batch", timeout=0.5)
+    scheduler.release("interactive")
+    waiter.join()
+    assert scheduler.stats()["interactive"]["running"] == 1
+
+
+def test_timeout():
+    scheduler = OutboundScheduler({"batch": 1})
+    scheduler.acquire("batch")
+    with pytest.raises(TimeoutError):
+        scheduler.acquire("batch", timeout=0.05)
+    assert scheduler.stats()["batch"]["waiting"] == 0
+    scheduler.release("batch")
+    scheduler.acquire("batch", timeout=0.05)
+
+
+def test_rate_limit():
+    scheduler = OutboundScheduler(rate=50, burst=2)
+    started = time.monotonic()
+    for _ in range(7):
+        scheduler.acquire()
+        scheduler.release()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_scheduled_transport():
+    with StubServer() as stub:
+        app = Flask(__name__)
+        app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+        app.config["BASE_URL"] = stub.url + "/v1"
+        app.config["MERCADOPAGO_PRIORITY_LIMITS"] = {"batch": 1}
+        mercadopago = Mercadopago(app)
+        with app.app_context():
+            assert isinstance(mercadopago.transport, ScheduledHttpClient)
+            assert mercadopago.payment().get(1)["status"] == 200
+            with priority("batch"):
+                assert mercadopago.payment().get(2)["status"] == 200
+                assert mercadopago.payment().get(3)["status"] == 200
+            scheduler = mercadopago.stats()["transport"]["scheduler"]
+        assert stub.requests == 3
+        assert scheduler["interactive"]["calls"] == 1
+        assert scheduler["batch"]["calls"] == 2
+        assert scheduler["batch"]["running"] == 0
+
+
+def test_poller_calls_are_batch():
+    with StubServer() as stub:
+        app = Flask(__name__)
+        app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+        app.config["BASE_URL"] = stub.url + "/v1"
+        app.config["MERCADOPAGO_PRIORITY_LIMITS"] = {"batch": 1}
+        app.config["MERCADOPAGO_POLL_MIN_INTERVAL"] = 10
+        mercadopago = Mercadopago(app)
+        polled = threading.Event()
+        with app.app_context():
+            mercadopago.order_poller.watch(7, lambda *args: polled.set())
+            assert polled.wait(5)
+            mercadopago.order_poller.stop()
+            scheduler = mercadopago.stats()["transport"]["scheduler"]
+    assert scheduler["batch"]["calls"] == 1
+    assert scheduler["interactive"]["calls"] == 0
+
+
+def test_inbox_calls_are_batch(tmp_path):
+    with StubServer() as stub:
+        app = Flask(__name__)
+        app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+        app.config["BASE_URL"] = stub.url + "/v1"
+        app.config["MERCADOPAGO_PRIORITY_LIMITS"] = {"batch": 1}
+        app.config["MERCADOPAGO_INBOX_FILE"] = str(tmp_path / "inbox.db")
+        mercadopago = Mercadopago(app)
+        state = mercadopago._get_state(app)
+        inbox = state.inbox
+        inbox.stop()
+        with app.app_context():
+            mercadopago.enqueue_notification({"topic": "payment", "id": "5"})
+            mercadopago.enqueue_notification({"topic": "payment", "id": "6"})
+            assert inbox.process() == 2
+            scheduler = mercadopago.stats()["transport"]["scheduler"]
+        inbox.close()
+    assert scheduler["batch"]["calls"] == 2
+    assert scheduler["interactive"]["calls"] == 0
+    assert state._executor is None
+    assert state._inbox_executor is not None
+
+
+def test_unscheduled_transport(client, mercadopago):
+    assert not isinstance(mercadopago.transport, ScheduledHttpClient)
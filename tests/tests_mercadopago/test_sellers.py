@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from flask_mercadopago import (
+    RESOURCES,
+    SellerClient,
+    SellerRegistry,
+    resource_class,
+)
+
+from mercadopago.http import HttpClient
+
+import pytest
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_seller_client_reuses_resources():
+    http_client = HttpClient()
+    seller = SellerClient(1, "TOKEN-1", http_client)
+    payment = seller.payment()
+    assert payment is seller.payment()
+    assert payment._MPBase__http_client is http_client
+    assert payment._MPBase__request_options is seller.request_options
+    assert seller.request_options.access_token == "TOKEN-1"
+    for name in RESOURCES:
+        assert isinstance(getattr(seller, name)(), resource_class(name))
+
+
+def test_seller_registry():
+    loaded = []
+
+    def loader(user_id):
+        loaded.append(user_id)
+        return None if user_id == 3 else f"TOKEN-{user_id}"
+
+    registry = SellerRegistry(2, HttpClient(), loader)
+    seller = registry.get(1)
+    assert seller.access_token == "TOKEN-1"
+    assert registry.get(1) is seller
+    assert registry.get(1, "TOKEN-1") is seller
+    assert loaded == [1]
+
+    refreshed = registry.get(1, "TOKEN-NEW")
+    assert refreshed is not seller
+    assert refreshed.access_token == "TOKEN-NEW"
+    assert registry.get(1) is refreshed
+
+    registry.get(2)
+    registry.get(4)
+    assert len(registry) == 2
+    assert registry.get(1).access_token == "TOKEN-1"
+    assert loaded == [1, 2, 4, 1]
+
+    with pytest.raises(ValueError):
+        registry.get(3)
+
+    registry.forget(1)
+    registry.forget(1)
+    assert len(registry) == 1
+
+
+@pytest.mark.usefixtures("client")
+def test_for_seller(app, mercadopago):
+    with pytest.raises(ValueError):
+        mercadopago.for_seller(10)
+
+    @mercadopago.seller_token_loader
+    def load_token(user_id):
+        return f"TOKEN-{user_id}"
+
+    seller = mercadopago.for_seller(10)
+    assert seller.access_token == "TOKEN-10"
+    assert mercadopago.for_seller(10) is seller
+    assert seller.http_client is mercadopago.transport
+    assert seller.payment()._MPBase__http_client is mercadopago.transport
+    assert mercadopago.for_seller(11, "OTHER").access_token == "OTHER"
+
+    mercadopago.forget_seller(10)
+    assert mercadopago.for_seller(10) is not seller
+
+
+@pytest.mark.usefixtures("client")
+def test_seller_cache_size(app, mercadopago):
+    app.config["MERCADOPAGO_SELLER_CACHE_SIZE"] = 1
+    first = mercadopago.for_seller(1, "A")
+    mercadopago.for_seller(2, "B")
+    assert len(mercadopago._get_state().sellers) == 1
+    assert mercadopago.for_seller(1, "A") is not first
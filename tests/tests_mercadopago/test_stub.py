@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from flask_mercadopago import (
+    ACCESSOR_CALLS,
+    RebasedHttpClient,
+    StubServer,
+    create_transport,
+)
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture
+def stub():
+    with StubServer(payload_size=16, search_size=5, seed=1) as stub:
+        yield stub
+
+
+@pytest.fixture
+def stub_app(app, mercadopago, stub):
+    app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+    app.config["BASE_URL"] = stub.url + "/v1"
+    app.config["TOKEN_ENDPOINT"] = stub.url + "/oauth/token"
+    with app.app_context():
+        yield app
+        mercadopago.transport.close()
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+@pytest.mark.parametrize("name", sorted(ACCESSOR_CALLS))
+def test_every_accessor_offline(stub_app, mercadopago, stub, name):
+    method, args = ACCESSOR_CALLS[name]
+    res = getattr(getattr(mercadopago, name)(), method)(*args)
+    assert res["status"] == 200
+    assert stub.requests == 1
+    objs = res["response"]
+    for obj in objs if isinstance(objs, list) else [objs]:
+        assert obj["metadata"]["padding"] == "x" * 16
+
+
+def test_create_update_search(stub_app, mercadopago):
+    payment = mercadopago.payment()
+    created = payment.create({"transaction_amount": 10})
+    assert created["status"] == 201
+    assert created["response"]["transaction_amount"] == 10
+    updated = payment.update(created["response"]["id"], {"status": "x"})
+    assert updated["response"]["status"] == "x"
+    found = payment.search({"offset": 3, "limit": 10})["response"]
+    assert found["paging"] == {"total": 5, "limit": 10, "offset": 3}
+    assert [r["id"] for r in found["results"]] == [4, 5]
+    deleted = mercadopago.customer().delete(7)
+    assert deleted["response"]["id"] == 7
+
+
+def test_oauth_token(stub_app, mercadopago):
+    res = mercadopago.process_callback_or_refresh_token(
+        stub_app.config["TOKEN_ENDPOINT"], "TEST-token", "code"
+    )
+    assert res.status_code == 200
+    assert res.json()["token_type"] == "bearer"
+
+
+def test_errors_and_unknown_paths(stub):
+    stub.error_rate = 1.0
+    status, body = stub.answer("GET", "/v1/payments/1", {}, None)
+    assert (status, body["status"]) == (500, 500)
+    assert stub.errors == 1
+    stub.error_rate = 0.0
+    assert stub.answer("GET", "/v2/foo", {}, None)[0] == 404
+
+
+def test_rebased_transport(app, mercadopago):
+    app.config["BASE_URL"] = "http://127.0.0.1:1/v1"
+    transport = create_transport(app.config)
+    assert isinstance(transport, RebasedHttpClient)
+    assert transport.origin == "http://127.0.0.1:1"
+    assert (
+        transport.rebase("https://api.mercadopago.com/v1/payments/1")
+        == "http://127.0.0.1:1/v1/payments/1"
+    )
+    assert transport.rebase("https://example.com/x") == "https://example.com/x"
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import datetime as dt
+
+from flask_mercadopago import (
+    PaymentSync,
+    SQLiteSink,
+    StubServer,
+    iter_search,
+    shift_date,
+)
+
+import pytest
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+def date(second):
+    value = dt.datetime(2022, 7, 1, tzinfo=dt.timezone(dt.timedelta(hours=-4)))
+    value += dt.timedelta(seconds=second)
+    return value.isoformat(timespec="milliseconds")
+
+
+class Payments(object):
+    """Fake ``payment()`` searching a list of payments by update date."""
+
+    def __init__(self, count):
+        self.payments = [
+            {"id": i, "status": "approved", "date_last_updated": date(i)}
+            for i in range(1, count + 1)
+        ]
+        self.searches = []
+        self.fail_after = None
+
+    def payment(self):
+        return self
+
+    def search(self, filters):
+        self.searches.append(filters)
+        if (
+            self.fail_after is not None
+            and len(self.searches) > self.fail_after
+        ):
+            raise ConnectionError("crash")
+        begin = dt.datetime.fromisoformat(filters["begin_date"])
+        matches = sorted(
+            (
+                p
+                for p in self.payments
+                if dt.datetime.fromisoformat(p["date_last_updated"]) >= begin
+            ),
+            key=lambda p: p["date_last_updated"],
+        )
+        offset, limit = filters["offset"], filters["limit"]
+        return {
+            "status": 200,
+            "response": {
+                "paging": {
+                    "total": len(matches),
+                    "offset": offset,
+                    "limit": limit,
+                },
+                "results": matches[offset : offset + limit],  # noqa: E203
+            },
+        }
+
+
+@pytest.fixture
+def sink():
+    with SQLiteSink(":memory:") as sink:
+        yield sink
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_shift_date():
+    assert shift_date(date(10), -1) == date(9)
+    assert shift_date("NOW-30DAYS", -1) == "NOW-30DAYS"
+
+
+def test_iter_search():
+    payments = Payments(25)
+    pages = list(iter_search(payments, {"begin_date": date(0)}, 10))
+    assert [len(page["results"]) for page in pages] == [10, 10, 5]
+    assert [s["offset"] for s in payments.searches] == [0, 10, 20]
+    assert list(iter_search(payments, {"begin_date": date(99)}, 10)) == []
+
+
+def test_iter_search_errors():
+    class Failing(object):
+        def search(self, filters):
+            return {"status": 500, "response": {}}
+
+    with pytest.raises(RuntimeError):
+        list(iter_search(Failing()))
+
+
+def test_sync_is_incremental(sink):
+    payments = Payments(25)
+    report = PaymentSync(payments, sink, start=date(0), page_size=10).run()
+    assert report == {"pages": 3, "payments": 25, "checkpoint": date(25)}
+    assert len(sink) == 25
+    assert sink.load_checkpoint("payments") == date(25)
+
+    payments.payments[2]["status"] = "refunded"
+    payments.payments[2]["date_last_updated"] = date(30)
+    payments.searches = []
+    report = PaymentSync(payments, sink, page_size=10).run()
+    # the payments of the last second again (the overlap) and the updated one
+    assert report == {"pages": 1, "payments": 3, "checkpoint": date(30)}
+    assert payments.searches[0]["begin_date"] == date(24)
+    assert sink.get(3)["status"] == "refunded"
+    assert sink.get(99) is None
+    assert len(sink) == 25
+
+
+def test_sync_resumes_after_a_crash(sink):
+    payments = Payments(25)
+    payments.fail_after = 2
+    with pytest.raises(ConnectionError):
+        PaymentSync(payments, sink, start=date(0), page_size=10).run()
+    assert len(sink) == 20
+    assert sink.load_checkpoint("payments") == date(20)
+    payments.fail_after = None
+    report = PaymentSync(payments, sink, page_size=10).run()
+    assert report["payments"] == 7
+    assert len(sink) == 25
+
+
+def test_sync_restarts_at_the_largest_offset(sink, monkeypatch):
+    monkeypatch.setattr("flask_mercadopago.sync.MAX_SEARCH_OFFSET", 20)
+    payments = Payments(45)
+    report = PaymentSync(payments, sink, start=date(0), page_size=10).run()
+    assert len(sink) == 45
+    assert report["checkpoint"] == date(45)
+    assert [s["begin_date"] for s in payments.searches if not s["offset"]] == [
+        shift_date(date(0), -1),
+        date(19),
+        date(37),
+    ]
+
+
+def test_sqlite_sink_table_name():
+    with pytest.raises(ValueError):
+        SQLiteSink(":memory:", table="payments; DROP")
+
+
+def test_sync_command(app, mercadopago, tmp_path):
+    database = str(tmp_path / "payments.db")
+    with StubServer(search_size=30) as stub:
+        app.config["APP_ACCESS_TOKEN"] = "TEST-token"
+        app.config["BASE_URL"] = stub.url + "/v1"
+        result = app.test_cli_runner().invoke(
+            args=["mercadopago", "sync", "-d", database, "--page-size", "20"]
+        )
+        with app.app_context():
+            mercadopago.transport.close()
+    assert result.exit_code == 0, result.output
+    assert "30 payments in 2 pages" in result.output
+    with SQLiteSink(database) as sink:
+        assert len(sink) == 30
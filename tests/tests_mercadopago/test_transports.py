@@ -0,0 +1,525 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of the Flask-Mercadopago Project
+#    (https://github.com/juniors90/Flask-Mercadopago/).
+# Copyright (c) 2022, Ferreira Juan David
+# License: MIT
+# Full Text:
+#    https://github.com/juniors90/Flask-Mercadopago/blob/master/LICENSE
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Flask-Mercadopago.
+
+Implementation of Mercadopago API OAuth in Flask.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import json
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from flask_mercadopago import (
+    DNSCache,
+    Http2Client,
+    PooledHttpClient,
+    make_tls_context,
+    retries_exhausted,
+    should_retry,
+    url_with_params,
+)
+from flask_mercadopago import transports
+
+import pytest
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+requires_httpx = pytest.mark.skipif(httpx is None, reason="requires httpx")
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture
+def server():
+    calls = []
+    statuses = []
+    peers = set()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _answer(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode() if length else None
+            calls.append((self.command, self.path, body))
+            data = json.dumps({"path": self.path, "body": body}).encode()
+            self.send_response(statuses.pop(0) if statuses else 200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PUT = do_DELETE = _answer  # noqa: N815
+
+        def do_HEAD(self):  # noqa: N802
+            calls.append((self.command, self.path, None))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def setup(self):
+            super().setup()
+            peers.add(self.client_address)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.calls = calls
+    httpd.statuses = statuses
+    httpd.peers = peers
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}"
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def tls_server(tmp_path):
+    if shutil.which("openssl") is None:  # pragma: no cover
+        pytest.skip("requires openssl")
+    cert, key = str(tmp_path / "cert.pem"), str(tmp_path / "key.pem")
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-addext",
+            "subjectAltName=DNS:localhost",
+            "-keyout",
+            key,
+            "-out",
+            cert,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    reused = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):  # noqa: N802
+            reused.append(self.connection.session_reused)
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    httpd.socket = context.wrap_socket(httpd.socket, server_side=True)
+    httpd.reused = reused
+    httpd.cert = cert
+    httpd.url = f"https://localhost:{httpd.server_port}"
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    "method, status, attempt, retries, expected",
+    [
+        ("GET", 500, 0, 3, True),
+        ("GET", 500, 3, 3, False),
+        ("GET", 404, 0, 3, False),
+        ("POST", 503, 0, 3, False),
+        ("DELETE", 429, 0, None, False),
+    ],
+)
+def test_should_retry(method, status, attempt, retries, expected):
+    assert should_retry(method, status, attempt, retries) is expected
+
+
+@pytest.mark.parametrize(
+    "method, status, retries, expected",
+    [
+        ("GET", 503, 3, True),
+        ("GET", 503, 0, True),
+        ("GET", 503, None, False),
+        ("GET", 404, 3, False),
+        ("POST", 503, 3, False),
+    ],
+)
+def test_retries_exhausted(method, status, retries, expected):
+    assert retries_exhausted(method, status, retries) is expected
+
+
+@pytest.mark.parametrize(
+    "url, params, expected",
+    [
+        ("https://x.test/a", None, "https://x.test/a"),
+        ("https://x.test/a", {"b": None}, "https://x.test/a"),
+        ("https://x.test/a", {"b": 1, "c": "d"}, "https://x.test/a?b=1&c=d"),
+        (
+            "https://x.test/a?z=0",
+            {"b": [1, 2]},
+            "https://x.test/a?z=0&b=1&b=2",
+        ),
+    ],
+)
+def test_url_with_params(url, params, expected):
+    assert url_with_params(url, params) == expected
+
+
+class TestDNSCache:
+    def test_resolve_is_cached(self, monkeypatch):
+        calls = []
+
+        def getaddrinfo(host, port, *args):
+            calls.append(host)
+            return [
+                (
+                    socket.AF_INET,
+                    socket.SOCK_STREAM,
+                    6,
+                    "",
+                    ("10.0.0.1", port),
+                ),
+                (
+                    socket.AF_INET,
+                    socket.SOCK_STREAM,
+                    6,
+                    "",
+                    ("10.0.0.1", port),
+                ),
+                (
+                    socket.AF_INET,
+                    socket.SOCK_STREAM,
+                    6,
+                    "",
+                    ("10.0.0.2", port),
+                ),
+            ]
+
+        monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+        cache = DNSCache(ttl=60)
+        assert cache.prefetch(["a.test"]) == {
+            "a.test": ["10.0.0.1", "10.0.0.2"]
+        }
+        assert cache.resolve("a.test") == ["10.0.0.1", "10.0.0.2"]
+        assert calls == ["a.test"]
+        cache.clear()
+        cache.resolve("a.test")
+        assert calls == ["a.test", "a.test"]
+
+    def test_stale_entries_are_kept_on_failure(self, monkeypatch):
+        cache = DNSCache(ttl=0)
+        monkeypatch.setattr(
+            socket,
+            "getaddrinfo",
+            lambda *args: [(socket.AF_INET, 1, 6, "", ("10.0.0.1", 443))],
+        )
+        assert cache.resolve("a.test") == ["10.0.0.1"]
+
+        def fail(*args):
+            raise socket.gaierror("boom")
+
+        monkeypatch.setattr(socket, "getaddrinfo", fail)
+        assert cache.resolve("a.test") == ["10.0.0.1"]
+        assert cache.resolve("b.test") == []
+
+
+class TestPooledHttpClient:
+    def test_get_with_params(self, server):
+        with PooledHttpClient() as client:
+            res = client.get(server.url + "/v1/payments", {}, {"limit": 2})
+        assert res["status"] == 200
+        assert res["response"]["path"] == "/v1/payments?limit=2"
+
+    def test_post_put_delete(self, server):
+        with PooledHttpClient() as client:
+            created = client.post(server.url + "/a", {}, data='{"a": 1}')
+            updated = client.put(server.url + "/a/1", {}, data='{"a": 2}')
+            deleted = client.delete(server.url + "/a/1", {})
+        assert created["response"]["body"] == '{"a": 1}'
+        assert updated["response"]["body"] == '{"a": 2}'
+        assert deleted["status"] == 200
+        assert [c[0] for c in server.calls] == ["POST", "PUT", "DELETE"]
+
+    def test_reuses_connections(self, server):
+        with PooledHttpClient() as client:
+            for _ in range(3):
+                client.get(server.url + "/a", {})
+            host_pool = client.pool.connection_from_url(server.url)
+            assert host_pool.num_connections == 1
+
+    def test_stats(self, server):
+        with PooledHttpClient() as client:
+            assert client.stats()["hosts"] == 0
+            for _ in range(3):
+                client.get(server.url + "/a", {})
+            assert client.stats() == {
+                "hosts": 1,
+                "connections": 1,
+                "requests": 3,
+                "idle": 1,
+            }
+
+    def test_retries_error_statuses(self, server):
+        server.statuses.extend([503, 502])
+        with PooledHttpClient() as client:
+            res = client.get(server.url + "/a", {}, maxretries=3)
+        assert res["status"] == 200
+        assert len(server.calls) == 3
+
+    def test_raises_when_retries_run_out(self, server):
+        server.statuses.extend([503] * 4)
+        with PooledHttpClient() as client:
+            with pytest.raises(requests.exceptions.RetryError):
+                client.get(server.url + "/a", {}, maxretries=3)
+            assert len(server.calls) == 4
+            server.statuses.append(503)
+            res = client.post(server.url + "/a", {}, maxretries=3)
+        assert res["status"] == 503
+
+    def test_returns_error_status_without_retries(self, server):
+        server.statuses.append(500)
+        with PooledHttpClient() as client:
+            res = client.get(server.url + "/a", {})
+        assert res["status"] == 500
+
+    def test_connection_errors_are_requests_errors(self):
+        with PooledHttpClient() as client:
+            with pytest.raises(requests.exceptions.ConnectionError):
+                client.get("http://127.0.0.1:1/a", {})
+
+    def test_resolver_is_used_for_new_connections(self, server):
+        resolver = DNSCache()
+        url = server.url.replace("127.0.0.1", "localhost")
+        with PooledHttpClient(resolver=resolver) as client:
+            assert client.get(url + "/a", {})["status"] == 200
+        assert "127.0.0.1" in resolver._entries["localhost"][1]
+
+    def test_resolver_tries_every_address(self, server, monkeypatch):
+        resolver = DNSCache()
+        monkeypatch.setattr(
+            resolver, "resolve", lambda host, port: ["127.0.0.2", host]
+        )
+        url = server.url.replace("127.0.0.1", "localhost")
+        port = server.server_port
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.2", port))  # refuse connections there
+            with PooledHttpClient(resolver=resolver) as client:
+                assert client.get(url + "/a", {})["status"] == 200
+
+    def test_tls_sessions_are_resumed(self, tls_server):
+        client = PooledHttpClient(
+            ca_certs=tls_server.cert, resolver=DNSCache()
+        )
+        for _ in range(3):
+            assert client.get(tls_server.url + "/a", {})["status"] == 200
+            client.pool.clear()
+        assert tls_server.reused == [False, True, True]
+
+    def test_tls_sessions_can_be_disabled(self, tls_server):
+        client = PooledHttpClient(ca_certs=tls_server.cert, tls_sessions=False)
+        for _ in range(2):
+            client.get(tls_server.url + "/a", {})
+            client.pool.clear()
+        assert tls_server.reused == [False, False]
+
+    def test_tls_context_verifies_certificates(self, tls_server):
+        assert make_tls_context().verify_mode == ssl.CERT_REQUIRED
+        with PooledHttpClient() as client:
+            with pytest.raises(requests.exceptions.SSLError):
+                client.get(tls_server.url + "/a", {})
+
+    def test_warmup(self, server):
+        with PooledHttpClient(maxsize=3) as client:
+            assert client.warmup([server.url], connections=5) == 3
+            host_pool = client.pool.connection_from_url(server.url)
+            assert host_pool.num_connections == 3
+            client.get(server.url + "/a", {})
+            assert host_pool.num_connections == 3
+
+    def test_warmup_failure_is_not_raised(self):
+        with PooledHttpClient() as client:
+            assert client.warmup(["http://127.0.0.1:1"]) == 0
+
+    def test_pool_is_rebuilt_in_other_process(self, monkeypatch):
+        client = PooledHttpClient()
+        pool = client.pool
+        assert client.pool is pool
+        monkeypatch.setattr(os, "getpid", lambda: -1)
+        assert client.pool is not pool
+
+    def test_pool_is_dropped_after_fork(self):
+        client = PooledHttpClient()
+        pool = client.pool
+        transports._reset_after_fork()
+        assert client._state is None
+        assert client.pool is not pool
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+    def test_fork(self, server):
+        client = PooledHttpClient()
+        client.get(server.url + "/a", {})
+        parent_pool = client.pool
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            ok = client._state is None and client.pool is not parent_pool
+            os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+        assert client.pool is parent_pool
+
+
+@requires_httpx
+class TestHttp2Client:
+    def make_client(self, handler):
+        return Http2Client(transport=httpx.MockTransport(handler))
+
+    def test_get(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={"id": 1})
+
+        with self.make_client(handler) as client:
+            res = client.get(
+                "https://api.mercadopago.com/v1/payments/1",
+                headers={"Authorization": "Bearer foo"},
+                params={"limit": 1},
+            )
+        assert res == {"status": 200, "response": {"id": 1}}
+        assert seen[0].headers["Authorization"] == "Bearer foo"
+        assert seen[0].url.params["limit"] == "1"
+
+    def test_post_sends_body(self):
+        def handler(request):
+            return httpx.Response(201, json=json.loads(request.content))
+
+        with self.make_client(handler) as client:
+            res = client.post(
+                "https://api.mercadopago.com/v1/payments",
+                headers={},
+                data=json.dumps({"amount": 10}),
+            )
+        assert res == {"status": 201, "response": {"amount": 10}}
+
+    def test_retries_idempotent_calls(self):
+        statuses = [503, 503, 200]
+
+        def handler(request):
+            return httpx.Response(statuses.pop(0), json={})
+
+        with self.make_client(handler) as client:
+            res = client.get("https://x.test/", headers={}, maxretries=3)
+        assert res["status"] == 200
+        assert statuses == []
+
+    def test_raises_when_retries_run_out(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, json={})
+
+        with self.make_client(handler) as client:
+            with pytest.raises(requests.exceptions.RetryError):
+                client.get("https://x.test/", headers={}, maxretries=2)
+        assert len(calls) == 3
+
+    def test_does_not_retry_post(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, json={})
+
+        with self.make_client(handler) as client:
+            res = client.post("https://x.test/", headers={}, maxretries=3)
+        assert res["status"] == 503
+        assert len(calls) == 1
+
+    def test_empty_body(self):
+        with self.make_client(lambda request: httpx.Response(204)) as client:
+            res = client.delete("https://x.test/", headers={})
+        assert res == {"status": 204, "response": None}
+
+    @pytest.mark.parametrize(
+        "error, expected",
+        (
+            [
+                (httpx.ConnectTimeout, requests.exceptions.ConnectTimeout),
+                (httpx.ReadTimeout, requests.exceptions.ReadTimeout),
+                (httpx.PoolTimeout, requests.exceptions.Timeout),
+                (httpx.ConnectError, requests.exceptions.ConnectionError),
+            ]
+            if httpx is not None
+            else []
+        ),
+    )
+    def test_errors_are_translated(self, error, expected):
+        def handler(request):
+            raise error("boom", request=request)
+
+        with self.make_client(handler) as client:
+            with pytest.raises(expected):
+                client.get("https://x.test/", headers={})
+
+    def test_warmup_sends_a_head_request(self, server):
+        with Http2Client() as client:
+            urls = [server.url + "/v1/payments", server.url]
+            assert client.warmup(urls) == 2
+        assert server.calls == [("HEAD", "/", None)] * 2
+        assert len(server.peers) == 1
+
+    def test_warmup_failure_is_not_raised(self):
+        with Http2Client(http1=False) as client:
+            assert client.warmup(["http://127.0.0.1:1"]) == 0
+
+    def test_warmup_connection_is_reused(self, server):
+        with Http2Client() as client:
+            assert client.warmup([server.url]) == 1
+            assert client.get(server.url + "/a", {})["status"] == 200
+        assert [call[0] for call in server.calls] == ["HEAD", "GET"]
+        assert len(server.peers) == 1
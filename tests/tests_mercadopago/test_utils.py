@@ -21,7 +21,12 @@ Implementation of Mercadopago API OAuth in Flask.
 # IMPORTS
 # =============================================================================
 
-from flask_mercadopago.utils import get_headers, get_payload
+from flask_mercadopago.utils import (
+    LRUCache,
+    get_headers,
+    get_payload,
+    get_sri,
+)
 
 import pytest
 
@@ -89,6 +94,36 @@ def test_get_payload(client_id, client_secret, redirect_uri, expected):
     assert get_payload(client_id, client_secret, redirect_uri) == expected
 
 
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert len(cache) == 2
+    assert cache.get("b", 0) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize(
+    "algorithm, expected",
+    [
+        ("sha256", "sha256-LCa0a2j/xo/5m0U8HTBBNBNCLXBkg7+g+YpeiGJm564="),
+        (
+            "sha384",
+            "sha384-mMEf/f3VQGdrGhN8saIrKnA1DJpEFx1rEYDGvly7LuP3nVMsih3Z7y6OCOdSo7q7",
+        ),
+    ],
+)
+def test_get_sri(algorithm, expected):
+    assert get_sri(b"foo", algorithm) == expected
+
+
 """
 @pytest.mark.parametrize("access_token, key, value, expected",
     []